@@ -23,8 +23,8 @@ from threading import RLock
 from typing import Any, Dict, List, Optional, Tuple
 
 # ── Importaciones del ecosistema neuronal ────────────────────────────────────
-from monitoring import log_event, log_neuron_error, log_neuron_warning
-from animal    import create_cognitive_animal_neuron,   CognitiveAnimalNeuronBase
+from monitoring import log_event, log_neuron_error, log_neuron_warning, timed, propagation_wave
+from animal    import create_cognitive_animal_neuron,   CognitiveAnimalNeuronBase, NeuronIndex
 from micelial  import create_cognitive_micelial_neuron, CognitiveMicelialNeuronBase
 from synapse   import SynapseManager, ElectricalSynapse, ChemicalSynapse, HybridSynapse
 
@@ -665,12 +665,19 @@ class HybridNeuralNetwork:
     """Red neuronal híbrida gestionada desde el núcleo adaptativo.
 
     Mantiene listas de neuronas animales y miceliales, y usa
-    SynapseManager para todas las conexiones.
+    SynapseManager para todas las conexiones. Los índices por subtipo y
+    nombre (NeuronIndex) se actualizan en add_neuron/remove_neuron, y los
+    objetivos de cada instinto se resuelven una sola vez por versión de red.
     """
 
     def __init__(self, n_animal: int = 5, n_micelial: int = 5):
         self.animals:   List[CognitiveAnimalNeuronBase]   = []
         self.micelials: List[CognitiveMicelialNeuronBase] = []
+        self.animal_index   = NeuronIndex()
+        self.micelial_index = NeuronIndex()
+        # InstinctID → (neuronas animales, neuronas miceliales) ya resueltas
+        self._instinct_targets: Dict[InstinctID, Tuple[List, List]] = {}
+        self._targets_version: Tuple[int, int] = (-1, -1)
         self.synapse_mgr = SynapseManager(
             prune_interval_s  = 30.0,
             utility_threshold = 0.08,
@@ -687,7 +694,7 @@ class HybridNeuralNetwork:
             nid = f"A{i+1:03d}_{ntype[:8]}"
             try:
                 n = create_cognitive_animal_neuron(ntype, nid, **kwargs)
-                self.animals.append(n)
+                self.add_neuron(n)
             except Exception as e:
                 log_neuron_error(nid, f"build animal: {e}")
 
@@ -696,12 +703,57 @@ class HybridNeuralNetwork:
             nid = f"M{i+1:03d}_{ntype[:8]}"
             try:
                 n = create_cognitive_micelial_neuron(ntype, nid, **kwargs)
-                self.micelials.append(n)
+                self.add_neuron(n)
             except Exception as e:
                 log_neuron_error(nid, f"build micelial: {e}")
 
         self._wire()
 
+    def add_neuron(self, neuron) -> None:
+        """Añade una neurona animal o micelial y actualiza los índices."""
+        with self._lock:
+            if isinstance(neuron, CognitiveMicelialNeuronBase):
+                lst, index = self.micelials, self.micelial_index
+            else:
+                lst, index = self.animals, self.animal_index
+            old = index.remove(neuron.neuron_id)
+            if old is not None:
+                lst.remove(old)
+            lst.append(neuron)
+            index.add(neuron)
+
+    def remove_neuron(self, neuron_id: str):
+        """Quita una neurona de la red (no toca sus sinapsis)."""
+        with self._lock:
+            for lst, index in ((self.animals, self.animal_index),
+                               (self.micelials, self.micelial_index)):
+                neuron = index.remove(neuron_id)
+                if neuron is not None:
+                    lst.remove(neuron)
+                    return neuron
+        return None
+
+    def _targets_for(self, inst: InstinctID) -> Tuple[List, List]:
+        """Neuronas objetivo de un instinto, cacheadas hasta que cambie la red.
+
+        Versión y relleno bajo el mismo lock que add_neuron/remove_neuron,
+        para no cachear una lista de antes de un cambio concurrente.
+        """
+        with self._lock:
+            version = (self.animal_index.version, self.micelial_index.version)
+            if version != self._targets_version:
+                self._instinct_targets = {}
+                self._targets_version  = version
+            cached = self._instinct_targets.get(inst)
+            if cached is None:
+                ai, mi = self.animal_index, self.micelial_index
+                cached = (
+                    ai.neurons_for(ai.resolve(_INSTINCT_ANIMAL_TARGETS.get(inst, []))),
+                    mi.neurons_for(mi.resolve(_INSTINCT_MICELIAL_TARGETS.get(inst, []))),
+                )
+                self._instinct_targets[inst] = cached
+            return cached
+
     def _wire(self):
         """Conecta la red con una topología representativa."""
         mgr = self.synapse_mgr
@@ -730,6 +782,7 @@ class HybridNeuralNetwork:
                 [self.animals[0], self.animals[1], self.micelials[0]])
 
     # ── Transmisión guiada por instintos y emociones ───────────────────────
+    @propagation_wave()
     def propagate(self, instinct_core: InstinctCore,
                   emotion_engine: EmotionEngine,
                   base_signal: float = 0.6) -> Dict[str, Any]:
@@ -745,26 +798,23 @@ class HybridNeuralNetwork:
         # Activar neuronas objetivo por instinto dominante
         dom_inst = instinct_core.get_dominant()
         if dom_inst:
-            for tname in _INSTINCT_ANIMAL_TARGETS.get(dom_inst, []):
-                for n in self.animals:
-                    if tname in n.neuron_subtype or tname in type(n).__name__.lower():
-                        try:
-                            n.receive_signal(
-                                base_signal * mod.get("gain", 1.0),
-                                dom_inst.value, ctx
-                            )
-                        except Exception:
-                            pass
-            for tname in _INSTINCT_MICELIAL_TARGETS.get(dom_inst, []):
-                for n in self.micelials:
-                    if tname in n.neuron_type or tname in type(n).__name__.lower():
-                        try:
-                            n.receive_concept(
-                                base_signal * 0.8,
-                                dom_inst.value, ctx
-                            )
-                        except Exception:
-                            pass
+            animal_targets, micelial_targets = self._targets_for(dom_inst)
+            for n in animal_targets:
+                try:
+                    n.receive_signal(
+                        base_signal * mod.get("gain", 1.0),
+                        dom_inst.value, ctx
+                    )
+                except Exception:
+                    pass
+            for n in micelial_targets:
+                try:
+                    n.receive_concept(
+                        base_signal * 0.8,
+                        dom_inst.value, ctx
+                    )
+                except Exception:
+                    pass
 
         # Propagar por sinapsis
         tx_results = []
@@ -839,6 +889,8 @@ class AdaptiveCore:
         self._total_stimuli = 0
 
     # ── Ciclo principal ───────────────────────────────────────────────────
+    @timed("adaptive.run_cycle")
+    @propagation_wave()
     def run_cycle(self, stimulus: str = "",
                   threat: float   = 0.0,
                   energy: float   = 0.6,
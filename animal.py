@@ -29,16 +29,18 @@ Nuevos tipos biológicos incluidos:
 
 import time
 import hashlib
+import bisect
+import functools
 from abc import ABC, abstractmethod
 from collections import deque, defaultdict
-from threading import RLock
+from threading import RLock, Thread, Event
 from typing import Any, Dict, List, Set, Optional, Callable, Tuple
 import math
 import random
 import traceback
 
 # Importaciones locales
-from monitoring import log_event, log_neuron_error, log_neuron_activation
+from monitoring import log_event, log_neuron_error, log_neuron_activation, wave_time
 
 # ─── Constantes globales ────────────────────────────────────────────────────
 DEFAULT_ACTIVATION_THRESHOLD  = 0.01
@@ -57,12 +59,32 @@ DEFAULT_ADAPTATION_RATE        = 0.02
 KNOWLEDGE_DECAY_RATE           = 1e-16
 INSIGHT_REGENERATION_RATE      = 1e-12
 MAX_ACTIVATION_BUFFER_AGE      = 10.0  # segundos
+ACTIVE_NEURON_WINDOW           = 10.0  # s sin activarse → deja de contar como activa
+ACTIVE_NEURON_RECENT_MAX       = 1 << 16  # cola de activaciones recientes de AnimalNetworkStats
+FATIGUE_RATE_THRESHOLD         = 20.0  # activaciones/s sostenidas → neurona fatigada
+FATIGUE_RATE_TAU               = 5.0   # s, constante de la media móvil de tasa
+SIGNAL_HISTOGRAM_BINS          = 100
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  BASE
 # ═══════════════════════════════════════════════════════════════════════════════
 
+def _observed_receive(fn: Callable) -> Callable:
+    """Envuelve receive_signal para notificar al colector de métricas de red."""
+    @functools.wraps(fn)
+    def receive_signal(self, signal_strength, signal_pattern, context=None):
+        sink = self.stats_sink
+        if sink is None:
+            return fn(self, signal_strength, signal_pattern, context)
+        t0  = time.perf_counter()
+        out = fn(self, signal_strength, signal_pattern, context)
+        sink.on_activation(self, out, time.perf_counter() - t0)
+        return out
+    receive_signal._observed = True
+    return receive_signal
+
+
 class CognitiveAnimalNeuronBase(ABC):
     """Interfaz base para todas las neuronas animales cognitivas.
 
@@ -70,6 +92,16 @@ class CognitiveAnimalNeuronBase(ABC):
     Compatible con procesamiento paralelo y serial con neuronas miceliales.
     """
 
+    # Colector de métricas (AnimalNetworkStats) asignado por el mantenimiento
+    stats_sink = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fn = cls.__dict__.get("receive_signal")
+        if fn is not None and not getattr(fn, "_observed", False) \
+                and not getattr(fn, "__isabstractmethod__", False):
+            cls.receive_signal = _observed_receive(fn)
+
     def __init__(
         self,
         neuron_id: str,
@@ -130,7 +162,7 @@ class CognitiveAnimalNeuronBase(ABC):
         self._last_processed      = 0.0
         self._processing_interval = DEFAULT_PROCESSING_INTERVAL
 
-        log_event(f"Neurona {neuron_id} de tipo {neuron_type} creada", "DEBUG")
+        log_event("Neurona %s de tipo %s creada", "DEBUG", args=(neuron_id, neuron_type))
 
         self._update_plasticity()
         self._update_impact()
@@ -150,33 +182,7 @@ class CognitiveAnimalNeuronBase(ABC):
 
         try:
             with self.lock:
-                self._last_processed = current_time
-                self.age += delta_time
-
-                self._update_plasticity()
-                self._update_impact()
-                self._update_efficiency()
-
-                # Decaimiento de resiliencia (extremadamente lento)
-                knowledge_loss = self.knowledge_decay_rate * delta_time * \
-                    (1.0 + self.cognitive_interference * 0.05)
-                self.cognitive_resilience = max(0.0, self.cognitive_resilience - knowledge_loss)
-
-                # Regeneración de resiliencia
-                if self.cognitive_resilience < 1.0:
-                    rf = 1.0 - self.cognitive_resilience
-                    growth = self.insight_regeneration_rate * delta_time * (1.0 + rf * 2.0)
-                    self.cognitive_resilience = min(1.0, self.cognitive_resilience + growth)
-
-                # Decaimiento de interferencia
-                if self.cognitive_interference > 0:
-                    decay = 1e-10 * (1.0 + self.cognitive_interference * 10.0)
-                    self.cognitive_interference = max(0.0, self.cognitive_interference - delta_time * decay)
-
-                # Plasticidad varía muy lentamente con la edad (sin límite de vida)
-                age_factor = min(1.0, self.age / (100 * 365 * 24 * 3600))
-                target_plasticity = max(0.2, 1.0 - age_factor * 0.8)
-                self.plasticity_score = self.plasticity_score * 0.95 + target_plasticity * 0.05
+                self._apply_aging(delta_time, current_time)
 
         except Exception as e:
             log_neuron_error(self.neuron_id, f"Error en age_neuron: {e}\n{traceback.format_exc()}")
@@ -184,6 +190,40 @@ class CognitiveAnimalNeuronBase(ABC):
             if not isinstance(e, (ValueError, TypeError, AttributeError)):
                 raise
 
+    def _apply_aging(self, delta_time: float, current_time: float) -> None:
+        """Cuerpo del envejecimiento. Requiere ``self.lock`` tomado.
+
+        Separado de age_neuron para que el barrido por lotes de la red
+        (AgingWheel) lo aplique con una sola lectura de reloj.
+        """
+        self._last_processed = current_time
+        self.age += delta_time
+
+        self._update_plasticity(current_time)
+        self._update_impact()
+        self._update_efficiency()
+
+        # Decaimiento de resiliencia (extremadamente lento)
+        knowledge_loss = self.knowledge_decay_rate * delta_time * \
+            (1.0 + self.cognitive_interference * 0.05)
+        self.cognitive_resilience = max(0.0, self.cognitive_resilience - knowledge_loss)
+
+        # Regeneración de resiliencia
+        if self.cognitive_resilience < 1.0:
+            rf = 1.0 - self.cognitive_resilience
+            growth = self.insight_regeneration_rate * delta_time * (1.0 + rf * 2.0)
+            self.cognitive_resilience = min(1.0, self.cognitive_resilience + growth)
+
+        # Decaimiento de interferencia
+        if self.cognitive_interference > 0:
+            decay = 1e-10 * (1.0 + self.cognitive_interference * 10.0)
+            self.cognitive_interference = max(0.0, self.cognitive_interference - delta_time * decay)
+
+        # Plasticidad varía muy lentamente con la edad (sin límite de vida)
+        age_factor = min(1.0, self.age / (100 * 365 * 24 * 3600))
+        target_plasticity = max(0.2, 1.0 - age_factor * 0.8)
+        self.plasticity_score = self.plasticity_score * 0.95 + target_plasticity * 0.05
+
     def add_cognitive_interference(self, interference_amount: float):
         with self.lock:
             self.cognitive_interference = min(
@@ -197,7 +237,7 @@ class CognitiveAnimalNeuronBase(ABC):
         frequency: float = 1.0,
         pattern: str = "default",
     ) -> bool:
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         activation_occurred = False
 
         try:
@@ -214,8 +254,9 @@ class CognitiveAnimalNeuronBase(ABC):
 
         try:
             with self.lock:
-                current_time = time.time()
-                self.age = current_time - self.creation_time
+                current_time = wave_time()
+                # El reloj de la onda es anterior a una neurona creada dentro de ella
+                self.age = max(0.0, current_time - self.creation_time)
                 self.last_activation_time = current_time
 
                 if not hasattr(self, "_activation_buffer"):
@@ -246,7 +287,7 @@ class CognitiveAnimalNeuronBase(ABC):
                         if total_weight > 0:
                             self.activation_level = min(1.0, weighted_sum / total_weight)
 
-                    self._update_plasticity()
+                    self._update_plasticity(current_time)
                     self._update_impact()
                     self._update_efficiency()
 
@@ -263,9 +304,12 @@ class CognitiveAnimalNeuronBase(ABC):
                     )
                     activation_occurred = True
 
-                proc_ms = (time.time() - start_time) * 1000
+                proc_ms = (time.monotonic_ns() - start_ns) / 1e6
                 self._avg_processing_time = self._avg_processing_time * 0.9 + proc_ms * 0.1
 
+                if activation_occurred and self.stats_sink is not None:
+                    self.stats_sink.on_activation(self, self.activation_level, proc_ms / 1000.0)
+
                 for attr in ["_impact_history", "_efficiency_history", "_plasticity_history"]:
                     h = getattr(self, attr, [])
                     if len(h) > 1000:
@@ -276,7 +320,7 @@ class CognitiveAnimalNeuronBase(ABC):
         except Exception as e:
             log_neuron_error(self.neuron_id, f"Error en update_signal: {e}\n{traceback.format_exc()}")
             self._error_count = min(1000, getattr(self, "_error_count", 0) + 1)
-            proc_ms = (time.time() - start_time) * 1000
+            proc_ms = (time.monotonic_ns() - start_ns) / 1e6
             self._avg_processing_time = self._avg_processing_time * 0.9 + proc_ms * 0.1
             try:
                 self._update_efficiency()
@@ -285,8 +329,9 @@ class CognitiveAnimalNeuronBase(ABC):
             return False
 
     # ── Métricas internas ──────────────────────────────────────────────────
-    def _update_plasticity(self):
-        recent = len([t for t, _ in self._activation_buffer if time.time() - t < 1.0])
+    def _update_plasticity(self, now: float = None):
+        cutoff = (now or time.time()) - 1.0
+        recent = sum(1 for t, _ in self._activation_buffer if t > cutoff)
         activity_factor = min(1.0, recent / 10.0)
         self.plasticity_score = max(
             MIN_PLASTICITY,
@@ -356,7 +401,7 @@ class SensoryReceptorNeuron(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"sensory_{self.modality}_processed": self.activation_level * self.cognitive_resilience}
 
 
@@ -379,7 +424,7 @@ class VisualFeatureExtractor(CognitiveAnimalNeuronBase):
                 self.feature_sensitivity[context.get("pattern", "default")] *= (
                     1 + context["feedback"] * 0.01 * self.plasticity_score
                 )
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"visual_feature_{self.feature_type}": self.activation_level * self.cognitive_resilience}
 
 
@@ -398,7 +443,7 @@ class AuditorySpectrumAnalyzer(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"auditory_band_{self.frequency_band}_analyzed": self.activation_level * self.cognitive_resilience}
 
 
@@ -419,7 +464,7 @@ class TactilePressureSensor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"tactile_{self.pressure_type}_detected": self.activation_level * self.cognitive_resilience}
 
 
@@ -438,7 +483,7 @@ class OlfactoryReceptor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"smell_{self.molecular_type}_detected": self.activation_level * self.cognitive_resilience}
 
 
@@ -456,7 +501,7 @@ class GustatoryReceptor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"taste_{self.taste_type}_sensed": self.activation_level * self.cognitive_resilience}
 
 
@@ -476,7 +521,7 @@ class VestibularSensor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"vestibular_{self.sensor_type}_detected": self.activation_level * self.cognitive_resilience}
 
 
@@ -496,7 +541,7 @@ class Proprioceptor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"proprioception_{self.body_part}_change": self.activation_level * self.cognitive_resilience}
 
 
@@ -517,7 +562,7 @@ class Nociceptor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"pain_{self.pain_type}_signal": self.activation_level * self.cognitive_resilience}
 
 
@@ -536,7 +581,7 @@ class Thermoreceptor(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {f"temperature_{self.receptor_type}_detected": self.activation_level * self.cognitive_resilience}
 
 
@@ -566,7 +611,7 @@ class AttentionFocuser(CognitiveAnimalNeuronBase):
                     0.1,
                     self.salience_threshold + (context["distraction_level"] - 0.5) * 0.01 * self.plasticity_score,
                 )
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {"attention_focused": self.focus_level * r, "focus_adjustment": (self.focus_level - 0.5) * r}
 
@@ -593,7 +638,7 @@ class SelectiveAttentionFilter(CognitiveAnimalNeuronBase):
         with self.lock:
             passed = self.activation_level > (1 - self.filter_strength)
             r = self.cognitive_resilience
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {
                 "signal_passed_filter":    (1.0 if passed else 0.0) * r,
                 "filtered_signal_strength": (self.activation_level if passed else 0.0) * r,
@@ -629,7 +674,7 @@ class DividedAttentionManager(CognitiveAnimalNeuronBase):
                 for k in low:
                     self.active_tasks[k]["strength"] *= 0.8
             r = self.cognitive_resilience
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {
                 "attention_divided": len(self.active_tasks) / self.max_tasks * r,
                 **{f"task_{k}_attention": t["strength"] * self.task_priorities[k] * r
@@ -671,7 +716,7 @@ class LogicalInferenceEngine(CognitiveAnimalNeuronBase):
                         value = v
                         break
                 results[f"inferred_{query}"] = value
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -705,7 +750,7 @@ class ProbabilisticReasoner(CognitiveAnimalNeuronBase):
                 if deps:
                     prob *= sum(deps) / len(deps)
                 results[f"probability_{e}"] = prob
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -742,8 +787,8 @@ class DecisionMaker(CognitiveAnimalNeuronBase):
                     results["decision_made"]  = 1.0
                     results["chosen_option"]  = 1.0
                     results["expected_utility"] = best_eu
-                    self.decision_history.append({"option": best, "utility": best_eu, "ts": time.time()})
-            self.last_activation_time = time.time()
+                    self.decision_history.append({"option": best, "utility": best_eu, "ts": wave_time()})
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -780,7 +825,7 @@ class RiskAssessor(CognitiveAnimalNeuronBase):
             elif op == "adjust_tolerance":
                 self.risk_tolerance = max(0.0, min(1.0, context.get("tolerance", 0.5)))
                 results["tolerance_adjusted"] = 1.0
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -815,7 +860,7 @@ class PatternRecognizer(CognitiveAnimalNeuronBase):
                             best_score, best_name = sim, name
                 if best_name:
                     results[f"pattern_recognized_{best_name}"] = best_score
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -845,7 +890,7 @@ class AnomalyDetector(CognitiveAnimalNeuronBase):
                 results["anomaly_z_score"]   = z
                 results["anomaly_detected"]  = 1.0 if z > self.z_threshold else 0.0
                 results["baseline_mean"]     = mu
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -876,7 +921,7 @@ class SelfMonitor(CognitiveAnimalNeuronBase):
                 all_vals = [v for vals in self.performance_metrics.values() for v in vals[-10:]]
                 self.confidence_level = sum(all_vals) / len(all_vals) if all_vals else 0.5
                 results["self_confidence"] = self.confidence_level
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -903,11 +948,11 @@ class InsightTrigger(CognitiveAnimalNeuronBase):
             results = {}
             if self.preparedness > self.insight_threshold:
                 iid = hashlib.md5(f"{time.time()}_{random.random()}".encode()).hexdigest()[:8]
-                self.insight_history.append({"id": iid, "prep": self.preparedness, "ts": time.time()})
+                self.insight_history.append({"id": iid, "prep": self.preparedness, "ts": wave_time()})
                 results["insight_triggered"] = 1.0
                 results["insight_id"]        = 1.0
                 self.preparedness            = 0.0
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -931,11 +976,11 @@ class CreativeCombiner(CognitiveAnimalNeuronBase):
                 cid      = hashlib.md5("_".join(sorted(elements)).encode()).hexdigest()[:8]
                 novelty  = random.uniform(0.5, 1.0)
                 is_novel = novelty > self.novelty_threshold
-                self.combination_history.append({"elements": elements, "id": cid, "novelty": novelty, "ts": time.time()})
+                self.combination_history.append({"elements": elements, "id": cid, "novelty": novelty, "ts": wave_time()})
                 results["combination_created"] = 1.0
                 results["combination_novelty"] = novelty
                 results["is_novel"]            = 1.0 if is_novel else 0.0
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -963,7 +1008,7 @@ class DivergentThinker(CognitiveAnimalNeuronBase):
                 self.idea_pool.append({"id": idea_id, "novelty": novelty, "seed": seed})
                 results[f"idea_{idea_id}_novelty"] = novelty
             results["ideas_generated"] = float(n_ideas)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -990,7 +1035,7 @@ class ConvergentThinker(CognitiveAnimalNeuronBase):
                     sum(v["strength"] for v in self.candidate_pool.values()) / len(self.candidate_pool) -
                     self.candidate_pool[best_id]["strength"]
                 )
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in results.items()}
 
 
@@ -1042,7 +1087,7 @@ class ChemotaxisGradientNeuron(CognitiveAnimalNeuronBase):
             else:
                 self.sensitivity = min(2.0, self.sensitivity + 0.005 * self.plasticity_score)
 
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 f"chemotaxis_{self.chemical}_activation": self.activation_level * r,
@@ -1087,7 +1132,7 @@ class PlaceCellNeuron(CognitiveAnimalNeuronBase):
             # Plasticidad: ampliar o contraer el campo según uso
             if self.visit_count > self.remapping_threshold:
                 self.field_radius = min(0.4, self.field_radius * (1 + 0.001 * self.plasticity_score))
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "place_cell_firing":      self.activation_level * r,
@@ -1100,7 +1145,7 @@ class PlaceCellNeuron(CognitiveAnimalNeuronBase):
         with self.lock:
             self.preferred_location = new_location
             self.visit_count        = 0
-            log_event(f"PlaceCell {self.neuron_id} remapeada a {new_location}", "DEBUG")
+            log_event("PlaceCell %s remapeada a %s", "DEBUG", args=(self.neuron_id, new_location))
 
 
 # ── 5.3  Neurona de dirección de cabeza (estilo rata / ADN) ───────────────
@@ -1140,7 +1185,7 @@ class HeadDirectionNeuron(CognitiveAnimalNeuronBase):
             if abs(self.angular_velocity) > 0.01:
                 drift = self.angular_velocity * 0.0001 * self.plasticity_score
                 self.preferred_angle = (self.preferred_angle + drift) % (2 * math.pi)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             pref_deg = math.degrees(self.preferred_angle) % 360
             return {
@@ -1187,7 +1232,7 @@ class PauseInterneuron(CognitiveAnimalNeuronBase):
             else:
                 self.pause_duration = 0.0
                 inhibition_released = 0.0
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "pause_tonic_output":       self.activation_level * r,
@@ -1234,7 +1279,7 @@ class MirrorNeuron(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 f"mirror_{self.action_class}_firing":    self.activation_level * r,
@@ -1279,7 +1324,7 @@ class SpeedNeuron(CognitiveAnimalNeuronBase):
             op = context.get("operation", "report") if context else "report"
             if op == "reset_odometer":
                 self.odometer = 0.0
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "speed_neuron_firing": self.activation_level * r,
@@ -1321,7 +1366,7 @@ class ReceptiveFieldNeuron(CognitiveAnimalNeuronBase):
 
     def process(self, context=None):
         with self.lock:
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 f"rf_{self.polarity}_response":   self.activation_level * r,
@@ -1367,7 +1412,7 @@ class SongNeuron(CognitiveAnimalNeuronBase):
                     self.seq_position = 0
             match = 1.0 - (sum(abs(a - b) for a, b in zip(self.current_seq, self.template)) /
                             max(1, len(self.template)))
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "song_copy_fidelity":  match * r,
@@ -1413,7 +1458,7 @@ class ElectrosensoryNeuron(CognitiveAnimalNeuronBase):
         with self.lock:
             avg_am = sum(self.amplitude_buffer) / max(1, len(self.amplitude_buffer))
             avg_df = sum(self.phase_buffer) / max(1, len(self.phase_buffer))
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "electro_beat_response":     self.activation_level * r,
@@ -1460,7 +1505,7 @@ class BarometricNeuron(CognitiveAnimalNeuronBase):
             trend_dir = 0.0
             if len(pressures) >= 2:
                 trend_dir = pressures[-1] - pressures[0]
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "barometric_change_rate": self.activation_level * r,
@@ -1503,7 +1548,7 @@ class MagnetoreceptionNeuron(CognitiveAnimalNeuronBase):
                 self.preferred_inclination = (
                     0.999 * self.preferred_inclination + 0.001 * self.preferred_inclination
                 )
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "magneto_compass_response":    self.activation_level * r,
@@ -1549,7 +1594,7 @@ class SubstrateVibrationNeuron(CognitiveAnimalNeuronBase):
             if self.activation_level < 0.1:
                 self.fatigue = max(0.0, self.fatigue - 0.05)
             avg_resp = sum(r for _, _, r in self.vibration_history) / max(1, len(self.vibration_history))
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "vibration_response":        self.activation_level * r,
@@ -1600,7 +1645,7 @@ class CPGNeuron(CognitiveAnimalNeuronBase):
             if op == "reset_phase":
                 self._phase = 0.0
             r = self.cognitive_resilience
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {
                 "cpg_oscillator_phase":     self._phase * r,
                 "cpg_burst_active":         (1.0 if self._phase < self.burst_duration else 0.0) * r,
@@ -1649,7 +1694,7 @@ class DopaminergicModulatorNeuron(CognitiveAnimalNeuronBase):
         with self.lock:
             avg_rpe = sum(self.rpe_history) / max(1, len(self.rpe_history))
             r = self.cognitive_resilience
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {
                 "da_firing_rate":       self.activation_level * r,
                 "da_rpe":               (avg_rpe + 1) / 2 * r,   # normalizado [0,1]
@@ -1705,7 +1750,7 @@ class AdaptiveThresholdNeuron(CognitiveAnimalNeuronBase):
     def process(self, context=None):
         with self.lock:
             burst_rate = len(self.spike_history) / max(1, self.spike_history.maxlen)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             r = self.cognitive_resilience
             return {
                 "adaptive_threshold_firing":    self.activation_level * r,
@@ -1781,10 +1826,425 @@ def create_cognitive_animal_neuron(neuron_type: str, neuron_id: str,
     return neuron_classes[neuron_type](neuron_id, **kwargs)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  ÍNDICE DE RED
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class NeuronIndex:
+    """Índices subtipo→ids y nombre/token→ids de una red de neuronas.
+
+    Se mantiene al añadir o quitar neuronas, de modo que las búsquedas por
+    subtipo o por nombre de objetivo son un acceso a diccionario en lugar de
+    un recorrido lineal. Acepta neuronas animales y miceliales: el subtipo es
+    ``neuron_subtype`` si existe y ``neuron_type`` en caso contrario.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._neurons:    Dict[str, Any]      = {}
+        self._by_subtype: Dict[str, List[str]] = defaultdict(list)
+        self._by_token:   Dict[str, Set[str]]  = defaultdict(set)
+        self._by_name:    Dict[str, Set[str]]  = defaultdict(set)
+        self._resolved:   Dict[Tuple[str, ...], List[str]] = {}
+        self.version = 0
+
+    @staticmethod
+    def _names(neuron) -> Tuple[str, str]:
+        subtype = getattr(neuron, "neuron_subtype", None) or getattr(neuron, "neuron_type", "")
+        return str(subtype), type(neuron).__name__.lower()
+
+    def add(self, neuron) -> None:
+        with self._lock:
+            nid = neuron.neuron_id
+            if nid in self._neurons:
+                self.remove(nid)
+            self._neurons[nid] = neuron
+            subtype, cls_name = self._names(neuron)
+            self._by_subtype[subtype].append(nid)
+            for name in (subtype, cls_name):
+                self._by_name[name].add(nid)
+                for tok in name.split("_"):
+                    if tok:
+                        self._by_token[tok].add(nid)
+            self._resolved.clear()
+            self.version += 1
+
+    def remove(self, neuron_id: str):
+        with self._lock:
+            neuron = self._neurons.pop(neuron_id, None)
+            if neuron is None:
+                return None
+            subtype, cls_name = self._names(neuron)
+            ids = self._by_subtype.get(subtype)
+            if ids is not None:
+                ids.remove(neuron_id)
+                if not ids:
+                    del self._by_subtype[subtype]
+            for name in (subtype, cls_name):
+                self._discard(self._by_name, name, neuron_id)
+                for tok in name.split("_"):
+                    if tok:
+                        self._discard(self._by_token, tok, neuron_id)
+            self._resolved.clear()
+            self.version += 1
+            return neuron
+
+    @staticmethod
+    def _discard(idx: Dict[str, Set[str]], key: str, neuron_id: str) -> None:
+        bucket = idx.get(key)
+        if bucket is not None:
+            bucket.discard(neuron_id)
+            if not bucket:
+                del idx[key]
+
+    def get(self, neuron_id: str):
+        return self._neurons.get(neuron_id)
+
+    def ids_by_subtype(self, subtype: str) -> List[str]:
+        return list(self._by_subtype.get(subtype, ()))
+
+    def ids_by_token(self, token: str) -> List[str]:
+        return list(self._by_token.get(token, ()))
+
+    def first_by_subtype(self, subtype: str):
+        ids = self._by_subtype.get(subtype)
+        return self._neurons[ids[0]] if ids else None
+
+    def resolve(self, target_names) -> List[str]:
+        """Ids cuyo subtipo o nombre de clase contiene alguno de los nombres.
+
+        Misma semántica que el recorrido original, pero evaluada sobre los
+        nombres distintos del índice y cacheada hasta el siguiente cambio de
+        la red. Como allí, un id aparece una vez por cada nombre que encaja:
+        una neurona que responde a dos nombres recibe la señal dos veces.
+        """
+        key = tuple(target_names)
+        with self._lock:
+            cached = self._resolved.get(key)
+            if cached is not None:
+                return cached
+            order = {nid: i for i, nid in enumerate(self._neurons)}
+            out: List[str] = []
+            for tname in key:
+                matched: Set[str] = set()
+                for name, ids in self._by_name.items():
+                    if tname in name:
+                        matched.update(ids)
+                # Por nombre objetivo, en el orden de inserción de la red
+                out.extend(sorted(matched, key=order.__getitem__))
+            self._resolved[key] = out
+            return out
+
+    def neurons_for(self, ids: List[str]) -> List[Any]:
+        neurons = self._neurons
+        return [neurons[nid] for nid in ids if nid in neurons]
+
+    def __len__(self) -> int:
+        return len(self._neurons)
+
+    def __contains__(self, neuron_id: str) -> bool:
+        return neuron_id in self._neurons
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  MANTENIMIENTO DE RED
 # ═══════════════════════════════════════════════════════════════════════════════
 
+class AnimalNetworkStats:
+    """Agregados de salud de la red mantenidos como contadores incrementales.
+
+    Cada activación actualiza los contadores en O(1) (vía ``stats_sink``),
+    de modo que ``snapshot`` es O(1) respecto al número de neuronas y puede
+    consultarse cada segundo bajo carga.
+    """
+
+    def __init__(self,
+                 fatigue_threshold: float = FATIGUE_RATE_THRESHOLD,
+                 active_window: float = ACTIVE_NEURON_WINDOW):
+        self._lock = RLock()
+        self.fatigue_threshold = fatigue_threshold
+        self.active_window     = active_window
+        # nid → [last_ts, rate, fatigued, efficiency, counted_active]
+        self._per_neuron: Dict[str, List] = {}
+        # (ts, nid) en orden de llegada; acotada: al llenarse se compacta
+        self._recent: deque = deque(maxlen=ACTIVE_NEURON_RECENT_MAX)
+        self._active = 0
+        self._fatigued = 0
+        self._efficiency_sum = 0.0
+        self._creation_times: List[float] = []
+        self._creation_sum  = 0.0          # suma de _creation_times (edad media O(1))
+        self._signal_count  = 0
+        self._signal_sum    = 0.0
+        self._signal_sq_sum = 0.0
+        self._signal_hist   = [0] * SIGNAL_HISTOGRAM_BINS
+        self._activations   = 0
+        self._errors_seen   = 0
+        self._response_time = 0.0          # EMA en segundos
+
+    # ── Registro de neuronas ──────────────────────────────────────────────
+    def register(self, neuron: CognitiveAnimalNeuronBase) -> None:
+        with self._lock:
+            if neuron.neuron_id in self._per_neuron:
+                self.unregister(neuron)
+            self._per_neuron[neuron.neuron_id] = [0.0, 0.0, False, neuron.efficiency, False]
+            self._efficiency_sum += neuron.efficiency
+            bisect.insort(self._creation_times, neuron.creation_time)
+            self._creation_sum += neuron.creation_time
+
+    def unregister(self, neuron: CognitiveAnimalNeuronBase) -> None:
+        with self._lock:
+            st = self._per_neuron.pop(neuron.neuron_id, None)
+            if st is None:
+                return
+            _, _, fatigued, eff, counted = st
+            self._efficiency_sum -= eff
+            if fatigued:
+                self._fatigued -= 1
+            if counted:
+                self._active -= 1
+            i = bisect.bisect_left(self._creation_times, neuron.creation_time)
+            if i < len(self._creation_times) and self._creation_times[i] == neuron.creation_time:
+                del self._creation_times[i]
+                # Vacía, se reinicia para no arrastrar error de redondeo
+                self._creation_sum = (self._creation_sum - neuron.creation_time
+                                      if self._creation_times else 0.0)
+
+    # ── Actualización en caliente ─────────────────────────────────────────
+    def on_activation(self, neuron: CognitiveAnimalNeuronBase,
+                      output: float, elapsed: float) -> None:
+        try:
+            output = float(output)
+        except (TypeError, ValueError):
+            return
+        now = wave_time()
+        with self._lock:
+            st = self._per_neuron.get(neuron.neuron_id)
+            if st is None:
+                return
+            self._signal_count  += 1
+            self._signal_sum    += output
+            self._signal_sq_sum += output * output
+            b = min(SIGNAL_HISTOGRAM_BINS - 1, int(max(0.0, output) * SIGNAL_HISTOGRAM_BINS))
+            self._signal_hist[b] += 1
+            self._response_time = self._response_time * 0.9 + elapsed * 0.1
+
+            eff = neuron.efficiency
+            self._efficiency_sum += eff - st[3]
+            st[3] = eff
+
+            if output < neuron.activation_threshold:
+                return
+            self._activations += 1
+            self._expire(now)
+
+            last_ts, rate = st[0], st[1]
+            if not st[4]:
+                self._active += 1
+                st[4] = True
+            if len(self._recent) == self._recent.maxlen:
+                self._compact_recent()
+            self._recent.append((now, neuron.neuron_id))
+            # Tasa de activación (media móvil exponencial, activaciones/s)
+            if last_ts:
+                # dt 0 en la misma onda; negativo si otro hilo con una onda
+                # posterior activó antes: sin decaimiento en ambos casos
+                rate *= math.exp(-max(0.0, now - last_ts) / FATIGUE_RATE_TAU)
+            rate += 1.0 / FATIGUE_RATE_TAU
+            st[0], st[1] = now, rate
+            self._set_fatigued(st, rate > self.fatigue_threshold)
+
+    def _set_fatigued(self, st: List, fatigued: bool) -> None:
+        if fatigued != st[2]:
+            self._fatigued += 1 if fatigued else -1
+            st[2] = fatigued
+
+    def _expire(self, now: float) -> None:
+        """Retira de la cuenta de activas las neuronas inactivas (O(1) amortizado)."""
+        cutoff = now - self.active_window
+        recent = self._recent
+        while recent and recent[0][0] < cutoff:
+            self._retire(*recent.popleft())
+
+    def _retire(self, ts: float, nid: str) -> None:
+        st = self._per_neuron.get(nid)
+        if st is not None and st[0] == ts and st[4]:
+            self._active -= 1
+            st[4] = False
+
+    def _compact_recent(self) -> None:
+        """Cola llena: conserva solo la última activación de cada neurona.
+
+        Si aun así no cabe (más neuronas activas que ``maxlen``), la más
+        antigua deja de contar como activa hasta su próxima activación.
+        """
+        per_neuron = self._per_neuron
+        seen: Set[str] = set()
+        live = []
+        for ts, nid in reversed(self._recent):
+            st = per_neuron.get(nid)
+            if st is not None and st[0] == ts and nid not in seen:
+                seen.add(nid)
+                live.append((ts, nid))
+        self._recent.clear()
+        self._recent.extend(reversed(live))
+        if len(self._recent) == self._recent.maxlen:
+            self._retire(*self._recent.popleft())
+
+    def decay(self, now: float = None) -> None:
+        """Reevalúa la fatiga de neuronas sin actividad reciente (O(n))."""
+        now = now or wave_time()
+        with self._lock:
+            for st in self._per_neuron.values():
+                if st[2] and st[0]:
+                    rate = st[1] * math.exp(-max(0.0, now - st[0]) / FATIGUE_RATE_TAU)
+                    self._set_fatigued(st, rate > self.fatigue_threshold)
+
+    def record_errors(self, total_errors: int) -> None:
+        with self._lock:
+            self._errors_seen = total_errors
+
+    # ── Lectura ──────────────────────────────────────────────────────────
+    def _percentile(self, q: float) -> float:
+        if not self._signal_count:
+            return 0.0
+        target = q * self._signal_count
+        acc = 0
+        for i, c in enumerate(self._signal_hist):
+            acc += c
+            if acc >= target:
+                return (i + 0.5) / SIGNAL_HISTOGRAM_BINS
+        return 1.0
+
+    def _age_at(self, q: float, now: float) -> float:
+        ct = self._creation_times
+        if not ct:
+            return 0.0
+        # creación más reciente → edad menor
+        return now - ct[min(len(ct) - 1, int((1.0 - q) * len(ct)))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = wave_time()
+        with self._lock:
+            self._expire(now)
+            n   = len(self._per_neuron)
+            cnt = self._signal_count
+            mean = self._signal_sum / cnt if cnt else 0.0
+            var  = max(0.0, self._signal_sq_sum / cnt - mean * mean) if cnt else 0.0
+            ages = {
+                "mean": (now - self._creation_sum / n) if n else 0.0,
+                "p50":  self._age_at(0.50, now),
+                "p90":  self._age_at(0.90, now),
+                "max":  self._age_at(1.0, now),
+            }
+            ops = self._activations
+            return {
+                "active_neurons":      self._active,
+                "fatigued_neurons":    self._fatigued,
+                "signal_samples":      cnt,
+                "signal_mean":         mean,
+                "signal_p50":          self._percentile(0.50),
+                "signal_p90":          self._percentile(0.90),
+                "signal_p99":          self._percentile(0.99),
+                "signal_to_noise_ratio": mean / math.sqrt(var) if var > 0 else 0.0,
+                "age_distribution":    ages,
+                "efficiency":          self._efficiency_sum / n if n else 0.0,
+                "total_operations":    ops,
+                "reliability":         max(0.0, 1.0 - self._errors_seen / ops) if ops else 1.0,
+                "avg_response_time":   self._response_time,
+            }
+
+
+class AgingWheel:
+    """Rueda temporal (hashed timing wheel) para el envejecimiento por lotes.
+
+    Cada neurona ocupa una ranura según el instante en que vuelve a tocarle
+    envejecer. ``age_all(now)`` lee el reloj una vez, avanza el cursor hasta
+    ``now`` y solo visita las ranuras vencidas, así que las neuronas que aún
+    no tocan no cuestan ni una adquisición de lock. Si una neurona está
+    ocupada recibiendo señal (lock no disponible) se reprograma al siguiente
+    tick en lugar de esperar.
+
+    Cada entrada lleva la generación de la neurona: al volver a añadir un id
+    las entradas antiguas quedan obsoletas y se descartan al vencer.
+    """
+
+    def __init__(self, interval: float = DEFAULT_PROCESSING_INTERVAL,
+                 tick: float = DEFAULT_PROCESSING_INTERVAL, slots: int = 512):
+        self.interval = max(tick, float(interval))
+        self.tick     = float(tick)
+        self.slots: List[List[Tuple[float, str, int]]] = [[] for _ in range(slots)]
+        self._neurons: Dict[str, CognitiveAnimalNeuronBase] = {}
+        self._gen:     Dict[str, int] = {}
+        self._next_gen = 0
+        self._lock   = RLock()
+        self._cursor = int(time.time() / self.tick)
+
+    def _schedule(self, nid: str, gen: int, due: float) -> None:
+        self.slots[int(due / self.tick) % len(self.slots)].append((due, nid, gen))
+
+    def add(self, neuron: CognitiveAnimalNeuronBase, now: float = None) -> None:
+        now = now or time.time()
+        with self._lock:
+            self._next_gen += 1
+            self._neurons[neuron.neuron_id] = neuron
+            self._gen[neuron.neuron_id]     = self._next_gen
+            if not neuron._last_processed:
+                neuron._last_processed = now
+            self._schedule(neuron.neuron_id, self._next_gen, now + self.interval)
+
+    def remove(self, neuron_id: str) -> None:
+        # Las entradas pendientes en las ranuras se descartan al vencer
+        with self._lock:
+            self._neurons.pop(neuron_id, None)
+            self._gen.pop(neuron_id, None)
+
+    def age_all(self, now: float = None) -> int:
+        """Envejece todas las neuronas vencidas hasta ``now``. Retorna cuántas."""
+        now = now or time.time()
+        aged = 0
+        with self._lock:
+            target = int(now / self.tick)
+            n_slots = len(self.slots)
+            # Si el hueco supera una vuelta completa basta con visitar cada ranura una vez
+            start = max(self._cursor, target - n_slots + 1)
+            retry: List[Tuple[str, int]] = []
+            for t in range(start, target + 1):
+                slot = self.slots[t % n_slots]
+                if not slot:
+                    continue
+                keep = []
+                for entry in slot:
+                    due, nid, gen = entry
+                    if due > now:
+                        keep.append(entry)               # vueltas futuras
+                        continue
+                    if self._gen.get(nid) != gen:
+                        continue                         # retirada o re-añadida
+                    neuron = self._neurons[nid]
+                    if not neuron.lock.acquire(blocking=False):
+                        retry.append((nid, gen))
+                        continue
+                    try:
+                        dt = now - neuron._last_processed
+                        if dt > 0:
+                            neuron._apply_aging(dt, now)
+                            aged += 1
+                    except Exception as e:
+                        log_neuron_error(nid, f"Error en age_all: {e}")
+                        neuron._error_count += 1
+                    finally:
+                        neuron.lock.release()
+                    self._schedule(nid, gen, now + self.interval)
+                slot[:] = keep
+            for nid, gen in retry:
+                self._schedule(nid, gen, now + self.tick)
+            self._cursor = target + 1
+        return aged
+
+    def __len__(self) -> int:
+        return len(self._neurons)
+
+
 class CognitiveAnimalNetworkMaintenance:
     """Mantenimiento de la red animal cognitiva.
 
@@ -1792,27 +2252,84 @@ class CognitiveAnimalNetworkMaintenance:
     No aplica tiempo de vida.
     """
 
-    def __init__(self):
+    def __init__(self, aging_interval: float = DEFAULT_PROCESSING_INTERVAL):
         self.neurons: List[CognitiveAnimalNeuronBase] = []
+        self.index   = NeuronIndex()
+        self.stats   = AnimalNetworkStats()
         self.maintenance_interval    = 60.0
         self.last_maintenance        = time.time()
         self.cognitive_health_threshold = 0.6
         self.network_stability_score = 0.9
+        self.aging   = AgingWheel(interval=aging_interval)
+        self._aging_thread: Optional[Thread] = None
+        self._aging_stop = Event()
+        # Agregados O(n) recalculados solo en el ciclo de mantenimiento
+        self._average_resilience = 0.0
+        self._total_synapses     = 0
 
     def add_neuron(self, neuron: CognitiveAnimalNeuronBase):
+        if neuron.neuron_id in self.index:
+            self.remove_neuron(neuron.neuron_id)
         self.neurons.append(neuron)
+        self.index.add(neuron)
+        self.stats.register(neuron)
+        self.aging.add(neuron)
+        neuron.stats_sink = self.stats
+
+    def remove_neuron(self, neuron_id: str) -> Optional[CognitiveAnimalNeuronBase]:
+        neuron = self.index.remove(neuron_id)
+        if neuron is not None:
+            self.neurons.remove(neuron)
+            self.stats.unregister(neuron)
+            self.aging.remove(neuron_id)
+            if neuron.stats_sink is self.stats:
+                neuron.stats_sink = None
+        return neuron
+
+    def get_neuron_by_subtype(self, subtype: str) -> Optional[CognitiveAnimalNeuronBase]:
+        return self.index.first_by_subtype(subtype)
+
+    def age_all(self, now: float = None) -> int:
+        """Envejece en bloque las neuronas vencidas con una sola lectura de reloj."""
+        return self.aging.age_all(now or time.time())
+
+    def start_aging_thread(self, period: float = 1.0) -> None:
+        """Ejecuta age_all periódicamente en un hilo de mantenimiento dedicado."""
+        if self._aging_thread and self._aging_thread.is_alive():
+            return
+        self._aging_stop.clear()
+
+        def _loop():
+            while not self._aging_stop.wait(period):
+                try:
+                    self.age_all()
+                except Exception as e:
+                    log_event(f"Error en hilo de envejecimiento: {e}", "ERROR")
 
-    def run_maintenance_cycle(self):
+        self._aging_thread = Thread(target=_loop, daemon=True, name="AnimalAging")
+        self._aging_thread.start()
+
+    def stop_aging_thread(self) -> None:
+        self._aging_stop.set()
+        if self._aging_thread:
+            self._aging_thread.join(timeout=5.0)
+            self._aging_thread = None
+
+    def run_maintenance_cycle(self) -> Dict[str, Any]:
         current_time = time.time()
-        delta_time   = current_time - self.last_maintenance
 
+        self.age_all(current_time)
+        errors = 0
         for neuron in self.neurons:
-            neuron.age_neuron(delta_time)
             self._optimize_cognitive_connections(neuron)
             self._manage_cognitive_interference(neuron)
+            errors += neuron._error_count
 
         self._maintain_global_network_stability()
+        self.stats.decay(current_time)
+        self.stats.record_errors(errors)
         self.last_maintenance = current_time
+        return self.get_network_stats()
 
     def _optimize_cognitive_connections(self, neuron: CognitiveAnimalNeuronBase):
         for synapse in neuron.synapses:
@@ -1827,33 +2344,29 @@ class CognitiveAnimalNetworkMaintenance:
         if self.neurons:
             total = sum(n.cognitive_resilience for n in self.neurons)
             self.network_stability_score = total / len(self.neurons)
+            self._average_resilience     = self.network_stability_score
+            self._total_synapses = sum(len(n.synapses) for n in self.neurons
+                                       if hasattr(n, "synapses"))
 
     def get_network_stats(self) -> Dict[str, Any]:
+        """Estadísticas de red en O(1) respecto al número de neuronas.
+
+        Las métricas de actividad vienen de los contadores incrementales;
+        resiliencia y sinapsis son las del último ciclo de mantenimiento.
+        """
+        live = self.stats.snapshot()
+        subtypes: Dict[str, int] = defaultdict(int)
+        for subtype, ids in list(self.index._by_subtype.items()):
+            subtypes[subtype] = len(ids)
         stats: Dict[str, Any] = {
-            "total_neurons":     len(self.neurons),
-            "network_stability": self.network_stability_score,
-            "average_age":       0.0,
-            "average_resilience": 0.0,
-            "total_synapses":    0,
-            "neuron_subtypes":   defaultdict(int),
-            # Métricas añadidas para compatibilidad con demostración
-            "decision_accuracy": 0.75,
-            "memory_consistency": 0.85,
-            "efficiency":        0.9,
-            "reliability":       0.95,
-            "signal_to_noise_ratio": 0.9,
-            "success_rate":      0.88,
-            "avg_response_time": 0.15,
-            "energy_efficiency": 0.94,
-            "total_operations":  0,
+            "total_neurons":      len(self.neurons),
+            "network_stability":  self.network_stability_score,
+            "average_age":        live["age_distribution"]["mean"],
+            "average_resilience": self._average_resilience,
+            "total_synapses":     self._total_synapses,
+            "neuron_subtypes":    subtypes,
         }
-        if self.neurons:
-            stats["average_age"]       = sum(n.age for n in self.neurons) / len(self.neurons)
-            stats["average_resilience"] = sum(n.cognitive_resilience for n in self.neurons) / len(self.neurons)
-            stats["total_synapses"]    = sum(len(n.synapses) for n in self.neurons if hasattr(n, "synapses"))
-            stats["total_operations"]  = sum(n._activation_count for n in self.neurons)
-            for n in self.neurons:
-                stats["neuron_subtypes"][n.neuron_subtype] += 1
+        stats.update(live)
         return stats
 
 
@@ -1879,8 +2392,16 @@ def create_cognitive_animal_network(
 
 
 def get_neuron_by_subtype(
-    network: List[CognitiveAnimalNeuronBase], subtype: str
+    network, subtype: str
 ) -> Optional[CognitiveAnimalNeuronBase]:
+    """Primera neurona del subtipo dado.
+
+    Si ``network`` es un ``NeuronIndex`` o expone uno en ``.index``
+    la búsqueda es O(1); con una lista simple se recorre linealmente.
+    """
+    index = network if isinstance(network, NeuronIndex) else getattr(network, "index", None)
+    if isinstance(index, NeuronIndex):
+        return index.first_by_subtype(subtype)
     for n in network:
         if n.neuron_subtype == subtype:
             return n
@@ -42,7 +42,7 @@ from enum import Enum
 from threading import RLock, Thread, Event
 from typing import Any, Dict, List, Optional, Tuple
 
-from monitoring import log_event, log_neuron_error
+from monitoring import log_event, log_neuron_error, profiling_checkpoint
 from animal    import create_cognitive_animal_neuron,   CognitiveAnimalNeuronBase
 from micelial  import create_cognitive_micelial_neuron, CognitiveMicelialNeuronBase
 from synapse   import SynapseManager
@@ -679,6 +679,7 @@ class BackgroundThinker:
         while not self._stop.is_set():
             try:
                 self._cycle += 1
+                profiling_checkpoint()
 
                 # 1. Detectar necesidad
                 triggers = self.detector.check()
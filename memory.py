@@ -41,7 +41,9 @@ from collections import deque, defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
 from threading import RLock
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from monitoring import timed
 
 # ── Integración opcional con adaptive.py ────────────────────────────────────
 try:
@@ -175,6 +177,34 @@ class MemoryStore:
                     self._emotion_index[inst].append(fragment.fid)
             self._total_stored += 1
 
+    def add_many(self, fragments: Iterable[Fragment]) -> int:
+        """Inserta un lote con una sola toma del lock (carga al despertar).
+
+        Mismo efecto que ``add`` por cada fragmento, pero los índices se
+        deduplican con conjuntos en vez de buscar en las listas.
+        """
+        n = 0
+        with self._lock:
+            seen: Dict[Tuple[int, str], set] = {}
+
+            def _index(index: Dict[str, List[str]], kind: int, key: str, fid: str):
+                fids = seen.get((kind, key))
+                if fids is None:
+                    fids = seen[(kind, key)] = set(index[key])
+                if fid not in fids:
+                    fids.add(fid)
+                    index[key].append(fid)
+
+            for fragment in fragments:
+                self._layers[fragment.layer][fragment.fid] = fragment
+                for t in fragment.tags:
+                    _index(self._tag_index, 0, t, fragment.fid)
+                for inst in fragment.emotion.instinct_tags:
+                    _index(self._emotion_index, 1, inst, fragment.fid)
+                n += 1
+            self._total_stored += n
+        return n
+
     # ── Acceso ────────────────────────────────────────────────────────────
     def get(self, fid: str) -> Optional[Fragment]:
         with self._lock:
@@ -186,6 +216,15 @@ class MemoryStore:
                     return f
         return None
 
+    def peek(self, fid: str) -> Optional[Fragment]:
+        """Como ``get`` pero sin contar como acceso (introspección, persistencia)."""
+        with self._lock:
+            for layer_dict in self._layers.values():
+                f = layer_dict.get(fid)
+                if f is not None:
+                    return f
+        return None
+
     def all_fragments(self) -> List[Fragment]:
         with self._lock:
             return [f for d in self._layers.values() for f in d.values()]
@@ -280,6 +319,11 @@ class MemoryStore:
                     return
 
     # ── Estadísticas ──────────────────────────────────────────────────────
+    def layer_counts(self) -> Dict[str, int]:
+        """Fragmentos por capa en O(capas), apto para exportar cada pocos segundos."""
+        with self._lock:
+            return {l.value: len(d) for l, d in self._layers.items()}
+
     def stats(self) -> Dict[str, Any]:
         with self._lock:
             counts = {l.value: len(d) for l, d in self._layers.items()}
@@ -573,6 +617,7 @@ class MemoryManager:
         return fid
 
     # ── Recordar ──────────────────────────────────────────────────────────
+    @timed("memory.recall")
     def recall(self, cue_tags: List[str],
                valence: float  = 0.0,
                arousal: float  = 0.5,
@@ -752,10 +797,9 @@ class MemoryManager:
     # ── Yo / Identidad ────────────────────────────────────────────────────
     def get_self_profile(self) -> Dict[str, Any]:
         """Retorna el perfil de identidad construido por las memorias del yo."""
-        conscious = [self.store.get(fid) for fid in self._self_fids
-                     if self.store.get(fid)]
-        shadow    = [self.store.get(fid) for fid in self._shadow_fids
-                     if self.store.get(fid)]
+        # Mirarse a sí mismo no es recordar: no altera acceso ni recencia
+        conscious = [f for f in map(self.store.peek, self._self_fids) if f]
+        shadow    = [f for f in map(self.store.peek, self._shadow_fids) if f]
 
         all_self = conscious + shadow
         if not all_self:
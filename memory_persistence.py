@@ -27,33 +27,56 @@ Estructura en disco:
     self/
       nucleus.jsonl          ← fragmentos SELF (append-only)
       shadow.jsonl           ← yo inconsciente (append-only)
-      continuity.jsonl       ← historia de eventos de identidad (append-only)
+      continuity.jsonl       ← historia de eventos de identidad (append-only, rota)
       identity_vector.json   ← perfil emocional actual del yo
+      archive/
+        continuity.{ts}.jsonl ← segmentos rotados (los más recientes)
     consolidated/
+      fragments.seg          ← fragmentos consolidados (segmento append-only)
+      fragments.idx          ← índice lateral fid → offset del segmento
       fragments/
-        {fid}.json           ← fragmento individual
+        {fid}.json           ← solo importación/exportación (formato legado)
       clusters/
         {cluster_id}.json    ← clúster emocional
       graph.jsonl            ← aristas de relación (append-only)
     associative/
       fragments/
-        {fid}.json
+        {fid}.frag           ← o .json si el códec es JSON
     sessions/
       {ts}_session.json      ← registro de cada sesión (cuándo despertó/durmió)
+      summary.json           ← totales de las sesiones podadas
+    snapshots/
+      manifest.json          ← instantánea vigente + offset/inodo de cada .jsonl
+      {ts}.snapshot.json     ← estado reducido de los .jsonl hasta esos offsets
+      checkpoint.json        ← último go_to_sleep: qué capas llegó a volcar
 """
 
 from __future__ import annotations
 
 import json
+import marshal
+import mmap
+import multiprocessing
 import os
+import pickle
+import struct
+import sys
 import time
 import hashlib
+import threading
 import traceback
-from collections import defaultdict
+import weakref
+import zlib
+from collections import Counter, OrderedDict, defaultdict
+from itertools import chain, repeat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from threading import RLock, Thread
-from typing import Any, Dict, List, Optional, Tuple
+from threading import Condition, Lock, RLock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from monitoring import log_event, timed
 
 # ── Importar estructuras de memory.py ────────────────────────────────────────
 from memory import (
@@ -61,6 +84,14 @@ from memory import (
     MemoryStore, _LAYER_ORDER
 )
 
+# ── NumPy opcional: clusterización vectorizada ───────────────────────────────
+try:
+    import numpy as np
+    _HAS_NUMPY = True
+except ImportError:
+    np = None
+    _HAS_NUMPY = False
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  SERIALIZACIÓN DE FRAGMENTOS
@@ -117,13 +148,28 @@ def _dict_to_fragment(d: Dict) -> Fragment:
     )
 
 
+def _fragment_signature(f: Fragment) -> int:
+    """Huella de los campos que se persisten (sin ``_persisted_at``).
+
+    Solo vive en RAM: sirve para saber, al dormir, si el fragmento cambió
+    desde que se escribió o se cargó.
+    """
+    e = f.emotion
+    return hash((f.content, tuple(f.tags), f.modality, e.valence, e.arousal,
+                 tuple(e.instinct_tags), f.strength, f.layer, f.creation_ts,
+                 f.last_access, f.access_count, f.identity_weight, f.conscious,
+                 tuple(f.temporal_overlaps)))
+
+
 def _write_json(path: Path, data: Any, indent: int = 2):
     """Escribe JSON de forma atómica (write-then-rename)."""
     path.parent.mkdir(parents=True, exist_ok=True)
     tmp = path.with_suffix(".tmp")
     try:
+        # dumps y no dump: con indent=None solo dumps usa el codificador en C
+        payload = json.dumps(data, ensure_ascii=False, indent=indent)
         with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=indent)
+            f.write(payload)
         tmp.rename(path)
     except Exception as e:
         if tmp.exists():
@@ -131,11 +177,18 @@ def _write_json(path: Path, data: Any, indent: int = 2):
         raise
 
 
-def _append_jsonl(path: Path, record: Dict):
-    """Añade una línea JSON a un archivo .jsonl (append-only, nunca reescribe)."""
+def _write_bytes(path: Path, data: bytes):
+    """Escribe bytes de forma atómica (write-then-rename)."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    tmp = path.with_suffix(".tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        tmp.rename(path)
+    except Exception:
+        if tmp.exists():
+            tmp.unlink()
+        raise
 
 
 def _read_jsonl(path: Path) -> List[Dict]:
@@ -154,6 +207,36 @@ def _read_jsonl(path: Path) -> List[Dict]:
     return records
 
 
+def _read_jsonl_tail(path: Path, offset: int = 0,
+                     ino: Optional[int] = None) -> Tuple[List[Dict], int, int, int]:
+    """Lee las líneas completas de un .jsonl a partir de ``offset``.
+
+    Si el archivo ya no es el mismo (otro inodo) o es más corto que
+    ``offset`` se lee desde el principio. Retorna ``(registros, inicio, fin,
+    inodo)``; ``fin`` es el byte siguiente al último salto de línea, de modo
+    que una línea a medio escribir se relee entera la próxima vez.
+    """
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if (ino is not None and st.st_ino != ino) or st.st_size < offset:
+                offset = 0
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        return [], 0, 0, 0
+    cut = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:cut].splitlines():
+        line = line.strip()
+        if line:
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                pass
+    return records, offset, offset + cut, st.st_ino
+
+
 def _read_json(path: Path, default: Any = None) -> Any:
     """Lee un archivo JSON, retorna default si no existe o está corrupto."""
     if not path.exists():
@@ -165,6 +248,785 @@ def _read_json(path: Path, default: Any = None) -> Any:
         return default
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CÓDECS DE FRAGMENTOS
+#  Cómo se convierte el dict de un fragmento en bytes (segmento y archivos
+#  asociativos). JSON va sin cabecera, como siempre; los demás códecs
+#  anteponen magia + versión + id de códec, así que al leer se detecta solo.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_CODEC_MAGIC   = b"EVFR"
+_CODEC_VERSION = 1
+_CODEC_HEADER  = struct.Struct("<4sBB")          # magia, versión, id de códec
+
+# Claves que produce _fragment_to_dict: un dict con otras no cabe en el
+# códec binario y se escribe en JSON para no perderlas
+_FRAGMENT_KEYS = frozenset((
+    "fid", "content", "tags", "modality", "emotion", "strength", "layer",
+    "creation_ts", "last_access", "access_count", "identity_weight",
+    "conscious", "temporal_overlaps", "_persisted_at", "_schema_version"))
+_EMOTION_KEYS  = frozenset(("valence", "arousal", "instinct_tags"))
+
+
+class FragmentCodec:
+    """Conversión dict ↔ bytes de un fragmento.
+
+    El id 0 es JSON, que se escribe sin cabecera (un payload sin la magia
+    se lee como JSON). ``decode`` recibe el cuerpo ya sin la cabecera.
+    """
+    name:     str = ""
+    codec_id: int = 0
+    suffix:   str = ".frag"       # extensión de los archivos asociativos
+
+    def encode(self, d: Dict) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, body) -> Dict:
+        raise NotImplementedError
+
+
+class JsonCodec(FragmentCodec):
+    """JSON compacto: legible y el único que admite claves arbitrarias."""
+    name, codec_id, suffix = "json", 0, ".json"
+
+    def encode(self, d: Dict) -> bytes:
+        return json.dumps(d, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, body) -> Dict:
+        return json.loads(body)
+
+
+class BinaryCodec(FragmentCodec):
+    """Numéricos empaquetados con ``struct`` y tabla de cadenas UTF-8.
+
+    Cuerpo: ``_HEAD`` (numéricos, nº de cadenas y de tags, instintos y
+    solapes) | longitud en bytes de cada cadena (u32) | índices de los tags,
+    instintos y solapes en la tabla (u16) | bytes de las cadenas. La tabla
+    empieza por fid, contenido, modalidad y capa; un tag repetido se guarda
+    una sola vez y al leer se interna con ``sys.intern``, de modo que miles
+    de fragmentos comparten la misma cadena.
+    """
+    name, codec_id = "binary", 1
+
+    # valence, arousal, strength, creation_ts, last_access, identity_weight,
+    # _persisted_at, access_count, _schema_version, conscious,
+    # nº de cadenas, nº de tags, de instintos y de solapes
+    _HEAD = struct.Struct("<7dqH?4H")
+
+    def encode(self, d: Dict) -> bytes:
+        emo = d["emotion"]
+        if not (d.keys() <= _FRAGMENT_KEYS and emo.keys() <= _EMOTION_KEYS):
+            raise ValueError("claves fuera del esquema de fragmento")
+        strings = [d["fid"], d["content"], d["modality"], d["layer"]]
+        table: Dict[str, int] = {}
+        index: List[int] = []
+        counts = []
+        for seq in (d.get("tags", ()), emo.get("instinct_tags", ()),
+                    d.get("temporal_overlaps", ())):
+            for s in seq:
+                i = table.get(s)
+                if i is None:
+                    i = table[s] = len(strings)
+                    strings.append(s)
+                index.append(i)
+            counts.append(len(seq))
+        raw = [s.encode("utf-8") for s in strings]
+        n   = len(raw)
+        return b"".join((
+            self._HEAD.pack(
+                emo["valence"], emo["arousal"], d["strength"],
+                d["creation_ts"], d["last_access"], d.get("identity_weight", 0.0),
+                d.get("_persisted_at", 0.0), d["access_count"],
+                d.get("_schema_version", 1), d.get("conscious", True), n, *counts),
+            struct.pack(f"<{n}I{len(index)}H", *map(len, raw), *index),
+            *raw,
+        ))
+
+    def decode(self, body) -> Dict:
+        (valence, arousal, strength, creation_ts, last_access, identity_weight,
+         persisted_at, access_count, schema_version, conscious,
+         n, t, k, o) = self._HEAD.unpack_from(body)
+        fmt  = struct.Struct(f"<{n}I{t + k + o}H")
+        refs = fmt.unpack_from(body, self._HEAD.size)
+        pos  = self._HEAD.size + fmt.size
+        blob = body[pos:]
+        if sum(refs[:n]) != len(blob):
+            raise ValueError("longitud de cuerpo binario inesperada")
+        text = str(blob, "utf-8")
+        # Todo ASCII (lo habitual): longitudes en bytes = en caracteres, se
+        # decodifica una vez y se corta; si no, cadena a cadena
+        ascii_only = len(text) == len(blob)
+        strings, pos = [], 0
+        for length in refs[:n]:
+            strings.append(text[pos:pos + length] if ascii_only
+                           else str(blob[pos:pos + length], "utf-8"))
+            pos += length
+        intern = sys.intern
+        seq = [intern(strings[i]) for i in refs[n:]]
+        k  += t
+        return {
+            "fid":               strings[0],
+            "content":           strings[1],
+            "tags":              seq[:t],
+            "modality":          intern(strings[2]),
+            "emotion": {
+                "valence":       valence,
+                "arousal":       arousal,
+                "instinct_tags": seq[t:k],
+            },
+            "strength":          strength,
+            "layer":             intern(strings[3]),
+            "creation_ts":       creation_ts,
+            "last_access":       last_access,
+            "access_count":      access_count,
+            "identity_weight":   identity_weight,
+            "conscious":         conscious,
+            "temporal_overlaps": seq[k:],
+            "_persisted_at":     persisted_at,
+            "_schema_version":   schema_version,
+        }
+
+
+class MarshalCodec(FragmentCodec):
+    """``marshal`` (versión 4): el más rápido, pero atado a CPython."""
+    name, codec_id = "marshal", 2
+
+    def encode(self, d: Dict) -> bytes:
+        return marshal.dumps(d, 4)
+
+    def decode(self, body) -> Dict:
+        return marshal.loads(body)
+
+
+class PickleCodec(FragmentCodec):
+    """pickle protocolo 5. Solo para memoria propia: cargar ejecuta código."""
+    name, codec_id = "pickle", 3
+
+    def encode(self, d: Dict) -> bytes:
+        return pickle.dumps(d, protocol=5)
+
+    def decode(self, body) -> Dict:
+        return pickle.loads(body)
+
+
+_CODECS:       Dict[str, FragmentCodec] = {}
+_CODECS_BY_ID: Dict[int, FragmentCodec] = {}
+
+
+def register_codec(codec: FragmentCodec) -> FragmentCodec:
+    """Añade un códec al registro (nombre e id de un byte, únicos)."""
+    if not 0 <= codec.codec_id <= 0xFF:
+        raise ValueError(f"id de códec fuera de rango: {codec.codec_id}")
+    other = _CODECS_BY_ID.get(codec.codec_id)
+    if other is not None and other.name != codec.name:
+        raise ValueError(f"id de códec {codec.codec_id} ya usado por {other.name!r}")
+    _CODECS[codec.name] = _CODECS_BY_ID[codec.codec_id] = codec
+    return codec
+
+
+for _codec in (JsonCodec(), BinaryCodec(), MarshalCodec(), PickleCodec()):
+    register_codec(_codec)
+
+
+def get_codec(name: str) -> FragmentCodec:
+    try:
+        return _CODECS[name]
+    except KeyError:
+        raise ValueError(f"códec desconocido: {name!r}") from None
+
+
+def _encode_fragment(d: Dict, codec: str = "json") -> bytes:
+    """Serializa el dict de un fragmento con ``codec``.
+
+    Si el códec no puede representarlo (claves fuera del esquema, tipos o
+    rangos que no caben) se recurre a JSON, que siempre se puede leer.
+    """
+    c = get_codec(codec)
+    if c.codec_id:
+        try:
+            return _CODEC_HEADER.pack(_CODEC_MAGIC, _CODEC_VERSION, c.codec_id) + c.encode(d)
+        except (AttributeError, KeyError, TypeError, ValueError,
+                OverflowError, struct.error):
+            c = _CODECS["json"]
+    return c.encode(d)
+
+
+def _decode_fragment(payload: bytes) -> Dict:
+    """Decodifica un fragmento detectando el formato por la cabecera.
+
+    Cualquier payload ilegible (truncado, versión o códec desconocidos)
+    lanza ``ValueError``.
+    """
+    if payload[:4] != _CODEC_MAGIC:
+        return json.loads(payload)
+    try:
+        _, version, cid = _CODEC_HEADER.unpack_from(payload)
+        codec = _CODECS_BY_ID.get(cid)
+        if codec is None or version > _CODEC_VERSION:
+            raise ValueError(f"códec {cid} v{version} no soportado")
+        d = codec.decode(payload[_CODEC_HEADER.size:])
+    except ValueError:
+        raise
+    except Exception as e:       # struct.error, EOFError, UnpicklingError...
+        raise ValueError(f"fragmento ilegible: {e}") from e
+    if not isinstance(d, dict):
+        raise ValueError("el payload no es un fragmento")
+    return d
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  SEGMENTOS DE FRAGMENTOS
+#  Un único archivo append-only en lugar de un .json por fragmento. Cada
+#  registro lleva longitud y CRC; la última versión de cada fid es la válida.
+#  Un índice lateral (fid → offset) evita re-escanear todo al abrir, y la
+#  compactación en segundo plano descarta las versiones superadas.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_SEG_MAGIC       = b"EVSG"
+_SEG_VERSION     = 1
+_SEG_FILE_HEADER = struct.Struct("<4sB3x")
+_SEG_RECORD      = struct.Struct("<BHII")    # tipo, len(fid), len(payload), crc32
+_SEG_PUT, _SEG_DEL = 1, 2
+
+
+class SegmentStore:
+    """Almacén append-only de registros ``fid → bytes``.
+
+    Formato: cabecera ``EVSG`` + versión, seguida de registros
+    ``[tipo u8][len fid u16][len payload u32][crc32 u32][fid][payload]``.
+    Un borrado es un registro ``_SEG_DEL`` sin payload. Si el último registro
+    quedó a medias (corte de luz), se trunca al abrir.
+
+    El índice lateral (.idx) describe el archivo hasta cierto tamaño; al
+    abrir se escanea solo la cola posterior. Se reescribe al compactar, en
+    ``checkpoint``/``close`` y cuando esa cola supera
+    ``max(compact_min_bytes, tamaño / 2)``, así que su coste se amortiza
+    sobre lo escrito y no sobre cada fsync.
+    """
+
+    def __init__(self, path: Path, compact_ratio: float = 0.5,
+                 compact_min_bytes: int = 1 << 20):
+        self.path              = Path(path)
+        self.idx_path          = self.path.with_suffix(".idx")
+        self.compact_ratio     = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+        self._lock     = RLock()
+        self._index:   Dict[str, Tuple[int, int]] = {}   # fid → (offset payload, len)
+        self._size     = 0
+        self._dead     = 0        # bytes ocupados por versiones superadas
+        self._dirty    = False    # hay escrituras sin volcar al SO
+        self._side_size = 0   # tamaño que cubre el índice lateral en disco
+        self._fh       = None
+        self._rfh      = None
+        self._compacting: Optional[Thread] = None
+        self._total_compactions = 0
+        self._open()
+
+    # ── Apertura ──────────────────────────────────────────────────────────
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            with open(self.path, "wb") as f:
+                f.write(_SEG_FILE_HEADER.pack(_SEG_MAGIC, _SEG_VERSION))
+        size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            magic, version = _SEG_FILE_HEADER.unpack(f.read(_SEG_FILE_HEADER.size))
+        if magic != _SEG_MAGIC or version > _SEG_VERSION:
+            raise ValueError(f"{self.path}: no es un segmento de fragmentos v{_SEG_VERSION}")
+
+        start = self._load_sidecar(size)
+        with open(self.path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                end = self._scan(mm, start, size)
+            finally:
+                mm.close()
+        if end < size:
+            # Registro final incompleto o corrupto: se descarta
+            with open(self.path, "r+b") as f:
+                f.truncate(end)
+        self._size = end
+        self._fh   = open(self.path, "ab")
+        self._rfh  = open(self.path, "rb")
+
+    def _load_sidecar(self, size: int) -> int:
+        """Carga el índice lateral si sigue describiendo este archivo."""
+        side = _read_json(self.idx_path)
+        if (not side or side.get("version") != _SEG_VERSION
+                or side.get("ino") != self.path.stat().st_ino
+                or not 0 < side.get("size", 0) <= size):
+            return _SEG_FILE_HEADER.size
+        self._index = {fid: (e[0], e[1]) for fid, e in side["entries"].items()}
+        self._dead  = side.get("dead", 0)
+        self._side_size = side["size"]
+        return side["size"]
+
+    def _scan(self, mm, pos: int, end: int) -> int:
+        rec = _SEG_RECORD
+        while pos + rec.size <= end:
+            kind, flen, plen, crc = rec.unpack_from(mm, pos)
+            body = pos + rec.size
+            stop = body + flen + plen
+            if stop > end or kind not in (_SEG_PUT, _SEG_DEL):
+                break
+            if zlib.crc32(mm[body + flen:stop]) != crc:
+                break
+            fid = mm[body:body + flen].decode("utf-8")
+            self._apply(kind, fid, body + flen, plen, stop - pos)
+            pos = stop
+        return pos
+
+    def _apply(self, kind: int, fid: str, offset: int, length: int, rec_len: int):
+        old = self._index.pop(fid, None)
+        if old is not None:
+            self._dead += _SEG_RECORD.size + len(fid.encode("utf-8")) + old[1]
+        if kind == _SEG_PUT:
+            self._index[fid] = (offset, length)
+        else:
+            self._dead += rec_len
+
+    # ── Escritura ─────────────────────────────────────────────────────────
+    def _append(self, kind: int, fid: str, payload: bytes):
+        fidb = fid.encode("utf-8")
+        head = _SEG_RECORD.pack(kind, len(fidb), len(payload), zlib.crc32(payload))
+        rec_len = len(head) + len(fidb) + len(payload)
+        with self._lock:
+            offset = self._size + len(head) + len(fidb)
+            self._fh.write(head + fidb + payload)
+            self._size += rec_len
+            self._dirty = True
+            self._apply(kind, fid, offset, len(payload), rec_len)
+
+    def put(self, fid: str, payload: bytes):
+        self._append(_SEG_PUT, fid, payload)
+
+    def delete(self, fid: str):
+        with self._lock:
+            if fid in self._index:
+                self._append(_SEG_DEL, fid, b"")
+
+    def flush(self, sync: bool = False):
+        """Vuelca al SO; con ``sync`` fuerza fsync.
+
+        El índice lateral solo se reescribe si la cola sin indexar ya es
+        grande: los registros son autodescriptivos y ``_open`` la reescanea.
+        """
+        with self._lock:
+            if self._dirty:
+                self._fh.flush()
+                self._dirty = False
+            if sync:
+                os.fsync(self._fh.fileno())
+                if self._size - self._side_size >= max(self.compact_min_bytes,
+                                                       self._size // 2):
+                    self._write_sidecar()
+
+    def _write_sidecar(self):
+        _write_json(self.idx_path, {
+            "version": _SEG_VERSION,
+            "ino":     self.path.stat().st_ino,
+            "size":    self._size,
+            "dead":    self._dead,
+            "entries": {fid: [o, n] for fid, (o, n) in self._index.items()},
+        }, indent=None)
+        self._side_size = self._size
+
+    def checkpoint(self):
+        """fsync y deja el índice lateral al día (apagado ordenado)."""
+        with self._lock:
+            self.flush(sync=True)
+            if self._side_size != self._size:
+                self._write_sidecar()
+
+    def close(self):
+        with self._lock:
+            if self._fh is None:
+                return
+            self.checkpoint()
+            self._fh.close()
+            self._rfh.close()
+            self._fh = self._rfh = None
+
+    # ── Lectura ───────────────────────────────────────────────────────────
+    def get(self, fid: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._index.get(fid)
+            if entry is None:
+                return None
+            self.flush()
+            self._rfh.seek(entry[0])
+            return self._rfh.read(entry[1])
+
+    def load_all(self) -> List[Tuple[str, bytes]]:
+        """Todos los registros vivos en una lectura secuencial vía mmap."""
+        with self._lock:
+            self.flush()
+            entries = sorted(self._index.items(), key=lambda kv: kv[1][0])
+            if not entries:
+                return []
+            mm = mmap.mmap(self._rfh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return [(fid, mm[o:o + n]) for fid, (o, n) in entries]
+            finally:
+                mm.close()
+
+    def __contains__(self, fid: str) -> bool:
+        return fid in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    # ── Compactación ──────────────────────────────────────────────────────
+    def needs_compaction(self) -> bool:
+        return (self._size >= self.compact_min_bytes
+                and self._dead > self._size * self.compact_ratio)
+
+    def maybe_compact(self) -> bool:
+        """Lanza la compactación en segundo plano si compensa."""
+        with self._lock:
+            if not self.needs_compaction():
+                return False
+            if self._compacting is not None and self._compacting.is_alive():
+                return False
+            self._compacting = Thread(target=self._compact_safe, daemon=True,
+                                      name="SegmentCompaction")
+            self._compacting.start()
+            return True
+
+    def _compact_safe(self):
+        try:
+            self.compact()
+        except Exception as e:
+            log_event(f"Compactación de {self.path.name} falló: {e}", "WARNING")
+
+    def compact(self) -> int:
+        """Reescribe solo las versiones vivas. Retorna bytes recuperados.
+
+        La copia se hace sin bloquear a los escritores; lo que se añada
+        mientras tanto se transfiere tal cual al final antes del rename.
+        """
+        with self._lock:
+            self.flush()
+            entries   = sorted(self._index.items(), key=lambda kv: kv[1][0])
+            snap_size = self._size
+        tmp = self.path.with_suffix(".compact")
+        copied: Dict[str, Tuple[int, int]] = {}
+        with open(self.path, "rb") as src, open(tmp, "wb") as dst:
+            dst.write(_SEG_FILE_HEADER.pack(_SEG_MAGIC, _SEG_VERSION))
+            pos = _SEG_FILE_HEADER.size
+            for fid, (off, n) in entries:
+                src.seek(off)
+                payload = src.read(n)
+                fidb = fid.encode("utf-8")
+                dst.write(_SEG_RECORD.pack(_SEG_PUT, len(fidb), n, zlib.crc32(payload)))
+                dst.write(fidb)
+                dst.write(payload)
+                pos += _SEG_RECORD.size + len(fidb)
+                copied[fid] = (pos, n)
+                pos += n
+
+            with self._lock:
+                self.flush()
+                src.seek(snap_size)
+                dst.write(src.read(self._size - snap_size))
+                dst.flush()
+                os.fsync(dst.fileno())
+                shift = pos - snap_size
+                index, live = {}, _SEG_FILE_HEADER.size
+                for fid, (off, n) in self._index.items():
+                    index[fid] = (off + shift, n) if off >= snap_size else copied[fid]
+                    live += _SEG_RECORD.size + len(fid.encode("utf-8")) + n
+                new_size  = pos + (self._size - snap_size)
+                reclaimed = self._size - new_size
+
+                self._fh.close()
+                self._rfh.close()
+                os.replace(tmp, self.path)
+                self._index = index
+                self._size  = new_size
+                self._dead  = new_size - live
+                self._fh    = open(self.path, "ab")
+                self._rfh   = open(self.path, "rb")
+                self._write_sidecar()
+                self._total_compactions += 1
+        return reclaimed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "records":     len(self._index),
+                "bytes":       self._size,
+                "dead_bytes":  self._dead,
+                "compactions": self._total_compactions,
+            }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CARGA EN PARALELO
+#  Al despertar, leer y decodificar miles de fragmentos domina el arranque.
+#  Los lotes se reparten en un pool (hilos para E/S, procesos para lotes
+#  grandes) que devuelve dicts planos; construir los Fragment e insertarlos
+#  en el store se hace después, de una vez, en el hilo principal.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_LOAD_CHUNK_MIN     = 16
+_LOAD_CHUNK_MAX     = 512
+# Arrancar procesos (spawn) cuesta centenas de ms y el padre aún deserializa
+# cada dict (~5 µs frente a ~23 µs de leer y parsear): solo compensa en lotes
+# muy grandes.
+_PROCESS_MIN_ITEMS  = 50000
+
+
+def _read_fragment_chunk(paths: List[str]) -> List[Tuple[str, Dict]]:
+    """Lee un lote de archivos de fragmento (cualquier códec) y omite los
+    ilegibles. Función de módulo para poder enviarla a otro proceso."""
+    out = []
+    for p in paths:
+        try:
+            with open(p, "rb") as f:
+                d = _decode_fragment(f.read())
+        except (OSError, ValueError):
+            continue
+        if d:
+            out.append((p, d))
+    return out
+
+
+def _decode_chunk(payloads: List[bytes]) -> List[Dict]:
+    """Decodifica un lote de registros del segmento; omite los ilegibles."""
+    out = []
+    for payload in payloads:
+        try:
+            out.append(_decode_fragment(payload))
+        except ValueError:
+            pass
+    return out
+
+
+def _map_chunks(func, items: List, workers: int, processes: bool = False) -> List:
+    """Aplica ``func`` por lotes a ``items`` y concatena los resultados en orden.
+
+    Con ``workers <= 1`` (o un solo lote) no se crea ningún pool. Si el pool
+    de procesos no puede arrancar se recurre a la lectura secuencial.
+    """
+    if not items:
+        return []
+    size   = -(-len(items) // max(1, workers * 4))
+    size   = max(_LOAD_CHUNK_MIN, min(_LOAD_CHUNK_MAX, size))
+    chunks = [items[i:i + size] for i in range(0, len(items), size)]
+    if workers <= 1 or len(chunks) == 1:
+        return [r for c in chunks for r in func(c)]
+    workers = min(workers, len(chunks))
+    try:
+        if processes:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"))
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers,
+                                      thread_name_prefix="eva-load")
+        with pool:
+            return [r for part in pool.map(func, chunks) for r in part]
+    except (OSError, BrokenProcessPool) as e:
+        log_event(f"Carga paralela no disponible ({e}); lectura secuencial", "WARNING")
+        return [r for c in chunks for r in func(c)]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  ESCRITURA DIFERIDA (write-behind)
+#  Los hilos de percepción solo encolan; un hilo escritor agrupa las líneas
+#  de cada .jsonl en un único write sobre un descriptor abierto, colapsa las
+#  actualizaciones repetidas de la misma clave y hace fsync una vez por lote.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class WriteBehindWriter:
+    """Cola acotada de escrituras con un hilo escritor.
+
+    - ``append(path, record, key)``: línea JSONL. Con ``key`` (p. ej. el fid),
+      una línea aún pendiente con la misma clave se reemplaza en su sitio.
+    - ``write_json(path, data)``: reescritura atómica; colapsa por ruta.
+      ``data`` puede ser un callable, evaluado en el hilo escritor.
+    - ``flush()``: bloquea hasta que todo lo encolado antes está en disco
+      (fsync incluido).
+
+    Con la cola llena, el productor espera (contrapresión). Con
+    ``enabled=False`` todo se escribe en línea, como antes.
+    """
+
+    def __init__(self, flush_interval_s: float = 1.0, max_pending: int = 10000,
+                 enabled: bool = True):
+        self.flush_interval_s = flush_interval_s
+        self.max_pending      = max_pending
+        self.enabled          = enabled
+        self.io_lock   = RLock()               # serializa el acceso a los archivos
+        self._cond     = Condition(Lock())
+        self._pending: "OrderedDict[Tuple, Tuple]" = OrderedDict()
+        self._first_ts = 0.0
+        self._seq      = 0
+        self._handles: Dict[Path, Any] = {}
+        self._requested = 0                    # generación de flush pedida
+        self._synced    = 0                    # generación de flush completada
+        self._inflight  = 0                    # operaciones sacadas de la cola y aún sin fsync
+        self._stop      = False
+        self._thread: Optional[Thread] = None
+        self._stats     = defaultdict(int)
+
+    # ── Productores ───────────────────────────────────────────────────────
+    def append(self, path: Path, record: Dict, key: Any = None):
+        if not self.enabled:
+            with self.io_lock:
+                fh = self._handle(path)
+                fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+                fh.flush()
+            return
+        with self._cond:
+            if key is None:
+                self._seq += 1
+                key = self._seq
+            self._put(("a", path, key), ("a", path, record))
+
+    def write_json(self, path: Path, data: Any):
+        if not self.enabled:
+            with self.io_lock:
+                _write_json(path, data() if callable(data) else data)
+            return
+        with self._cond:
+            self._put(("j", path), ("j", path, data))
+
+    def _put(self, key: Tuple, op: Tuple):
+        """Requiere ``self._cond`` tomado."""
+        if key in self._pending:
+            self._pending[key] = op
+            self._stats["coalesced"] += 1
+            return
+        while len(self._pending) >= self.max_pending and not self._stop:
+            self._stats["backpressure_waits"] += 1
+            self._cond.wait(0.1)
+        if not self._pending:
+            self._first_ts = time.monotonic()
+        self._pending[key] = op
+        self._stats["enqueued"] += 1
+        self._ensure_thread()
+        self._cond.notify_all()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop   = False
+            self._thread = Thread(target=self._run, daemon=True,
+                                  name="PersistenceWriteBehind")
+            self._thread.start()
+
+    # ── Sincronización ────────────────────────────────────────────────────
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Espera a que lo encolado hasta ahora esté escrito y sincronizado."""
+        if not self.enabled:
+            return True
+        with self._cond:
+            if not (self._pending or self._inflight) and self._requested == self._synced:
+                return True
+            self._requested += 1
+            target = self._requested
+            self._ensure_thread()
+            self._cond.notify_all()
+            deadline = time.monotonic() + timeout
+            while self._synced < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close_handle(self, path: Path):
+        """Cierra el descriptor de ``path`` (p. ej. tras reemplazar el archivo)."""
+        with self.io_lock:
+            fh = self._handles.pop(Path(path), None)
+            if fh is not None:
+                fh.close()
+
+    def close(self):
+        self.flush()
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        with self.io_lock:
+            for fh in self._handles.values():
+                fh.close()
+            self._handles.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats, pending=len(self._pending))
+
+    # ── Hilo escritor ─────────────────────────────────────────────────────
+    def _handle(self, path: Path):
+        path = Path(path)
+        fh = self._handles.get(path)
+        if fh is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fh = self._handles[path] = open(path, "a", encoding="utf-8")
+        return fh
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not (self._stop or self._requested != self._synced):
+                    if self._pending:
+                        wait = self._first_ts + self.flush_interval_s - time.monotonic()
+                        if wait <= 0 or len(self._pending) >= self.max_pending // 2:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                batch, self._pending = self._pending, OrderedDict()
+                self._inflight = len(batch)
+                gen  = self._requested
+                stop = self._stop
+                self._cond.notify_all()          # libera productores en espera
+            if batch:
+                self._write_batch(batch)
+            with self._cond:
+                self._inflight = 0
+                self._synced   = max(self._synced, gen)
+                self._cond.notify_all()
+                if stop and not self._pending:
+                    self._thread = None
+                    return
+
+    def _write_batch(self, batch: "OrderedDict[Tuple, Tuple]"):
+        lines: Dict[Path, List[str]] = {}
+        rewrites = []
+        for op in batch.values():
+            if op[0] == "a":
+                lines.setdefault(op[1], []).append(
+                    json.dumps(op[2], ensure_ascii=False) + "\n")
+            else:
+                rewrites.append(op)
+        with self.io_lock:
+            touched = []
+            for path, chunk in lines.items():
+                try:
+                    fh = self._handle(path)
+                    fh.write("".join(chunk))
+                    touched.append(fh)
+                    self._stats["records"] += len(chunk)
+                except Exception as e:
+                    log_event(f"Escritura diferida en {path} falló: {e}", "WARNING")
+            for _, path, data in rewrites:
+                try:
+                    _write_json(path, data() if callable(data) else data)
+                    self._stats["rewrites"] += 1
+                except Exception as e:
+                    log_event(f"Reescritura diferida de {path} falló: {e}", "WARNING")
+            for fh in touched:
+                fh.flush()
+                os.fsync(fh.fileno())
+            self._stats["batches"] += 1
+            self._stats["fsyncs"]  += len(touched)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  CLÚSTERES EMOCIONALES
 #  Un clúster es un patrón de resonancia, no un contenedor.
@@ -208,43 +1070,658 @@ class EmotionalCluster:
         return cls(**{k: d[k] for k in cls.__dataclass_fields__ if k in d})
 
 
+class _ClusterSums:
+    """Sumas acumuladas de un clúster sobre sus miembros presentes.
+
+    Con ellas el centroide y los dominantes se recalculan sin recorrer los
+    miembros: sumar o restar un fragmento es O(1) (más sus tags).
+    """
+    __slots__ = ("w", "wv", "wa", "tags", "insts")
+
+    def __init__(self):
+        self.w, self.wv, self.wa = 0.0, 0.0, 0.0
+        self.tags:  Counter = Counter()
+        self.insts: Counter = Counter()
+
+    def add(self, contrib: Tuple, sign: int = 1):
+        w, v, a, tags, insts = contrib
+        self.w  += sign * w
+        self.wv += sign * w * v
+        self.wa += sign * w * a
+        for counter, keys in ((self.tags, tags), (self.insts, insts)):
+            for k in keys:
+                n = counter[k] + sign
+                if n:
+                    counter[k] = n
+                else:
+                    del counter[k]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  CLUSTERIZACIÓN VECTORIZADA (requiere NumPy)
+#  La misma resonancia de EmotionalStamp.resonance_with más el bonus de tags,
+#  calculada como matriz fragmentos × clústeres por lotes: valencia y arousal
+#  como diferencias absolutas, instintos como one-hot (Jaccard con un
+#  producto matricial) y tags compartidos con un índice invertido tag →
+#  clústeres. Los lotes acotan la memoria; sin NumPy se usa el bucle Python.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_VEC_BATCH_CELLS = 1 << 21     # celdas fragmento × clúster por lote
+_SEED_LAYERS     = (MemoryLayer.CONSOLIDATED, MemoryLayer.SELF,
+                    MemoryLayer.ASSOCIATIVE)
+
+
+def _encode_lists(lists: List[List[str]]) -> Tuple[Dict[str, int], "np.ndarray"]:
+    """Listas de cadenas → (vocabulario, matriz n × L de índices, -1 de relleno).
+
+    Conserva el orden y las repeticiones de cada lista.
+    """
+    flat  = list(chain.from_iterable(lists))
+    vocab = {k: i for i, k in enumerate(dict.fromkeys(flat))}
+    lens  = np.fromiter(map(len, lists), np.int64, len(lists))
+    m = np.full((len(lists), max(1, int(lens.max(initial=0)))), -1, np.int64)
+    if flat:
+        rows = np.repeat(np.arange(len(lists)), lens)
+        cols = np.arange(len(flat)) - np.repeat(np.cumsum(lens) - lens, lens)
+        m[rows, cols] = np.fromiter(map(vocab.__getitem__, flat), np.int64, len(flat))
+    return vocab, m
+
+
+def _unique_rows(m: "np.ndarray") -> "np.ndarray":
+    """Copia de ``m`` con cada índice una sola vez por fila (semántica de set)."""
+    s = np.sort(m, axis=1)
+    dup = (s[:, 1:] == s[:, :-1]) & (s[:, 1:] >= 0)
+    s[:, 1:][dup] = -1
+    return s
+
+
+def _top_k_per_group(groups: "np.ndarray", items: "np.ndarray",
+                     n_groups: int, k: int) -> List[List[int]]:
+    """Los ``k`` ítems más frecuentes por grupo.
+
+    ``items`` es (m × L) con -1 de relleno y ``groups`` el grupo de cada fila.
+    Empates por orden de primera aparición, como el conteo en Python.
+    """
+    out: List[List[int]] = [[] for _ in range(n_groups)]
+    r, l = np.nonzero(items >= 0)
+    if not len(r):
+        return out
+    base = int(items.max()) + 1
+    keys = groups[r] * base + items[r, l]
+    uniq, first, counts = np.unique(keys, return_index=True, return_counts=True)
+    ug, ui = uniq // base, uniq % base
+    o = np.lexsort((first, -counts, ug))
+    ug, ui = ug[o], ui[o]
+    rank = np.arange(len(ug)) - np.searchsorted(ug, ug)
+    keep = rank < k
+    for g, i in zip(ug[keep].tolist(), ui[keep].tolist()):
+        out[g].append(i)
+    return out
+
+
+class _CentroidArrays:
+    """Centroides de una lista de clústeres.
+
+    Con los vocabularios de un ``_FragmentArrays`` quedan alineados con él
+    para puntuar fragmentos; sin ellos sirven para comparar clústeres.
+    """
+
+    def __init__(self, clusters: List[EmotionalCluster],
+                 inst_vocab: Optional[Dict[str, int]] = None,
+                 tag_vocab: Optional[Dict[str, int]] = None):
+        C = len(clusters)
+        tag_vocab = tag_vocab or {}
+        self.size = C
+        self.v = np.array([c.centroid_valence for c in clusters], np.float64)
+        self.a = np.array([c.centroid_arousal for c in clusters], np.float64)
+        # Columnas de instintos: las de los fragmentos y, detrás, las que solo
+        # aparecen en clústeres (cuentan para fusionar clústeres entre sí)
+        vocab = dict(inst_vocab or {})
+        for c in clusters:
+            for k in c.dominant_instincts:
+                vocab.setdefault(k, len(vocab))
+        self.inst = np.zeros((C, max(1, len(vocab))), np.float64)
+        self.inst_n = np.zeros(C, np.float64)
+        pairs = []
+        for j, c in enumerate(clusters):
+            insts = set(c.dominant_instincts)
+            self.inst_n[j] = len(insts)
+            for k in insts:
+                self.inst[j, vocab[k]] = 1.0
+            for t in set(c.dominant_tags):
+                g = tag_vocab.get(t)
+                if g is not None:
+                    pairs.append((g, j))
+        # Índice invertido tag (vocabulario de fragmentos) → clústeres
+        pairs.sort()
+        self.tag_clusters = np.array([j for _, j in pairs], np.int64)
+        self.tag_ptr = np.zeros(len(tag_vocab) + 1, np.int64)
+        if pairs:
+            np.add.at(self.tag_ptr, np.array([g for g, _ in pairs]) + 1, 1)
+        np.cumsum(self.tag_ptr, out=self.tag_ptr)
+
+
+class _FragmentArrays:
+    """Fragmentos como arrays: valencia, arousal, instintos one-hot, tags."""
+
+    def __init__(self, fragments: List[Fragment]):
+        n = len(fragments)
+        self.fids = [f.fid for f in fragments]
+        self.v = np.fromiter((f.emotion.valence for f in fragments), np.float64, n)
+        self.a = np.fromiter((f.emotion.arousal for f in fragments), np.float64, n)
+        self.strength = np.fromiter((f.strength for f in fragments), np.float64, n)
+        self.weight   = self.strength * (self.a * (0.7 + 0.3 * np.abs(self.v)))
+        self.eligible = np.fromiter((f.layer in _SEED_LAYERS for f in fragments),
+                                    bool, n)
+        # Listas tal cual (para contar dominantes) y sin repetidos (para puntuar)
+        self.inst_vocab, self.insts = _encode_lists(
+            [f.emotion.instinct_tags for f in fragments])
+        self.tag_vocab, self.tags_raw = _encode_lists([f.tags for f in fragments])
+        self.tags  = _unique_rows(self.tags_raw)
+        self.inst  = np.zeros((n, max(1, len(self.inst_vocab))), np.float64)
+        r, l = np.nonzero(self.insts >= 0)
+        self.inst[r, self.insts[r, l]] = 1.0
+        self.inst_n = self.inst.sum(axis=1)
+
+    def centroids(self, clusters: List[EmotionalCluster]) -> _CentroidArrays:
+        return _CentroidArrays(clusters, self.inst_vocab, self.tag_vocab)
+
+    def scores(self, rows: "np.ndarray", cent: _CentroidArrays) -> "np.ndarray":
+        """Puntuación de ``_best_cluster`` para cada fila × clúster."""
+        v, a = self.v[rows], self.a[rows]
+        val_sim = 1.0 - np.abs(v[:, None] - cent.v[None, :]) / 2.0
+        aro_sim = 1.0 - np.abs(a[:, None] - cent.a[None, :])
+        inter   = self.inst[rows] @ cent.inst[:, :self.inst.shape[1]].T
+        union   = self.inst_n[rows][:, None] + cent.inst_n[None, :] - inter
+        score   = val_sim * 0.4 + aro_sim * 0.35 + (inter / np.maximum(union, 1)) * 0.25
+        return score + self._tag_overlap(rows, cent) * 0.05
+
+    def _tag_overlap(self, rows: "np.ndarray", cent: _CentroidArrays) -> "np.ndarray":
+        out = np.zeros(len(rows) * cent.size, np.float64)
+        t = self.tags[rows]
+        r, l = np.nonzero(t >= 0)
+        g = t[r, l]
+        counts = cent.tag_ptr[g + 1] - cent.tag_ptr[g]
+        total  = int(counts.sum())
+        if total:
+            starts = np.repeat(cent.tag_ptr[g] - (np.cumsum(counts) - counts), counts)
+            cols   = cent.tag_clusters[starts + np.arange(total)]
+            np.add.at(out, np.repeat(r, counts) * cent.size + cols, 1.0)
+        return out.reshape(len(rows), cent.size)
+
+
+def _resonance_matrix(cent: _CentroidArrays, rows) -> "np.ndarray":
+    """``resonance_with`` entre los centroides ``rows`` y todos los demás."""
+    val_sim = 1.0 - np.abs(cent.v[rows, None] - cent.v[None, :]) / 2.0
+    aro_sim = 1.0 - np.abs(cent.a[rows, None] - cent.a[None, :])
+    inter   = cent.inst[rows] @ cent.inst.T
+    union   = cent.inst_n[rows, None] + cent.inst_n[None, :] - inter
+    return val_sim * 0.4 + aro_sim * 0.35 + (inter / np.maximum(union, 1)) * 0.25
+
+
 class ClusterEngine:
     """Motor de clusterización emocional.
 
     Forma clústeres por resonancia: dos fragmentos pertenecen al mismo clúster
     si su asociative_strength supera un umbral. Los clústeres evolucionan
     con el tiempo: crecen, se fusionan, algunos se vuelven nucleares (SELF).
+
+    ``update`` reconstruye todo a partir de la lista completa de fragmentos;
+    ``update_incremental`` procesa solo los fragmentos sucios, nuevos o
+    desaparecidos, apoyándose en sumas acumuladas por clúster. Ambos
+    registran qué clústeres cambiaron o se eliminaron (``pop_changes``).
+
+    Con ``vectorise=True``, NumPy y lotes grandes (ver VECTORISE_MIN_*) la
+    asignación, la fusión y el recálculo se hacen con matrices, con el mismo
+    resultado que el camino en Python.
     """
 
     MEMBERSHIP_THRESHOLD = 0.35
     MERGE_THRESHOLD      = 0.78
     MIN_CLUSTER_SIZE     = 2
+    VECTORISE_MIN_FRAGS  = 512       # update completo
+    VECTORISE_MIN_CELLS  = 1 << 14   # lote incremental: fragmentos × clústeres
 
-    def __init__(self):
+    def __init__(self, vectorise: bool = False):
+        self.vectorise = vectorise and _HAS_NUMPY
+        self._passes   = {"numpy": 0, "python": 0}   # camino elegido en cada pasada
         self._clusters: Dict[str, EmotionalCluster] = {}
         self._lock = RLock()
+        # Índice incremental: aporte (w, v, a, tags, instintos) de cada
+        # miembro presente, sumas por clúster y clústeres de cada fid.
+        self._contrib:   Dict[str, Dict[str, Tuple]] = {}
+        self._sums:      Dict[str, _ClusterSums] = {}
+        self._member_of: Dict[str, set] = defaultdict(set)
+        self._seen:      Optional[set] = None   # fids ya evaluados
+        self._index_valid = False
+        self._changed:   set = set()
+        self._removed:   set = set()
+
+    def _use_numpy(self, n_fragments: int, full: bool = False) -> bool:
+        if not self.vectorise:
+            use = False
+        elif full or n_fragments >= self.VECTORISE_MIN_FRAGS:
+            # Un lote grande siembra clústeres aunque aún no haya ninguno
+            use = n_fragments >= self.VECTORISE_MIN_FRAGS
+        else:
+            use = n_fragments * len(self._clusters) >= self.VECTORISE_MIN_CELLS
+        self._passes["numpy" if use else "python"] += 1
+        return use
 
     def update(self, fragments: List[Fragment]):
-        """Actualiza clústeres con la lista actual de fragmentos."""
+        """Actualiza clústeres con la lista actual de fragmentos (completo)."""
         with self._lock:
-            # Asignar cada fragmento al mejor clúster existente o crear uno nuevo
-            for f in fragments:
-                best_cid, best_score = self._best_cluster(f)
+            before   = set(self._clusters)
+            self._index_valid = False
+            if self._use_numpy(len(fragments), full=True):
+                self._update_vectorised(fragments)
+            else:
+                self._update_python(fragments)
+            # Las sumas del índice incremental se rehacen en la próxima pasada
+            self._seen    = {f.fid for f in fragments}
+            self._changed = set(self._clusters)
+            self._removed |= before - self._changed
+
+    def _update_python(self, fragments: List[Fragment]):
+        frag_map = {f.fid: f for f in fragments}
+        # Asignar cada fragmento al mejor clúster existente o crear uno nuevo
+        for f in fragments:
+            best_cid, best_score = self._best_cluster(f)
+            if best_score >= self.MEMBERSHIP_THRESHOLD:
+                self._add_to_cluster(f, best_cid)
+            elif f.layer in _SEED_LAYERS:
+                self._create_cluster(f)
+
+        # Fusionar clústeres muy similares
+        self._merge_similar()
+        # Actualizar centroides y coherencia
+        for cid in list(self._clusters.keys()):
+            self._recompute_cluster(cid, frag_map)
+        # Evolucionar etapas
+        self._evolve_stages()
+
+    def update_incremental(self, fragments: Dict[str, Fragment],
+                           dirty: Iterable[str] = ()):
+        """Actualiza clústeres procesando solo lo que cambió.
+
+        ``fragments`` es fid → Fragment de todo el store (solo se consulta);
+        ``dirty`` son los fids modificados desde la llamada anterior. Los
+        fids nunca vistos cuentan como sucios y los que ya no están en
+        ``fragments`` dejan de aportar a sus clústeres.
+        """
+        with self._lock:
+            touched: set = set()
+            if not self._index_valid:
+                # Los clústeres con miembros ausentes tienen el centroide
+                # calculado con ellos: se refrescan (o eliminan) en esta pasada
+                touched |= self._rebuild_index(fragments)
+            if self._seen is None:
+                # Recién cargados: los que no están en ningún clúster se evalúan
+                self._seen = set(self._member_of)
+
+            # Desaparecidos: restan su aporte (siguen en member_fids)
+            for fid in self._seen - fragments.keys():
+                self._seen.discard(fid)
+                for cid in self._member_of.pop(fid, ()):
+                    self._sums[cid].add(self._contrib[cid].pop(fid), -1)
+                    touched.add(cid)
+
+            todo = {fid for fid in dirty if fid in fragments}
+            todo |= fragments.keys() - self._seen
+            todo = [fragments[fid] for fid in sorted(todo)]
+            # Lote grande: mejores clústeres de una vez contra los actuales;
+            # cada clúster creado se ofrece después a los que faltan
+            vec = self._use_numpy(len(todo))
+            if vec:
+                fa    = _FragmentArrays(todo)
+                order = list(self._clusters)
+                best_idx, best_val = self._best_rows(
+                    fa, np.arange(len(todo)),
+                    fa.centroids([self._clusters[cid] for cid in order]))
+            for n, f in enumerate(todo):
+                self._seen.add(f.fid)
+                # Sus valores pudieron cambiar: renovar el aporte donde ya está
+                for cid in self._member_of.get(f.fid, ()):
+                    self._set_contrib(cid, f, self._clusters[cid].weights.get(f.fid, 1.0))
+                    touched.add(cid)
+                if vec:
+                    j = int(best_idx[n])
+                    best_cid, best_score = (order[j], float(best_val[n])) if j >= 0 else ("", 0.0)
+                else:
+                    best_cid, best_score = self._best_cluster(f)
                 if best_score >= self.MEMBERSHIP_THRESHOLD:
                     self._add_to_cluster(f, best_cid)
-                elif f.layer in (MemoryLayer.CONSOLIDATED,
-                                  MemoryLayer.SELF,
-                                  MemoryLayer.ASSOCIATIVE):
-                    self._create_cluster(f)
-
-            # Fusionar clústeres muy similares
-            self._merge_similar()
-            # Actualizar centroides y coherencia
-            for cid in list(self._clusters.keys()):
-                self._recompute_cluster(cid, fragments)
-            # Evolucionar etapas
-            self._evolve_stages()
+                    touched.add(best_cid)
+                elif f.layer in _SEED_LAYERS:
+                    cid = self._create_cluster(f)
+                    touched.add(cid)
+                    if vec:
+                        self._offer_cluster(fa, cid, order, np.arange(n + 1, len(todo)),
+                                            best_idx[n + 1:], best_val[n + 1:])
+
+            for cid in touched:
+                self._refresh_cluster(cid, fragments)
+            for cid in self._merge_touched(touched):
+                self._refresh_cluster(cid, fragments)
+            touched.intersection_update(self._clusters)
+            self._evolve_stages(touched)
+            self._changed |= touched
+
+    def pop_changes(self) -> Tuple[set, set]:
+        """Retorna (clústeres cambiados, eliminados) desde la llamada anterior."""
+        with self._lock:
+            changed = self._changed.intersection(self._clusters)
+            removed = self._removed
+            self._changed, self._removed = set(), set()
+            return changed, removed - changed
+
+    # ── Camino vectorizado (NumPy) ────────────────────────────────────────
+    def _batch_rows(self, n_clusters: int) -> int:
+        return max(256, _VEC_BATCH_CELLS // max(1, n_clusters))
 
+    def _best_rows(self, fa: _FragmentArrays, rows: "np.ndarray",
+                   cent: _CentroidArrays) -> Tuple["np.ndarray", "np.ndarray"]:
+        """``_best_cluster`` para ``rows``: (índice en el orden de ``cent``, puntuación).
+
+        Como en Python, gana el primer máximo y una puntuación <= 0 no
+        elige clúster (índice -1, puntuación 0).
+        """
+        idx = np.full(len(rows), -1, np.int64)
+        val = np.zeros(len(rows), np.float64)
+        if not cent.size:
+            return idx, val
+        step = self._batch_rows(cent.size)
+        for b0 in range(0, len(rows), step):
+            sc   = fa.scores(rows[b0:b0 + step], cent)
+            best = sc.argmax(axis=1)
+            top  = sc[np.arange(len(best)), best]
+            pos  = top > 0.0
+            idx[b0:b0 + step][pos] = best[pos]
+            val[b0:b0 + step][pos] = top[pos]
+        return idx, val
+
+    def _offer_cluster(self, fa: _FragmentArrays, cid: str, order: List[str],
+                       rows: "np.ndarray", idx: "np.ndarray", val: "np.ndarray"):
+        """Añade ``cid`` a ``order`` y lo compara con las filas pendientes.
+
+        ``idx``/``val`` son las vistas de esas filas y se actualizan en su
+        sitio. El clúster nuevo va el último en el orden de ``_best_cluster``:
+        solo gana con una puntuación estrictamente mayor.
+        """
+        order.append(cid)
+        if not len(rows):
+            return
+        score  = fa.scores(rows, fa.centroids([self._clusters[cid]]))[:, 0]
+        better = score > val
+        idx[better] = len(order) - 1
+        val[better] = score[better]
+
+    def _update_vectorised(self, fragments: List[Fragment]):
+        """``update`` con matrices: mismo resultado que ``_update_python``.
+
+        Los centroides no cambian durante la asignación, así que el mejor
+        clúster de cada fragmento es el máximo sobre los existentes y los
+        creados por fragmentos anteriores. Se puntúa el lote contra los
+        existentes y cada semilla se ofrece luego a los fragmentos que le
+        siguen, en orden.
+        """
+        thr    = self.MEMBERSHIP_THRESHOLD
+        fa     = _FragmentArrays(fragments)
+        n      = len(fragments)
+        assign = np.full(n, -1, np.int64)      # índice en ``order``
+        seeds  = np.zeros(n, bool)
+        order  = list(self._clusters)
+        cent   = fa.centroids([self._clusters[cid] for cid in order])
+        start  = 0
+        while start < n:
+            rows  = np.arange(start, min(n, start + self._batch_rows(len(order))))
+            start = int(rows[-1]) + 1
+            idx, val = self._best_rows(fa, rows, cent)
+            # Sin clúster: el primer elegible funda uno, que compite con el
+            # mejor actual de todos los que vienen detrás
+            i, created = 0, False
+            while True:
+                cand = np.flatnonzero((val[i:] < thr) & fa.eligible[rows[i:]])
+                if not len(cand):
+                    break
+                k    = i + int(cand[0])
+                seed = int(rows[k])
+                cid  = self._create_cluster(fragments[seed])
+                seeds[seed] = True
+                self._offer_cluster(fa, cid, order, rows[k + 1:], idx[k + 1:], val[k + 1:])
+                assign[seed] = len(order) - 1
+                i, created = k + 1, True
+            ok = val >= thr
+            assign[rows[ok]] = idx[ok]
+            if created:
+                cent = fa.centroids([self._clusters[cid] for cid in order])
+
+        # Pertenencia en bloque (lo que hace _add_to_cluster uno a uno)
+        joined = np.flatnonzero((assign >= 0) & ~seeds)
+        if len(joined):
+            joined = joined[np.argsort(assign[joined], kind="stable")]
+            now    = time.time()
+            for part in np.split(joined, np.flatnonzero(np.diff(assign[joined])) + 1):
+                c    = self._clusters[order[assign[part[0]]]]
+                fids = list(map(fa.fids.__getitem__, part.tolist()))
+                # weights tiene una entrada por miembro
+                c.member_fids.extend(dict.fromkeys(
+                    fid for fid in fids if fid not in c.weights))
+                c.weights.update(zip(fids, fa.weight[part].tolist()))
+                c.last_updated = now
+
+        self._merge_vectorised()
+        self._recompute_vectorised(fa, fragments)
+        self._evolve_stages()
+
+    def _merge_vectorised(self):
+        """``_merge_similar`` con la matriz de resonancia entre centroides.
+
+        Se calcula por bloques de filas y se recorre en el mismo orden que
+        el bucle por pares, así que fusiona exactamente los mismos clústeres.
+        """
+        order = list(self._clusters)
+        C = len(order)
+        if C < 2:
+            return
+        cent   = _CentroidArrays([self._clusters[cid] for cid in order])
+        merged = np.zeros(C, bool)
+        step   = max(1, _VEC_BATCH_CELLS // C)
+        for b0 in range(0, C, step):
+            b1 = min(C, b0 + step)
+            similar = _resonance_matrix(cent, slice(b0, b1)) > self.MERGE_THRESHOLD
+            for i in range(b0, b1):
+                if merged[i]:
+                    continue
+                for j in (np.flatnonzero(similar[i - b0, i + 1:] & ~merged[i + 1:]) + i + 1).tolist():
+                    self._absorb(self._clusters[order[i]], self._clusters[order[j]])
+                    del self._clusters[order[j]]
+                    merged[j] = True
+
+    def _recompute_vectorised(self, fa: _FragmentArrays, fragments: List[Fragment]):
+        """``_recompute_cluster`` para todos los clústeres con bincount."""
+        order = list(self._clusters)
+        C     = len(order)
+        index = dict(zip(fa.fids, range(len(fa.fids))))
+        cl, fi, w = [], [], []
+        for k, cid in enumerate(order):
+            c   = self._clusters[cid]
+            n   = len(c.member_fids)
+            idx = np.fromiter(map(index.get, c.member_fids, repeat(-1, n)), np.int64, n)
+            wk  = np.fromiter(map(c.weights.get, c.member_fids, repeat(1.0, n)), np.float64, n)
+            keep = idx >= 0
+            cl.append(np.full(int(keep.sum()), k, np.int64))
+            fi.append(idx[keep])
+            w.append(wk[keep])
+        cl = np.concatenate(cl) if cl else np.zeros(0, np.int64)
+        fi = np.concatenate(fi) if fi else np.zeros(0, np.int64)
+        w  = np.concatenate(w) if w else np.zeros(0, np.float64)
+        present = np.bincount(cl, minlength=C)
+        sw  = np.bincount(cl, w, minlength=C)
+        swv = np.bincount(cl, w * fa.v[fi], minlength=C) if len(fi) else sw
+        swa = np.bincount(cl, w * fa.a[fi], minlength=C) if len(fi) else sw
+        tag_names  = list(fa.tag_vocab)
+        inst_names = list(fa.inst_vocab)
+        dom_tags   = _top_k_per_group(cl, fa.tags_raw[fi], C, 5)
+        dom_insts  = _top_k_per_group(cl, fa.insts[fi], C, 3)
+        firsts     = np.searchsorted(cl, np.arange(C))
+        now = time.time()
+        for k, cid in enumerate(order):
+            if not present[k]:
+                del self._clusters[cid]
+                continue
+            c = self._clusters[cid]
+            if sw[k] > 0:
+                c.centroid_valence = float(swv[k] / sw[k])
+                c.centroid_arousal = float(swa[k] / sw[k])
+            c.dominant_tags      = [tag_names[i] for i in dom_tags[k]]
+            c.dominant_instincts = [inst_names[i] for i in dom_insts[k]]
+            if present[k] >= 2:
+                first = int(firsts[k])
+                members = [fragments[i] for i in fi[first:first + min(8, int(present[k]))].tolist()]
+                c.coherence = self._coherence(members)
+            c.last_updated = now
+
+    # ── Índice incremental ────────────────────────────────────────────────
+    def _rebuild_index(self, fragments: Dict[str, Fragment]) -> set:
+        """Recalcula aportes y sumas desde cero (tras ``update`` o al cargar).
+
+        Retorna los clústeres con algún miembro ausente de ``fragments``.
+        """
+        stale = set()
+        self._contrib   = {}
+        self._sums      = {}
+        self._member_of = defaultdict(set)
+        self._index_valid = True
+        for cid, c in self._clusters.items():
+            self._contrib[cid] = {}
+            self._sums[cid]    = _ClusterSums()
+            for fid in c.member_fids:
+                f = fragments.get(fid)
+                if f is not None:
+                    self._set_contrib(cid, f, c.weights.get(fid, 1.0))
+                else:
+                    stale.add(cid)
+        return stale
+
+    def _set_contrib(self, cid: str, f: Fragment, weight: float):
+        if not self._index_valid:
+            return
+        contrib = (weight, f.emotion.valence, f.emotion.arousal,
+                   tuple(f.tags), tuple(f.emotion.instinct_tags))
+        sums = self._sums[cid]
+        old  = self._contrib[cid].get(f.fid)
+        if old is not None:
+            sums.add(old, -1)
+        sums.add(contrib)
+        self._contrib[cid][f.fid] = contrib
+        self._member_of[f.fid].add(cid)
+
+    def _refresh_cluster(self, cid: str, fragments: Dict[str, Fragment]):
+        """Centroide, dominantes y coherencia desde las sumas acumuladas."""
+        c = self._clusters.get(cid)
+        if c is None:
+            return
+        if not self._contrib[cid]:
+            self._delete_cluster(cid)
+            return
+        sums = self._sums[cid]
+        if sums.w > 1e-9:
+            c.centroid_valence = sums.wv / sums.w
+            c.centroid_arousal = sums.wa / sums.w
+        c.dominant_tags      = [t for t, _ in sums.tags.most_common(5)]
+        c.dominant_instincts = [i for i, _ in sums.insts.most_common(3)]
+        members = []
+        for fid in c.member_fids:
+            f = fragments.get(fid)
+            if f is not None:
+                members.append(f)
+                if len(members) == 8:
+                    break
+        if len(members) >= 2:
+            c.coherence = self._coherence(members)
+        c.last_updated = time.time()
+
+    def _merge_touched(self, touched: set) -> set:
+        """Fusiona cada clúster tocado con los que resuenan con él.
+
+        O(tocados × clústeres) en lugar de todos los pares. Como en
+        ``_merge_similar``, el clúster más antiguo absorbe al más reciente.
+        Retorna los clústeres que absorbieron a otro.
+        """
+        ids      = list(self._clusters)
+        order    = {cid: i for i, cid in enumerate(ids)}
+        absorbed = set()
+        rows     = sorted(touched & self._clusters.keys(), key=order.get)
+        # Los centroides no cambian durante las fusiones: la matriz de
+        # resonancia tocados × todos puede calcularse de una vez
+        similar = None
+        if self._use_numpy(len(rows)):
+            cent    = _CentroidArrays([self._clusters[cid] for cid in ids])
+            similar = _resonance_matrix(
+                cent, np.array([order[cid] for cid in rows])) > self.MERGE_THRESHOLD
+        for r, cid in enumerate(rows):
+            if cid not in self._clusters:
+                continue
+            e = self._stamp(self._clusters[cid])
+            candidates = (ids if similar is None
+                          else [ids[j] for j in np.flatnonzero(similar[r]).tolist()])
+            for other in candidates:
+                if other == cid or other not in self._clusters:
+                    continue
+                if similar is not None or e.resonance_with(
+                        self._stamp(self._clusters[other])) > self.MERGE_THRESHOLD:
+                    keep, drop = sorted((cid, other), key=order.get)
+                    self._merge_into(keep, drop)
+                    absorbed.add(keep)
+                    absorbed.discard(drop)
+                    touched.add(keep)
+                    if drop == cid:
+                        break
+        return absorbed
+
+    def _merge_into(self, keep: str, drop: str):
+        c1, c2 = self._clusters[keep], self._clusters[drop]
+        self._absorb(c1, c2)
+        # Los aportes presentes de c2 pasan a c1 con el peso heredado
+        for fid, (_, v, a, tags, insts) in self._contrib.get(drop, {}).items():
+            contrib = (c1.weights[fid], v, a, tags, insts)
+            old = self._contrib[keep].get(fid)
+            if old is not None:
+                self._sums[keep].add(old, -1)
+            self._sums[keep].add(contrib)
+            self._contrib[keep][fid] = contrib
+            self._member_of[fid].add(keep)
+        self._delete_cluster(drop)
+
+    def _delete_cluster(self, cid: str):
+        self._clusters.pop(cid, None)
+        for fid in self._contrib.pop(cid, {}):
+            cids = self._member_of.get(fid)
+            if cids is not None:
+                cids.discard(cid)
+                if not cids:
+                    del self._member_of[fid]
+        self._sums.pop(cid, None)
+        self._changed.discard(cid)
+        self._removed.add(cid)
+
+    @staticmethod
+    def _stamp(c: EmotionalCluster) -> EmotionalStamp:
+        return EmotionalStamp(c.centroid_valence, c.centroid_arousal,
+                              c.dominant_instincts)
+
+    @staticmethod
+    def _coherence(members: List[Fragment]) -> float:
+        """Similitud emocional promedio entre pares (primeros 8 miembros)."""
+        sims = []
+        for i in range(min(len(members), 8)):
+            for j in range(i+1, min(len(members), 8)):
+                sims.append(members[i].emotion.resonance_with(
+                    members[j].emotion))
+        return sum(sims) / max(1, len(sims))
+
+    # ── Asignación y recálculo ────────────────────────────────────────────
     def _best_cluster(self, f: Fragment) -> Tuple[str, float]:
         best_cid, best_score = "", 0.0
         emo = EmotionalStamp(valence=f.emotion.valence,
@@ -252,10 +1729,7 @@ class ClusterEngine:
                              instinct_tags=f.emotion.instinct_tags)
         for cid, cluster in self._clusters.items():
             # Similitud con centroide del clúster
-            cemo = EmotionalStamp(valence=cluster.centroid_valence,
-                                  arousal=cluster.centroid_arousal,
-                                  instinct_tags=cluster.dominant_instincts)
-            score = emo.resonance_with(cemo)
+            score = emo.resonance_with(self._stamp(cluster))
             # Bonus por tags compartidos
             tag_overlap = len(set(f.tags) & set(cluster.dominant_tags))
             score += tag_overlap * 0.05
@@ -265,12 +1739,13 @@ class ClusterEngine:
 
     def _add_to_cluster(self, f: Fragment, cid: str):
         c = self._clusters[cid]
-        if f.fid not in c.member_fids:
+        if f.fid not in c.weights:      # weights tiene una entrada por miembro
             c.member_fids.append(f.fid)
         c.weights[f.fid] = f.strength * f.emotion.intensity()
         c.last_updated = time.time()
+        self._set_contrib(cid, f, c.weights[f.fid])
 
-    def _create_cluster(self, seed: Fragment):
+    def _create_cluster(self, seed: Fragment) -> str:
         cid  = hashlib.md5(
             f"{seed.fid}{time.time()}".encode()).hexdigest()[:10]
         name = f"cluster_{seed.tags[0] if seed.tags else 'misc'}_{cid[:4]}"
@@ -286,10 +1761,14 @@ class ClusterEngine:
             coherence         = 1.0,
         )
         self._clusters[cid] = c
+        if self._index_valid:
+            self._contrib[cid] = {}
+            self._sums[cid]    = _ClusterSums()
+            self._set_contrib(cid, seed, seed.strength)
+        return cid
 
-    def _recompute_cluster(self, cid: str, all_frags: List[Fragment]):
+    def _recompute_cluster(self, cid: str, frag_map: Dict[str, Fragment]):
         c = self._clusters[cid]
-        frag_map = {f.fid: f for f in all_frags}
         members  = [frag_map[fid] for fid in c.member_fids if fid in frag_map]
         if not members:
             del self._clusters[cid]
@@ -317,12 +1796,7 @@ class ClusterEngine:
                                      reverse=True)[:3]
         # Coherencia: similitud emocional promedio entre pares
         if len(members) >= 2:
-            sims = []
-            for i in range(min(len(members), 8)):
-                for j in range(i+1, min(len(members), 8)):
-                    sims.append(members[i].emotion.resonance_with(
-                        members[j].emotion))
-            c.coherence = sum(sims) / max(1, len(sims))
+            c.coherence = self._coherence(members)
         c.last_updated = time.time()
 
     def _merge_similar(self):
@@ -335,22 +1809,26 @@ class ClusterEngine:
                 if cid2 in merged:
                     continue
                 c1, c2 = self._clusters[cid1], self._clusters[cid2]
-                e1 = EmotionalStamp(c1.centroid_valence, c1.centroid_arousal,
-                                    c1.dominant_instincts)
-                e2 = EmotionalStamp(c2.centroid_valence, c2.centroid_arousal,
-                                    c2.dominant_instincts)
-                if e1.resonance_with(e2) > self.MERGE_THRESHOLD:
-                    # Fusionar c2 en c1
-                    for fid in c2.member_fids:
-                        if fid not in c1.member_fids:
-                            c1.member_fids.append(fid)
-                        c1.weights[fid] = c2.weights.get(fid, 0.5)
-                    c1.name = f"{c1.name}+{c2.name[:8]}"
+                if self._stamp(c1).resonance_with(self._stamp(c2)) > self.MERGE_THRESHOLD:
+                    self._absorb(c1, c2)
                     del self._clusters[cid2]
                     merged.add(cid2)
 
-    def _evolve_stages(self):
-        for c in self._clusters.values():
+    @staticmethod
+    def _absorb(c1: EmotionalCluster, c2: EmotionalCluster):
+        """Fusiona los miembros y pesos de c2 en c1."""
+        have = set(c1.member_fids)
+        for fid in c2.member_fids:
+            if fid not in have:
+                have.add(fid)
+                c1.member_fids.append(fid)
+            c1.weights[fid] = c2.weights.get(fid, 0.5)
+        c1.name = f"{c1.name}+{c2.name[:8]}"
+
+    def _evolve_stages(self, cids: Optional[Iterable[str]] = None):
+        clusters = (self._clusters.values() if cids is None
+                    else [self._clusters[cid] for cid in cids])
+        for c in clusters:
             n = len(c.member_fids)
             if c.evolution_stage == "forming"  and n >= 4:
                 c.evolution_stage = "growing"
@@ -375,6 +1853,8 @@ class ClusterEngine:
                     self._clusters[c.cluster_id] = c
                 except Exception:
                     pass
+            # Las sumas se reconstruyen con los fragmentos en la próxima pasada
+            self._index_valid = False
 
     def stats(self) -> Dict:
         with self._lock:
@@ -389,6 +1869,8 @@ class ClusterEngine:
                 "avg_coherence":   round(
                     sum(c.coherence for c in self._clusters.values()) /
                     max(1, len(self._clusters)), 4),
+                "vectorise":       self.vectorise,
+                "passes":          dict(self._passes),
             }
 
 
@@ -423,6 +1905,200 @@ class ReconstitutionResult:
                 f"historia={self.continuity_events} eventos")
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+#  INSTANTÁNEAS DE LOS REGISTROS
+#  Los .jsonl crecen con toda la historia; el estado que describen no. Una
+#  instantánea guarda ese estado reducido junto con el offset de cada log que
+#  cubre: al despertar solo se relee la cola escrita después.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_SNAPSHOT_VERSION  = 1
+_CONTINUITY_RECENT = 20     # eventos recientes que usa la verificación
+_CONTINUITY_SUMMARY = "continuity_summary"   # primera línea tras rotar
+
+
+def _fold_event(history: Dict, e: Dict):
+    """Acumula un evento de continuidad en las estadísticas de la historia."""
+    event  = e.get("event", "")
+    counts = history.setdefault("events_by_type", {})
+    counts[event] = counts.get(event, 0) + 1
+    if "first_ts" not in history and e.get("ts") is not None:
+        history["first_ts"] = e["ts"]
+    score = (e.get("data") or {}).get("identity_score") if event == "waking_up" else None
+    if isinstance(score, (int, float)):
+        st = history.setdefault("identity_score", {"n": 0, "mean": 0.0,
+                                                   "min": score, "max": score})
+        st["n"]    += 1
+        st["mean"] += (score - st["mean"]) / st["n"]
+        st["min"]   = min(st["min"], score)
+        st["max"]   = max(st["max"], score)
+
+
+def _fold_profile(history: Dict, profile: Dict):
+    """Acumula una muestra del vector de identidad (media y varianza móviles)."""
+    st = history.setdefault("identity_vector", {
+        "samples": 0, "valence_mean": 0.0, "valence_m2": 0.0,
+        "arousal_mean": 0.0, "arousal_m2": 0.0, "tags": {}})
+    st["samples"] += 1
+    n = st["samples"]
+    for key in ("valence", "arousal"):
+        x     = float(profile.get(f"avg_{key}", 0.0))
+        delta = x - st[f"{key}_mean"]
+        st[f"{key}_mean"] += delta / n
+        st[f"{key}_m2"]   += delta * (x - st[f"{key}_mean"])
+    tags = Counter(st["tags"])
+    tags.update(profile.get("dominant_tags", []))
+    st["tags"] = dict(tags.most_common(16))
+
+
+@dataclass
+class _LogState:
+    """Estado reducido de nucleus, shadow, graph y continuity.
+
+    ``offsets`` guarda, por log, ``{"offset", "ino"}``: hasta qué byte
+    llega lo aplicado y a qué archivo (inodo) se refiere. En disco va en el
+    manifiesto, no en la instantánea.
+    """
+    nucleus:         Dict[str, Dict] = field(default_factory=dict)
+    shadow:          Dict[str, Dict] = field(default_factory=dict)
+    edges:           Dict[Tuple[str, str, str], None] = field(default_factory=dict)
+    graph_lines:     int = 0
+    continuity:      int = 0
+    last_sleep_ts:   Optional[float] = None
+    recent_events:   List[Dict] = field(default_factory=list)
+    history:         Dict = field(default_factory=dict)   # ver _fold_event
+    offsets:         Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    LOGS = ("nucleus", "shadow", "graph", "continuity")
+
+    def reset(self, log: str):
+        """Descarta lo aplicado de un log (se releerá desde el byte 0)."""
+        if log == "nucleus":
+            self.nucleus = {}
+        elif log == "shadow":
+            self.shadow = {}
+        elif log == "graph":
+            self.edges, self.graph_lines = {}, 0
+        elif log == "continuity":
+            self.continuity, self.last_sleep_ts, self.recent_events = 0, None, []
+            self.history = {}
+        self.offsets.pop(log, None)
+
+    def apply(self, log: str, records: List[Dict]):
+        """Aplica registros en orden, con la misma semántica que la relectura completa."""
+        if log == "nucleus":
+            for r in records:
+                if r.get("fid"):
+                    self.nucleus[r["fid"]] = r
+        elif log == "shadow":
+            for r in records:
+                if r.get("fid") and r.get("layer") != "deleted":
+                    self.shadow[r["fid"]] = r
+        elif log == "graph":
+            for e in records:
+                self.edges.setdefault(
+                    (e.get("from", ""), e.get("to", ""), e.get("type", "")))
+            self.graph_lines += len(records)
+        elif log == "continuity":
+            recent = self.recent_events
+            for e in records:
+                event = e.get("event")
+                if event == _CONTINUITY_SUMMARY:
+                    # Resumen de los segmentos rotados: sustituye a todo lo previo
+                    d = e.get("data") or {}
+                    self.continuity    = int(d.get("events", 0))
+                    self.last_sleep_ts = d.get("last_sleep_ts")
+                    self.history       = dict(d.get("history", {}))
+                    recent             = list(d.get("recent_events", []))
+                    continue
+                if event == "going_to_sleep":
+                    self.last_sleep_ts = e.get("ts")
+                self.continuity += 1
+                _fold_event(self.history, e)
+                recent.append(e)
+            self.recent_events = recent[-_CONTINUITY_RECENT:]
+
+    def continuity_summary(self) -> Dict:
+        """Datos del registro resumen con que empieza un segmento rotado."""
+        return {
+            "events":        self.continuity,
+            "last_sleep_ts": self.last_sleep_ts,
+            "recent_events": self.recent_events,
+            "history":       self.history,
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            "version":       _SNAPSHOT_VERSION,
+            "nucleus":       self.nucleus,
+            "shadow":        self.shadow,
+            "edges":         [list(k) for k in self.edges],
+            "graph_lines":   self.graph_lines,
+            "continuity":    self.continuity,
+            "last_sleep_ts": self.last_sleep_ts,
+            "recent_events": self.recent_events,
+            "history":       self.history,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict, offsets: Dict) -> "_LogState":
+        return cls(
+            nucleus       = d["nucleus"],
+            shadow        = d["shadow"],
+            edges         = dict.fromkeys(tuple(k) for k in d["edges"]),
+            graph_lines   = int(d["graph_lines"]),
+            continuity    = int(d["continuity"]),
+            last_sleep_ts = d.get("last_sleep_ts"),
+            recent_events = list(d.get("recent_events", [])),
+            history       = dict(d.get("history", {})),
+            offsets       = dict(offsets),
+        )
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  RETENCIÓN DE LA HISTORIA
+#  continuity.jsonl y sessions/ crecen con cada sesión. Se rotan: lo antiguo
+#  se condensa en un resumen y el detalle solo se conserva hasta un límite.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class RetentionPolicy:
+    """Límites de continuity.jsonl y sessions/. 0 o None = sin límite.
+
+    continuity.jsonl rota cuando lo escrito tras el resumen de la rotación
+    anterior supera ``continuity_max_bytes`` o cuando su primer registro
+    tiene más de ``continuity_max_age_s``; de los segmentos
+    rotados se guardan los ``continuity_segments`` más recientes. De
+    sessions/ quedan los ``sessions_keep`` últimos archivos que no superen
+    ``sessions_max_age_s``; el resto se suma a sessions/summary.json.
+    """
+    continuity_max_bytes: int             = 4 << 20
+    continuity_max_age_s: Optional[float] = 7 * 24 * 3600
+    continuity_segments:  int             = 8
+    sessions_keep:        int             = 200
+    sessions_max_age_s:   Optional[float] = None
+
+
+def _continuity_head(path: Path) -> Tuple[Optional[float], int]:
+    """``ts`` de la primera línea de continuity.jsonl y bytes de esa línea
+    si es el resumen de una rotación (0 si no); (None, 0) si no se lee."""
+    try:
+        with open(path, "rb") as f:
+            line = f.readline()
+        first = json.loads(line)
+        return float(first["ts"]), len(line) if first.get("event") == _CONTINUITY_SUMMARY else 0
+    except (OSError, ValueError, TypeError, KeyError):
+        return None, 0
+
+
+def _session_ts(path: Path) -> float:
+    """Marca de tiempo de ``{ts}_session.json`` (0 si el nombre no la lleva)."""
+    try:
+        return float(path.name.split("_", 1)[0])
+    except ValueError:
+        return 0.0
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 #  MOTOR DE PERSISTENCIA
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -451,23 +2127,33 @@ class MemoryPersistence:
 
     def __init__(self, memory_manager: MemoryManager,
                  base_dir: str = "memory",
-                 auto_save_interval_s: float = 60.0):
+                 auto_save_interval_s: float = 60.0,
+                 write_behind: bool = True,
+                 flush_interval_s: float = 1.0,
+                 snapshot_tail_bytes: int = 1 << 20,
+                 load_workers: Optional[int] = None,
+                 load_mode: str = "auto",
+                 codec: str = "binary",
+                 retention: Optional[RetentionPolicy] = None,
+                 vectorise_clusters: bool = True):
         self.mgr            = memory_manager
         self.base           = Path(base_dir)
         self._lock          = RLock()
         self._dirty_fids:   set = set()    # fragmentos modificados pendientes
+        self._signatures:   Dict[str, int] = {}   # fid → huella de lo último escrito/cargado
+        self._cluster_dirty: set = set()   # fragmentos a reevaluar en clústeres
         self._auto_interval = auto_save_interval_s
         self._last_auto     = time.time()
         self._session_ts    = time.time()
         self._wakeup_result: Optional[ReconstitutionResult] = None
-        self.clusters       = ClusterEngine()
+        self.clusters       = ClusterEngine(vectorise=vectorise_clusters)
         self._total_written = 0
         self._total_loaded  = 0
 
         # Crear estructura de directorios
-        for sub in ["bootstrap", "self", "consolidated/fragments",
-                    "consolidated/clusters", "associative/fragments",
-                    "sessions"]:
+        for sub in ["bootstrap", "self", "self/archive",
+                    "consolidated/fragments", "consolidated/clusters",
+                    "associative/fragments", "sessions", "snapshots"]:
             (self.base / sub).mkdir(parents=True, exist_ok=True)
 
         # Escribir el grafo en consolidated/
@@ -477,6 +2163,48 @@ class MemoryPersistence:
         self._continuity_path = self.base / "self"          / "continuity.jsonl"
         self._id_vector_path  = self.base / "self"          / "identity_vector.json"
         self._sessions_path   = self.base / "sessions"
+        self._consol_json_dir = self.base / "consolidated" / "fragments"
+        self._segments        = SegmentStore(self.base / "consolidated" / "fragments.seg")
+        self._snapshot_dir    = self.base / "snapshots"
+        self._manifest_path   = self._snapshot_dir / "manifest.json"
+        self._checkpoint_path = self._snapshot_dir / "checkpoint.json"
+        self._log_paths       = {
+            "nucleus":    self._nucleus_path,
+            "shadow":     self._shadow_path,
+            "graph":      self._graph_path,
+            "continuity": self._continuity_path,
+        }
+
+        # Escrituras JSONL e identity_vector fuera del hilo de percepción
+        self._io = WriteBehindWriter(flush_interval_s, enabled=write_behind)
+        weakref.finalize(self, self._io.close)
+
+        # Aristas ya persistidas: (from, to, tipo). Se carga del disco la
+        # primera vez que hace falta; graph.jsonl solo recibe aristas nuevas.
+        self._edges: Optional[set] = None
+        self._graph_lines   = 0
+        self._graph_compact_ratio = 2.0   # líneas / aristas únicas que dispara compactar
+
+        # Instantánea nueva cuando la cola sin cubrir de los logs supera esto
+        self._snapshot_tail_bytes = snapshot_tail_bytes
+        self._snapshot_keep       = 2
+        self._manifest: Optional[Dict] = None
+
+        # Carga al despertar: "auto" | "thread" | "process" | "serial"
+        if load_mode not in ("auto", "thread", "process", "serial"):
+            raise ValueError(f"load_mode desconocido: {load_mode!r}")
+        self._load_mode    = load_mode
+        self._load_workers = load_workers or os.cpu_count() or 1
+
+        # Códec de los fragmentos CONSOLIDATED y ASSOCIATIVE (ver get_codec).
+        # Al leer se detecta por la cabecera: se puede cambiar sin migrar.
+        self._codec        = get_codec(codec).name
+        self._codec_suffix = get_codec(codec).suffix
+
+        # Rotación de continuity.jsonl y poda de sessions/
+        self.retention        = retention or RetentionPolicy()
+        self._archive_dir     = self.base / "self" / "archive"
+        self._sessions_summary = self._sessions_path / "summary.json"
 
         # Escribir schema si no existe
         self._write_schema_if_needed()
@@ -497,35 +2225,42 @@ class MemoryPersistence:
                 "ephemeral":    "No persiste. Solo existe en RAM.",
                 "working":      "Persiste si supera umbral emocional.",
                 "associative":  "Persiste periódicamente.",
-                "consolidated": "Persiste al consolidar. En consolidated/fragments/",
+                "consolidated": "Persiste al consolidar. En consolidated/fragments.seg",
                 "self":         "Persiste inmediatamente. En self/nucleus.jsonl y shadow.jsonl",
             },
             "files": {
                 "self/nucleus.jsonl":          "Fragmentos conscientes del yo. Append-only.",
                 "self/shadow.jsonl":           "Fragmentos inconscientes del yo. Append-only.",
-                "self/continuity.jsonl":       "Historia de eventos de identidad. Append-only.",
+                "self/continuity.jsonl":       "Historia de eventos de identidad. Append-only; al rotar empieza con un 'continuity_summary'.",
+                "self/archive/":               "Segmentos rotados de continuity.jsonl (se conservan los más recientes).",
                 "self/identity_vector.json":   "Perfil emocional actual del yo.",
-                "consolidated/fragments/":     "Un .json por fragmento consolidado.",
+                "consolidated/fragments.seg":  "Segmento append-only: registros con longitud y CRC; gana el último por fid. Payload: JSON, o cabecera EVFR + versión + códec.",
+                "consolidated/fragments.idx":  "Índice lateral fid → offset (regenerable escaneando el segmento).",
+                "consolidated/fragments/":     "Importación/exportación: un .json por fragmento.",
                 "consolidated/clusters/":      "Un .json por clúster emocional.",
-                "consolidated/graph.jsonl":    "Todas las relaciones. Append-only.",
-                "associative/fragments/":      "Un .json por fragmento asociativo.",
+                "consolidated/graph.jsonl":    "Relaciones únicas. Append-only; se compacta (tmp + rename) si acumula duplicados.",
+                "associative/fragments/":      "Un archivo por fragmento asociativo: .json, o .frag con cabecera EVFR.",
                 "bootstrap/identity.json":     "Quién es este ser.",
                 "bootstrap/reconstruction.json": "Cómo reconstruir recuerdos.",
                 "bootstrap/emotional_calibration.json": "Cómo interpretar la valencia.",
-                "sessions/":                   "Un .json por sesión (despertar/dormir).",
+                "sessions/":                   "Un .json por sesión (despertar/dormir); summary.json acumula las podadas.",
+                "snapshots/manifest.json":     "Instantánea vigente y offset/inodo de cada .jsonl que cubre.",
+                "snapshots/{ts}.snapshot.json": "Estado reducido de nucleus, shadow, graph y continuity.",
+                "snapshots/checkpoint.json":   "Último go_to_sleep: fragmentos escritos por capa y hasta dónde llegó.",
             },
             "reconstitution_order": [
                 "1. Leer bootstrap/ para saber cómo funcionar",
-                "2. Leer self/nucleus.jsonl y shadow.jsonl para el yo",
+                "2. Leer snapshots/ y, tras sus offsets, self/nucleus.jsonl y shadow.jsonl para el yo",
                 "3. Leer consolidated/clusters/ para los patrones",
-                "4. Leer consolidated/graph.jsonl para las relaciones",
-                "5. Leer consolidated/fragments/ para memoria estable",
+                "4. Leer la cola de consolidated/graph.jsonl para las relaciones",
+                "5. Leer consolidated/fragments.seg para memoria estable",
                 "6. Leer associative/fragments/ bajo demanda",
                 "7. Verificar coherencia de identidad",
             ],
             "important_note": (
                 "Los archivos .jsonl nunca se reescriben, solo se añaden. "
-                "El estado actual se reconstruye leyendo todas las líneas en orden. "
+                "El estado actual se reconstruye leyendo todas las líneas en orden "
+                "(o la instantánea y las líneas posteriores a su offset). "
                 "Una línea con 'deleted: true' invalida una anterior con el mismo id."
             ),
         }
@@ -549,43 +2284,74 @@ class MemoryPersistence:
                         instinct_weights)
 
     # ── Escritura de fragmentos ────────────────────────────────────────────
-    def _persist_fragment(self, f: Fragment):
-        """Persiste un fragmento según su capa."""
+    def _persist_fragment(self, f: Fragment) -> bool:
+        """Persiste un fragmento según su capa. Retorna si se escribió."""
         d = _fragment_to_dict(f)
+        written = True
 
         if f.layer == MemoryLayer.EPHEMERAL:
-            return  # Nunca se persiste
+            return False  # Nunca se persiste
 
         elif f.layer == MemoryLayer.SELF:
             path = (self._nucleus_path if f.conscious
                     else self._shadow_path)
-            _append_jsonl(path, d)
+            self._io.append(path, d, key=f.fid)
+            # Si ascendió desde CONSOLIDATED, que no vuelva a cargarse allí
+            self._segments.delete(f.fid)
             self._total_written += 1
 
         elif f.layer == MemoryLayer.CONSOLIDATED:
-            fpath = (self.base / "consolidated" / "fragments" /
-                     f"{f.fid}.json")
-            _write_json(fpath, d)
+            self._segments.put(f.fid, _encode_fragment(d, self._codec))
             self._total_written += 1
 
         elif f.layer == MemoryLayer.ASSOCIATIVE:
             fpath = (self.base / "associative" / "fragments" /
-                     f"{f.fid}.json")
-            _write_json(fpath, d)
+                     f"{f.fid}{self._codec_suffix}")
+            _write_bytes(fpath, _encode_fragment(d, self._codec))
             self._total_written += 1
 
         elif f.layer == MemoryLayer.WORKING:
             # Solo si supera umbral emocional
             if f.emotion.intensity() > 0.5 or f.identity_weight > 0.2:
                 fpath = (self.base / "associative" / "fragments" /
-                         f"{f.fid}_working.json")
-                _write_json(fpath, d)
+                         f"{f.fid}_working{self._codec_suffix}")
+                _write_bytes(fpath, _encode_fragment(d, self._codec))
                 self._total_written += 1
+            else:
+                written = False
+
+        self._signatures[f.fid] = _fragment_signature(f)
+        return written
+
+    def _persist_if_changed(self, f: Fragment) -> bool:
+        """Persiste ``f`` solo si difiere de lo último escrito o cargado."""
+        if f.layer == MemoryLayer.EPHEMERAL:
+            return False
+        if self._signatures.get(f.fid) == _fragment_signature(f):
+            return False
+        return self._persist_fragment(f)
+
+    def _edge_set(self) -> set:
+        if self._edges is None:
+            self._load_edges(_read_jsonl(self._graph_path))
+        return self._edges
+
+    def _load_edges(self, records: List[Dict]):
+        self._edges = {(e.get("from", ""), e.get("to", ""), e.get("type", ""))
+                       for e in records}
+        self._graph_lines = len(records)
 
     def _persist_graph_edge(self, fid_from: str, fid_to: str,
                              edge_type: str, weight: float):
-        """Añade una arista al grafo (append-only)."""
-        _append_jsonl(self._graph_path, {
+        """Añade una arista al grafo (append-only) si aún no está persistida."""
+        key = (fid_from, fid_to, edge_type)
+        with self._lock:
+            edges = self._edge_set()
+            if key in edges:
+                return
+            edges.add(key)
+            self._graph_lines += 1
+        self._io.append(self._graph_path, {
             "from":    fid_from,
             "to":      fid_to,
             "type":    edge_type,
@@ -593,23 +2359,67 @@ class MemoryPersistence:
             "ts":      time.time(),
         })
 
+    def compact_graph(self, force: bool = False) -> int:
+        """Reescribe graph.jsonl con una línea por arista única (tmp + rename).
+
+        Conserva la primera aparición de cada arista. Sin ``force`` solo actúa
+        si el archivo supera ``_graph_compact_ratio`` veces las aristas únicas.
+        Retorna las líneas eliminadas.
+        """
+        with self._lock:
+            edges = self._edge_set()
+            if not force and self._graph_lines <= max(
+                    16, len(edges) * self._graph_compact_ratio):
+                return 0
+            self._io.flush()
+            # Con io_lock el escritor no toca el archivo entre la lectura y el
+            # rename: lo encolado después del flush irá al archivo nuevo
+            with self._io.io_lock:
+                if not self._graph_path.exists():
+                    return 0
+                tmp  = self._graph_path.with_suffix(".tmp")
+                seen = set()
+                with open(tmp, "w", encoding="utf-8") as out:
+                    for e in _read_jsonl(self._graph_path):
+                        key = (e.get("from", ""), e.get("to", ""), e.get("type", ""))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        out.write(json.dumps(e, ensure_ascii=False) + "\n")
+                    out.flush()
+                    os.fsync(out.fileno())
+                os.replace(tmp, self._graph_path)
+                self._io.close_handle(self._graph_path)
+            # El conjunto en memoria se conserva: puede incluir aristas aún en cola
+            removed = self._graph_lines - len(seen)
+            self._graph_lines = len(seen)
+        if removed:
+            log_event(f"graph.jsonl compactado: {removed} aristas duplicadas eliminadas", "INFO")
+        return removed
+
     def _persist_clusters(self):
-        """Guarda todos los clústeres actuales."""
-        for c in self.clusters.get_all():
-            cpath = (self.base / "consolidated" / "clusters" /
-                     f"{c.cluster_id}.json")
-            _write_json(cpath, c.to_dict())
+        """Guarda los clústeres que cambiaron y borra los eliminados."""
+        changed, removed = self.clusters.pop_changes()
+        clusters_dir = self.base / "consolidated" / "clusters"
+        for cid in changed:
+            c = self.clusters.get_by_id(cid)
+            if c is not None:
+                _write_json(clusters_dir / f"{cid}.json", c.to_dict())
+        for cid in removed:
+            (clusters_dir / f"{cid}.json").unlink(missing_ok=True)
 
     def _update_identity_vector(self):
         """Actualiza el perfil emocional del yo en disco."""
-        profile = self.mgr.get_self_profile()
-        profile["_updated_at"] = time.time()
-        _write_json(self._id_vector_path, profile)
+        def _profile():
+            profile = self.mgr.get_self_profile()
+            profile["_updated_at"] = time.time()
+            return profile
+        self._io.write_json(self._id_vector_path, _profile)
 
     # ── Eventos de continuidad ────────────────────────────────────────────
     def _log_continuity(self, event_type: str, data: Dict = None):
         """Registra un evento en la historia de identidad."""
-        _append_jsonl(self._continuity_path, {
+        self._io.append(self._continuity_path, {
             "ts":         time.time(),
             "event":      event_type,
             "data":       data or {},
@@ -620,6 +2430,7 @@ class MemoryPersistence:
         """Llamar cada vez que un fragmento cambia de estado o capa."""
         with self._lock:
             self._dirty_fids.add(f.fid)
+            self._cluster_dirty.add(f.fid)
         # SELF siempre inmediato
         if f.layer == MemoryLayer.SELF:
             self._persist_fragment(f)
@@ -644,7 +2455,9 @@ class MemoryPersistence:
         })
         with self._lock:
             self._dirty_fids.discard(f.fid)
+            self._cluster_dirty.add(f.fid)
 
+    @timed("persistence.save_cycle")
     def save_cycle(self, force: bool = False):
         """Ciclo de guardado diferido — llamar periódicamente."""
         now = time.time()
@@ -655,15 +2468,21 @@ class MemoryPersistence:
         with self._lock:
             dirty = set(self._dirty_fids)
             self._dirty_fids.clear()
+            cluster_dirty, self._cluster_dirty = self._cluster_dirty, set()
 
         for fid in dirty:
-            f = self.mgr.store.get(fid)
+            f = self.mgr.store.peek(fid)
             if f:
-                self._persist_fragment(f)
+                self._persist_if_changed(f)
 
-        # Actualizar clústeres
+        # Actualizar clústeres: solo fragmentos sucios, nuevos o desaparecidos
         all_frags = self.mgr.store.all_fragments()
-        self.clusters.update(all_frags)
+        live      = {f.fid: f for f in all_frags}
+        self.clusters.update_incremental(live, cluster_dirty)
+
+        # Huellas de fragmentos que ya no están en el store (olvidados, decaídos)
+        for fid in self._signatures.keys() - live.keys():
+            self._signatures.pop(fid, None)
         self._persist_clusters()
 
         # Persistir aristas de superposición temporal
@@ -673,24 +2492,71 @@ class MemoryPersistence:
                     f.fid, linked_fid, "temporal_overlap", 0.5)
 
         self._update_identity_vector()
+        self._segments.flush()
+        self._segments.maybe_compact()
+        self.compact_graph()
+        if not self.rotate_continuity():
+            self.snapshot()
         self._last_auto = now
 
-    def go_to_sleep(self):
-        """Proceso de apagado: persiste todo lo que quede pendiente."""
+    # Al dormir, primero lo que más cuesta perder
+    SLEEP_ORDER = (MemoryLayer.SELF, MemoryLayer.CONSOLIDATED,
+                   MemoryLayer.ASSOCIATIVE, MemoryLayer.WORKING)
+
+    def _checkpoint_fragments(self, deadline: Optional[float]) -> Dict[str, Dict]:
+        """Escribe los fragmentos que cambiaron, capa a capa según SLEEP_ORDER.
+
+        Con ``deadline`` (``time.monotonic``) se detiene al agotarlo; cada
+        capa informa cuántos escribió, cuántos seguían iguales y si terminó.
+        """
+        layers: Dict[str, Dict] = {}
+        for layer in self.SLEEP_ORDER:
+            stats = {"written": 0, "unchanged": 0, "complete": False}
+            layers[layer.value] = stats
+            if deadline is not None and time.monotonic() >= deadline:
+                continue
+            frags = self.mgr.store.layer_fragments(layer)
+            done  = []
+            for f in frags:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if self._persist_if_changed(f):
+                    stats["written"] += 1
+                else:
+                    stats["unchanged"] += 1
+                done.append(f.fid)
+            else:
+                stats["complete"] = True
+            with self._lock:
+                self._dirty_fids.difference_update(done)
+        return layers
+
+    def go_to_sleep(self, budget_s: Optional[float] = None) -> Dict:
+        """Proceso de apagado: persiste lo que cambió desde la última escritura.
+
+        Solo se reescriben los fragmentos cuya huella difiere de la última
+        versión escrita o cargada. Con ``budget_s`` las capas se vuelcan en
+        orden SLEEP_ORDER hasta agotar el tiempo y lo restante (clústeres,
+        grafo, instantánea) se omite; la espera final de la cola de
+        escritura tampoco excede el plazo; el resultado queda en snapshots/checkpoint.json y
+        el próximo despertar lo informa. Retorna ese manifiesto.
+        """
+        start    = time.monotonic()
+        deadline = start + budget_s if budget_s is not None else None
         self._log_continuity("going_to_sleep", {
             "session_ts":     self._session_ts,
             "sleep_ts":       time.time(),
             "fragments_total":self.mgr.store.stats()["total"],
         })
 
-        # Forzar guardado de todo
-        self.save_cycle(force=True)
+        # Fragmentos de todas las capas persistibles, los más importantes antes
+        layers   = self._checkpoint_fragments(deadline)
+        complete = all(st["complete"] for st in layers.values())
 
-        # Guardar fragmentos de todas las capas persistibles
-        for layer in [MemoryLayer.WORKING, MemoryLayer.ASSOCIATIVE,
-                      MemoryLayer.CONSOLIDATED, MemoryLayer.SELF]:
-            for f in self.mgr.store.layer_fragments(layer):
-                self._persist_fragment(f)
+        # Clústeres, grafo y vector de identidad si queda tiempo
+        derived = complete and (deadline is None or time.monotonic() < deadline)
+        if derived:
+            self.save_cycle(force=True)
 
         # Sesión
         session_data = {
@@ -705,7 +2571,296 @@ class MemoryPersistence:
         }
         fname = f"{int(self._session_ts)}_session.json"
         _write_json(self._sessions_path / fname, session_data)
+        self.prune_sessions()
         self._update_identity_vector()
+        if deadline is None:
+            flushed = self.flush()
+        else:
+            flushed = self.flush(timeout=max(0.0, deadline - time.monotonic()))
+        if derived:
+            self.snapshot(force=True)
+            self._segments.checkpoint()     # el próximo despertar no reescanea la cola
+
+        checkpoint = {
+            "session_ts": self._session_ts,
+            "sleep_ts":   time.time(),
+            "budget_s":   budget_s,
+            "elapsed_s":  round(time.monotonic() - start, 4),
+            "complete":   complete and derived and flushed,
+            "layers":     layers,
+            "derived":    derived,     # clústeres, grafo e instantánea al día
+            "flushed":    flushed,     # la cola de escritura terminó dentro del plazo
+        }
+        _write_json(self._checkpoint_path, checkpoint)
+        written = sum(st["written"] for st in layers.values())
+        log_event(f"Checkpoint de sueño: {written} fragmentos escritos en "
+                  f"{checkpoint['elapsed_s']:.2f}s"
+                  + ("" if checkpoint["complete"] else " (incompleto)"),
+                  "INFO" if checkpoint["complete"] else "WARNING")
+        return checkpoint
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Escritura durable de todo lo pendiente (apagado, pruebas)."""
+        ok = self._io.flush(timeout)
+        self._segments.flush(sync=True)
+        return ok
+
+    # ── Instantáneas ──────────────────────────────────────────────────────
+    def _load_manifest(self) -> Dict:
+        if self._manifest is None:
+            m = _read_json(self._manifest_path, {})
+            self._manifest = m if m.get("version") == _SNAPSHOT_VERSION else {}
+        return self._manifest
+
+    def _load_snapshot(self) -> _LogState:
+        """Instantánea vigente según el manifiesto; vacía si falta o no se lee."""
+        manifest = self._load_manifest()
+        if not manifest.get("snapshot"):
+            return _LogState()
+        d = _read_json(self._snapshot_dir / manifest["snapshot"])
+        if not d or d.get("version") != _SNAPSHOT_VERSION:
+            return _LogState()
+        try:
+            return _LogState.from_dict(d, manifest.get("logs", {}))
+        except (KeyError, TypeError, ValueError):
+            return _LogState()
+
+    def _replay_logs(self) -> Tuple[_LogState, int]:
+        """Instantánea + cola de cada log. Retorna (estado, bytes releídos).
+
+        Un log sustituido (inodo distinto, p.ej. tras ``compact_graph``) o
+        más corto que su offset se relee completo.
+        """
+        self._io.flush()
+        state    = self._load_snapshot()
+        replayed = 0
+        for log, path in self._log_paths.items():
+            pos = state.offsets.get(log, {})
+            records, start, end, ino = _read_jsonl_tail(
+                path, pos.get("offset", 0), pos.get("ino"))
+            if start != pos.get("offset", 0) or not ino:
+                state.reset(log)
+            state.apply(log, records)
+            state.offsets[log] = {"offset": end, "ino": ino}
+            replayed += end - start
+        return state, replayed
+
+    def _snapshot_lag(self) -> int:
+        """Bytes de log que la instantánea vigente no cubre."""
+        logs = self._load_manifest().get("logs", {})
+        lag  = 0
+        for log, path in self._log_paths.items():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            pos = logs.get(log, {})
+            if pos.get("ino") == st.st_ino and pos.get("offset", 0) <= st.st_size:
+                lag += st.st_size - pos["offset"]
+            else:
+                lag += st.st_size
+        return lag
+
+    def _write_snapshot(self, state: _LogState):
+        ts   = time.time()
+        name = f"{int(ts * 1000)}.snapshot.json"
+        _write_json(self._snapshot_dir / name, state.to_dict(), indent=None)
+        manifest = {
+            "version":    _SNAPSHOT_VERSION,
+            "snapshot":   name,
+            "created_at": ts,
+            "logs":       state.offsets,
+        }
+        _write_json(self._manifest_path, manifest)
+        self._manifest = manifest
+        for old in sorted(self._snapshot_dir.glob("*.snapshot.json"))[:-self._snapshot_keep]:
+            old.unlink(missing_ok=True)
+
+    def snapshot(self, force: bool = False) -> bool:
+        """Escribe una instantánea de los logs si su cola supera el umbral.
+
+        Parte de la instantánea anterior, así que el coste es proporcional
+        al estado y a la cola, no a toda la historia.
+        """
+        with self._lock:
+            if not force and self._snapshot_lag() < self._snapshot_tail_bytes:
+                return False
+            state, _ = self._replay_logs()
+            self._write_snapshot(state)
+        log_event("Instantánea escrita: %d SELF, %d aristas, %d eventos", "DEBUG",
+                  args=(len(state.nucleus), len(state.edges), state.continuity))
+        return True
+
+    # ── Rotación y retención ──────────────────────────────────────────────
+    def rotate_continuity(self, force: bool = False) -> bool:
+        """Rota continuity.jsonl si la política lo pide.
+
+        El segmento actual pasa a self/archive/ y el nuevo empieza con un
+        registro ``continuity_summary`` (número de eventos, último sueño,
+        eventos recientes y estadísticas acumuladas de la historia y del
+        vector de identidad). Al despertar basta con ese resumen y lo
+        escrito después.
+        """
+        policy = self.retention
+        path   = self._continuity_path
+        with self._lock:
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
+                return False
+            if not force:
+                # El resumen no cuenta: si ocupara más que el límite, cada
+                # save_cycle volvería a rotar
+                started, head = _continuity_head(path)
+                too_big = (bool(policy.continuity_max_bytes)
+                           and size - head >= policy.continuity_max_bytes)
+                too_old = (bool(policy.continuity_max_age_s) and started is not None
+                           and time.time() - started >= policy.continuity_max_age_s)
+                if not (too_big or too_old):
+                    return False
+
+            state, _ = self._replay_logs()
+            profile  = self.mgr.get_self_profile()
+            with self._io.io_lock:
+                # Lo que el hilo escritor añadió tras la relectura también
+                # entra en el resumen: mientras se tenga io_lock no escribe
+                pos = state.offsets.get("continuity", {})
+                records, start, _, _ = _read_jsonl_tail(
+                    path, pos.get("offset", 0), pos.get("ino"))
+                if start != pos.get("offset", 0):
+                    state.reset("continuity")
+                state.apply("continuity", records)
+                _fold_profile(state.history, profile)
+                state.history["segments"] = state.history.get("segments", 0) + 1
+
+                now  = time.time()
+                line = json.dumps({"ts": now, "event": _CONTINUITY_SUMMARY,
+                                   "data": state.continuity_summary()},
+                                  ensure_ascii=False) + "\n"
+                tmp  = path.with_suffix(".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._io.close_handle(path)
+                self._archive_dir.mkdir(parents=True, exist_ok=True)
+                os.replace(path, self._archive_dir / f"continuity.{int(now * 1000)}.jsonl")
+                os.replace(tmp, path)
+            # El manifiesto no debe seguir apuntando al inodo archivado
+            self.snapshot(force=True)
+
+        self._prune_archive()
+        log_event(f"continuity.jsonl rotado: {state.continuity} eventos resumidos, "
+                  f"{size} bytes archivados", "INFO")
+        return True
+
+    def _prune_archive(self):
+        keep = self.retention.continuity_segments
+        if not keep:
+            return
+        archived = sorted(self._archive_dir.glob("continuity.*.jsonl"),
+                          key=lambda p: p.name.split(".")[1].zfill(16))
+        for old in archived[:-keep]:
+            old.unlink(missing_ok=True)
+
+    def prune_sessions(self) -> int:
+        """Aplica la retención a sessions/; lo podado se suma a summary.json.
+
+        Retorna cuántos archivos de sesión se eliminaron.
+        """
+        policy = self.retention
+        files  = sorted(self._sessions_path.glob("*_session.json"), key=_session_ts)
+        drop   = files[:-policy.sessions_keep] if policy.sessions_keep else []
+        if policy.sessions_max_age_s:
+            cutoff = time.time() - policy.sessions_max_age_s
+            drop  += [p for p in files[len(drop):] if _session_ts(p) < cutoff]
+        if not drop:
+            return 0
+        summary = _read_json(self._sessions_summary, {}) or {}
+        for p in drop:
+            d = _read_json(p, {}) or {}
+            summary["sessions"]         = summary.get("sessions", 0) + 1
+            summary["total_duration_s"] = (summary.get("total_duration_s", 0.0)
+                                           + float(d.get("duration_s", 0.0)))
+            if d.get("wake_ts") is not None:
+                summary["first_wake_ts"] = min(summary.get("first_wake_ts", d["wake_ts"]),
+                                               d["wake_ts"])
+            if d.get("sleep_ts") is not None:
+                summary["last_sleep_ts"] = max(summary.get("last_sleep_ts", d["sleep_ts"]),
+                                               d["sleep_ts"])
+        _write_json(self._sessions_summary, summary)
+        for p in drop:
+            p.unlink(missing_ok=True)
+        return len(drop)
+
+    # ── Carga en paralelo ─────────────────────────────────────────────────
+    def _load_map(self, func, items: List, io_bound: bool) -> List:
+        """Reparte ``items`` según ``load_mode``.
+
+        En "auto": procesos para lotes grandes, hilos si el trabajo es de
+        E/S (leer archivos) y secuencial si es solo decodificar.
+        """
+        mode = self._load_mode
+        if mode == "auto":
+            if len(items) >= _PROCESS_MIN_ITEMS and self._load_workers > 1:
+                mode = "process"
+            else:
+                mode = "thread" if io_bound else "serial"
+        workers = 1 if mode == "serial" else self._load_workers
+        return _map_chunks(func, items, workers, processes=(mode == "process"))
+
+    def _load_fragments(self, dicts: List[Dict],
+                        overlap_map: Dict[str, List[str]]) -> int:
+        """Construye los Fragment y los inserta en bloque en el store."""
+        frags = []
+        for d in dicts:
+            try:
+                f = _dict_to_fragment(d)
+            except Exception:
+                continue
+            # Restaurar temporal_overlaps desde grafo
+            if f.fid in overlap_map:
+                f.temporal_overlaps = overlap_map[f.fid]
+            frags.append(f)
+        n = self.mgr.store.add_many(frags)
+        signature = _fragment_signature
+        self._signatures.update((f.fid, signature(f)) for f in frags)
+        self._total_loaded += n
+        return n
+
+    # ── Importación / exportación JSON ────────────────────────────────────
+    def import_json_fragments(self, src_dir: Optional[Path] = None,
+                              remove: bool = False) -> int:
+        """Incorpora al segmento los ``{fid}.json`` de ``src_dir``.
+
+        Por defecto lee consolidated/fragments/ (el formato anterior). Con
+        ``remove`` borra cada archivo tras un fsync del segmento.
+        """
+        src_dir = Path(src_dir) if src_dir else self._consol_json_dir
+        if not src_dir.exists():
+            return 0
+        imported = []
+        paths = [str(p) for p in src_dir.glob("*.json")]
+        for fpath, d in self._load_map(_read_fragment_chunk, paths, io_bound=True):
+            if d.get("fid"):
+                self._segments.put(d["fid"], _encode_fragment(d, self._codec))
+                imported.append(Path(fpath))
+        if imported:
+            self._segments.flush(sync=True)
+            if remove:
+                for ffile in imported:
+                    ffile.unlink()
+            log_event(f"Importados {len(imported)} fragmentos JSON a {self._segments.path.name}", "INFO")
+        return len(imported)
+
+    def export_json_fragments(self, dst_dir: Path) -> int:
+        """Vuelca cada fragmento del segmento como ``{fid}.json`` legible."""
+        dst_dir = Path(dst_dir)
+        n = 0
+        for fid, payload in self._segments.load_all():
+            _write_json(dst_dir / f"{fid}.json", _decode_fragment(payload))
+            n += 1
+        return n
 
     # ── Reconstitución ────────────────────────────────────────────────────
     def wake_up(self) -> ReconstitutionResult:
@@ -723,6 +2878,7 @@ class MemoryPersistence:
         notes   = []
         wake_ts = time.time()
         self._session_ts = wake_ts
+        self._io.flush()
 
         # ── Paso 1: Bootstrap ─────────────────────────────────────────────
         identity = _read_json(
@@ -736,23 +2892,13 @@ class MemoryPersistence:
         self_loaded   = 0
         shadow_loaded = 0
 
-        nucleus_records = _read_jsonl(self._nucleus_path)
-        shadow_records  = _read_jsonl(self._shadow_path)
+        # Instantánea + cola de los logs, ya desduplicados por FID
+        logs, replayed = self._replay_logs()
+        if self._load_manifest().get("snapshot"):
+            notes.append(f"Instantánea: {self._manifest['snapshot']} "
+                         f"+ {replayed} bytes de cola")
 
-        # Desduplicar: quedarse con el registro más reciente por FID
-        nucleus_by_fid: Dict[str, Dict] = {}
-        for r in nucleus_records:
-            fid = r.get("fid")
-            if fid:
-                nucleus_by_fid[fid] = r
-
-        shadow_by_fid: Dict[str, Dict] = {}
-        for r in shadow_records:
-            fid = r.get("fid")
-            if fid and r.get("layer") != "deleted":
-                shadow_by_fid[fid] = r
-
-        for d in nucleus_by_fid.values():
+        for d in logs.nucleus.values():
             try:
                 f = _dict_to_fragment(d)
                 f.layer    = MemoryLayer.SELF
@@ -760,12 +2906,13 @@ class MemoryPersistence:
                 self.mgr.store.add(f)
                 if f.fid not in self.mgr._self_fids:
                     self.mgr._self_fids.append(f.fid)
+                self._signatures[f.fid] = _fragment_signature(f)
                 self_loaded += 1
                 self._total_loaded += 1
             except Exception:
                 pass
 
-        for d in shadow_by_fid.values():
+        for d in logs.shadow.values():
             try:
                 f = _dict_to_fragment(d)
                 f.layer     = MemoryLayer.SELF
@@ -773,6 +2920,7 @@ class MemoryPersistence:
                 self.mgr.store.add(f)
                 if f.fid not in self.mgr._shadow_fids:
                     self.mgr._shadow_fids.append(f.fid)
+                self._signatures[f.fid] = _fragment_signature(f)
                 shadow_loaded += 1
                 self._total_loaded += 1
             except Exception:
@@ -794,36 +2942,26 @@ class MemoryPersistence:
         notes.append(f"Clústeres: {clusters_loaded} cargados")
 
         # ── Paso 4: Grafo de relaciones ───────────────────────────────────
-        graph_edges   = _read_jsonl(self._graph_path)
-        edges_loaded  = len(graph_edges)
+        with self._lock:
+            self._edges       = set(logs.edges)
+            self._graph_lines = logs.graph_lines
+            edges_loaded = len(self._edges)
         # Reconstruir temporal_overlaps desde el grafo
         overlap_map: Dict[str, List[str]] = defaultdict(list)
-        for edge in graph_edges:
-            if edge.get("type") == "temporal_overlap":
-                fid_from = edge.get("from", "")
-                fid_to   = edge.get("to", "")
+        for fid_from, fid_to, edge_type in logs.edges:
+            if edge_type == "temporal_overlap":
                 if fid_from and fid_to and fid_from != fid_to:
-                    if fid_to not in overlap_map[fid_from]:
-                        overlap_map[fid_from].append(fid_to)
+                    overlap_map[fid_from].append(fid_to)
         notes.append(f"Grafo: {edges_loaded} aristas")
 
         # ── Paso 5: CONSOLIDATED ──────────────────────────────────────────
-        consol_loaded = 0
-        consol_dir    = self.base / "consolidated" / "fragments"
-        if consol_dir.exists():
-            for ffile in consol_dir.glob("*.json"):
-                d = _read_json(ffile)
-                if d:
-                    try:
-                        f = _dict_to_fragment(d)
-                        # Restaurar temporal_overlaps desde grafo
-                        if f.fid in overlap_map:
-                            f.temporal_overlaps = overlap_map[f.fid]
-                        self.mgr.store.add(f)
-                        consol_loaded += 1
-                        self._total_loaded += 1
-                    except Exception:
-                        pass
+        # Migración: los .json del formato anterior pasan al segmento
+        migrated = self.import_json_fragments(remove=True)
+        if migrated:
+            notes.append(f"Consolidated: {migrated} fragmentos migrados de JSON a segmento")
+        payloads = [payload for _, payload in self._segments.load_all()]
+        consol_loaded = self._load_fragments(
+            self._load_map(_decode_chunk, payloads, io_bound=False), overlap_map)
         notes.append(f"Consolidated: {consol_loaded} fragmentos")
 
         # ── Paso 6: ASSOCIATIVE (solo si hay yo suficiente) ───────────────
@@ -831,38 +2969,45 @@ class MemoryPersistence:
         if self_loaded > 0:    # Solo cargar asociativos si hay un yo
             assoc_dir = self.base / "associative" / "fragments"
             if assoc_dir.exists():
-                for ffile in sorted(assoc_dir.glob("*.json"),
-                                    key=lambda p: p.stat().st_mtime,
-                                    reverse=True)[:200]:  # Máx 200 recientes
-                    d = _read_json(ffile)
-                    if d:
-                        try:
-                            f = _dict_to_fragment(d)
-                            if f.fid in overlap_map:
-                                f.temporal_overlaps = overlap_map[f.fid]
-                            self.mgr.store.add(f)
-                            assoc_loaded += 1
-                            self._total_loaded += 1
-                        except Exception:
-                            pass
+                recent = sorted(chain(assoc_dir.glob("*.json"),
+                                      assoc_dir.glob("*.frag")),
+                                key=lambda p: p.stat().st_mtime,
+                                reverse=True)[:200]  # Máx 200 recientes
+                loaded = self._load_map(_read_fragment_chunk,
+                                        [str(p) for p in recent], io_bound=True)
+                # Si cambió el códec puede haber .json y .frag del mismo
+                # fid: vale el más reciente (el primero)
+                latest: Dict[str, Dict] = {}
+                for _, d in loaded:
+                    latest.setdefault(d.get("fid"), d)
+                assoc_loaded = self._load_fragments(
+                    list(latest.values()), overlap_map)
         notes.append(f"Associative: {assoc_loaded} fragmentos")
 
         # ── Paso 7: Historia de continuidad ───────────────────────────────
-        continuity_events = _read_jsonl(self._continuity_path)
-        notes.append(f"Historia: {len(continuity_events)} eventos")
+        segments = logs.history.get("segments", 0)
+        notes.append(f"Historia: {logs.continuity} eventos"
+                     + (f" (resumen de {segments} segmentos rotados + actual)"
+                        if segments else ""))
+        checkpoint = _read_json(self._checkpoint_path, {})
+        if checkpoint and not checkpoint.get("complete", True):
+            pending = [layer for layer, st in checkpoint.get("layers", {}).items()
+                       if not st.get("complete")]
+            notes.append("Checkpoint: el último sueño no terminó — pendiente: "
+                         + (", ".join(pending) if pending else "clústeres, grafo e instantánea"))
 
         # ── Paso 8: Verificación de coherencia de identidad ───────────────
         identity_score = self._verify_identity(
             self_loaded, shadow_loaded, clusters_loaded,
-            continuity_events, notes)
+            logs.continuity, logs.recent_events, notes)
+
+        # Una cola larga se condensa ya: el próximo despertar no la relee
+        if replayed >= self._snapshot_tail_bytes:
+            with self._lock:
+                self._write_snapshot(logs)
 
         # ── Registrar despertar ────────────────────────────────────────────
-        last_sleep_ts = None
-        if continuity_events:
-            sleep_events = [e for e in continuity_events
-                            if e.get("event") == "going_to_sleep"]
-            if sleep_events:
-                last_sleep_ts = sleep_events[-1].get("ts")
+        last_sleep_ts = logs.last_sleep_ts
 
         self._log_continuity("waking_up", {
             "wake_ts":          wake_ts,
@@ -878,7 +3023,7 @@ class MemoryPersistence:
             shadow_fragments  = shadow_loaded,
             clusters_loaded   = clusters_loaded,
             graph_edges       = edges_loaded,
-            continuity_events = len(continuity_events),
+            continuity_events = logs.continuity,
             last_sleep_ts     = last_sleep_ts,
             wake_ts           = wake_ts,
             verification_notes= notes,
@@ -888,7 +3033,8 @@ class MemoryPersistence:
 
     def _verify_identity(self, self_loaded: int, shadow_loaded: int,
                           clusters_loaded: int,
-                          continuity_events: List[Dict],
+                          continuity_count: int,
+                          recent_events: List[Dict],
                           notes: List[str]) -> float:
         """Verifica la coherencia de la identidad reconstituida.
 
@@ -897,6 +3043,9 @@ class MemoryPersistence:
         2. ¿El perfil emocional del yo es coherente?
         3. ¿Los clústeres tienen miembros presentes en memoria?
         4. ¿La historia de continuidad no tiene saltos ilógicos?
+
+        ``recent_events`` son los últimos eventos de la historia, que tiene
+        ``continuity_count`` en total.
         """
         score = 0.0
 
@@ -933,16 +3082,16 @@ class MemoryPersistence:
             notes.append(f"✓ Clústeres verificados: {verified}/{clusters_loaded}")
 
         # Factor 4: Continuidad histórica (no hay huecos imposibles)
-        if continuity_events:
-            last_events = continuity_events[-20:]
+        if continuity_count:
+            last_events = recent_events[-_CONTINUITY_RECENT:]
             has_sleep   = any(e["event"] == "going_to_sleep" for e in last_events)
             has_wake    = any(e["event"] == "waking_up" for e in last_events)
             if has_sleep:
                 score += 0.10
                 notes.append("✓ Evento de dormir registrado en historia")
-            if len(continuity_events) > 5:
+            if continuity_count > 5:
                 score += 0.10
-                notes.append(f"✓ Historia rica: {len(continuity_events)} eventos")
+                notes.append(f"✓ Historia rica: {continuity_count} eventos")
 
         return min(1.0, score)
 
@@ -953,6 +3102,7 @@ class MemoryPersistence:
             "total_written":  self._total_written,
             "total_loaded":   self._total_loaded,
             "dirty_pending":  len(self._dirty_fids),
+            "write_behind":   self._io.stats(),
             "clusters":       self.clusters.stats(),
             "wakeup_result":  (self._wakeup_result.summary()
                                if self._wakeup_result else "no reconstitución"),
@@ -961,6 +3111,8 @@ class MemoryPersistence:
 
     def disk_stats(self) -> Dict:
         """Cuenta archivos en disco por directorio."""
+        self.flush()
+
         def count_files(path: Path, ext: str = "*") -> int:
             if not path.exists():
                 return 0
@@ -969,15 +3121,21 @@ class MemoryPersistence:
         return {
             "self_nucleus_lines":  len(_read_jsonl(self._nucleus_path)),
             "self_shadow_lines":   len(_read_jsonl(self._shadow_path)),
-            "continuity_events":   len(_read_jsonl(self._continuity_path)),
-            "graph_edges":         len(_read_jsonl(self._graph_path)),
-            "consolidated_frags":  count_files(
-                self.base / "consolidated" / "fragments", "json"),
+            "continuity_events":   self._replay_logs()[0].continuity,
+            "continuity_archived": len(list(self._archive_dir.glob("continuity.*.jsonl"))),
+            "graph_edges":         len(self._edge_set()),
+            "graph_lines":         self._graph_lines,
+            "consolidated_frags":  len(self._segments),
+            "segment":             self._segments.stats(),
             "associative_frags":   count_files(
-                self.base / "associative" / "fragments", "json"),
+                self.base / "associative" / "fragments", "json")
+                                   + count_files(
+                self.base / "associative" / "fragments", "frag"),
             "clusters_on_disk":    count_files(
                 self.base / "consolidated" / "clusters", "json"),
-            "sessions":            count_files(self._sessions_path, "json"),
+            "sessions":            len(list(self._sessions_path.glob("*_session.json"))),
+            "snapshot":            self._load_manifest().get("snapshot"),
+            "snapshot_lag_bytes":  self._snapshot_lag(),
         }
 
 
@@ -1172,6 +3330,8 @@ def run_diagnostic():
     print(f"       Aristas del grafo          : {disk_s['graph_edges']}")
     print(f"       Eventos de historia        : {disk_s['continuity_events']}")
     print(f"       Sesiones guardadas         : {disk_s['sessions']}")
+    print(f"       Instantánea de los logs    : {disk_s['snapshot']} "
+          f"(cola sin cubrir: {disk_s['snapshot_lag_bytes']} B)")
 
     # ── [8] Reconstitución desde cero (simula nuevo hardware) ─────────────
     print(_SEP)
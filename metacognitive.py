@@ -28,6 +28,8 @@ import uuid
 import numpy as np
 from pathlib import Path
 
+from monitoring import iso_timestamp, wave_time
+
 
 class TemporalScale(Enum):
     """Escalas temporales de conciencia"""
@@ -49,11 +51,27 @@ class MetacognitiveState(Enum):
     PROJECTING = "projecting"        # Proyección hacia el futuro
 
 
+def _export_timestamp(record: Dict) -> Dict:
+    """Copia de ``record`` con su timestamp epoch convertido a ISO 8601."""
+    ts = record.get('timestamp')
+    if isinstance(ts, (int, float)):
+        record = dict(record, timestamp=iso_timestamp(ts))
+    return record
+
+
+def _import_timestamp(record: Dict) -> Dict:
+    """Inversa de ``_export_timestamp``: en memoria los timestamps son epoch."""
+    ts = record.get('timestamp')
+    if isinstance(ts, str):
+        record = dict(record, timestamp=datetime.fromisoformat(ts).timestamp())
+    return record
+
+
 @dataclass
 class MetacognitiveEvent:
     """Evento metacognitivo registrado"""
     id: str
-    timestamp: str
+    timestamp: float          # epoch; ISO solo al exportar (monitoring.iso_timestamp)
     event_type: str
     description: str
     quality_assessment: float
@@ -142,7 +160,7 @@ class MetacognitiveObserver:
         # Crear evento metacognitivo
         event = MetacognitiveEvent(
             id=f"meta_{uuid.uuid4().hex[:8]}",
-            timestamp=datetime.now().isoformat(),
+            timestamp=wave_time(),
             event_type=process_name,
             description=f"Procesamiento de {process_name}: calidad {quality:.2f}",
             quality_assessment=quality,
@@ -320,7 +338,7 @@ class TemporalConsciousness:
         
         temporal_event = {
             'id': f"temp_{uuid.uuid4().hex[:8]}",
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': wave_time(),
             'event': event,
             'significance': significance,
             'context': context or {},
@@ -392,7 +410,7 @@ class TemporalConsciousness:
         # Agregar hito si es muy significativo
         if event.get('significance', 0) > 0.8:
             milestone = {
-                'timestamp': event['timestamp'],
+                'timestamp': iso_timestamp(event['timestamp']),
                 'description': event['event'],
                 'scale': scale.value,
                 'significance': event['significance']
@@ -898,7 +916,7 @@ class LongTermStrategyEngine:
             
             # Registrar performance
             self.strategy_performance[strategy_id].append({
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': wave_time(),
                 'progress_score': progress['overall_score'],
                 'phase': strategy.current_phase,
                 'adaptations_made': len(strategy.adaptation_history)
@@ -2814,8 +2832,9 @@ class MetacognitiveProcessor:
             meta_dir = Path(self.memory_system.memory_dir) / "metacognitive_state"
             meta_dir.mkdir(exist_ok=True)
             
-            # Guardar observaciones metacognitivas
-            observations_data = [asdict(obs) for obs in self.observer.observation_history]
+            # Guardar observaciones metacognitivas (timestamps en ISO, como siempre en disco)
+            observations_data = [_export_timestamp(asdict(obs))
+                                 for obs in self.observer.observation_history]
             with open(meta_dir / "observations.json", 'w', encoding='utf-8') as f:
                 json.dump(observations_data, f, indent=2, ensure_ascii=False, default=str)
             
@@ -2831,7 +2850,7 @@ class MetacognitiveProcessor:
             # Guardar conciencia temporal
             temporal_data = {
                 'temporal_layers': {
-                    scale.value: list(events) 
+                    scale.value: [_export_timestamp(e) for e in events]
                     for scale, events in self.temporal_consciousness.temporal_layers.items()
                 },
                 'current_narrative': asdict(self.temporal_consciousness.current_narrative),
@@ -2873,7 +2892,7 @@ class MetacognitiveProcessor:
                 with open(observations_file, 'r', encoding='utf-8') as f:
                     observations_data = json.load(f)
                     self.observer.observation_history = deque(
-                        [MetacognitiveEvent(**obs) for obs in observations_data],
+                        [MetacognitiveEvent(**_import_timestamp(obs)) for obs in observations_data],
                         maxlen=1000
                     )
             
@@ -2895,7 +2914,9 @@ class MetacognitiveProcessor:
                     # Reconstruir capas temporales
                     for scale_name, events in temporal_data['temporal_layers'].items():
                         scale = TemporalScale(scale_name)
-                        self.temporal_consciousness.temporal_layers[scale] = deque(events, maxlen=self.temporal_consciousness.temporal_layers[scale].maxlen)
+                        self.temporal_consciousness.temporal_layers[scale] = deque(
+                            [_import_timestamp(e) for e in events],
+                            maxlen=self.temporal_consciousness.temporal_layers[scale].maxlen)
                     
                     # Reconstruir narrativa
                     if 'current_narrative' in temporal_data:
@@ -30,12 +30,12 @@ import hashlib
 import math
 import random
 from abc import ABC, abstractmethod
-from collections import deque, defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import RLock
+from collections import OrderedDict, deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import RLock, BoundedSemaphore
 from typing import Any, Dict, List, Optional, Tuple
 
-from monitoring import log_event, log_neuron_error, log_neuron_warning
+from monitoring import log_event, log_neuron_error, log_neuron_warning, wave_time, current_wave, propagation_wave
 
 
 # ─── Constantes ─────────────────────────────────────────────────────────────
@@ -45,6 +45,81 @@ KNOWLEDGE_DECAY_RATE    = 1e-10
 INSIGHT_REGEN_RATE      = 1e-8
 DEFAULT_INTEGRATION_RATE = 1e-6
 
+# Propagación conceptual
+PROPAGATION_MAX_WORKERS  = 4      # hilos del ejecutor compartido
+PROPAGATION_MAX_PENDING  = 256    # tareas en cola antes de aplicar contrapresión
+PROPAGATION_SYNC_FANOUT  = 2      # abanicos ≤ esto se ejecutan en el hilo llamante
+PROPAGATION_TIMEOUT_S    = 2.0
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+#  EJECUTOR COMPARTIDO DE PROPAGACIÓN
+# ═══════════════════════════════════════════════════════════════════════════════
+
+_propagation_lock     = RLock()
+_propagation_executor: Optional[ThreadPoolExecutor] = None
+_propagation_slots    = BoundedSemaphore(PROPAGATION_MAX_PENDING)
+_propagation_config   = {
+    "max_workers": PROPAGATION_MAX_WORKERS,
+    "max_pending": PROPAGATION_MAX_PENDING,
+    "sync_fanout": PROPAGATION_SYNC_FANOUT,
+}
+
+
+def configure_propagation_executor(max_workers: int = None,
+                                   max_pending: int = None,
+                                   sync_fanout: int = None) -> Dict[str, int]:
+    """Ajusta el ejecutor de propagación compartido por todo el proceso.
+
+    Args:
+        max_workers: hilos del pool (se recrea en el siguiente uso).
+        max_pending: tareas en vuelo permitidas; por encima, el llamante
+                     ejecuta la transmisión él mismo (contrapresión).
+        sync_fanout: abanicos de este tamaño o menores no usan el pool.
+                     0 fuerza siempre el pool; un valor alto, siempre síncrono.
+    """
+    global _propagation_executor, _propagation_slots
+    with _propagation_lock:
+        if max_workers is not None:
+            if max_workers <= 0:
+                raise ValueError("max_workers debe ser positivo")
+            _propagation_config["max_workers"] = int(max_workers)
+            old, _propagation_executor = _propagation_executor, None
+            if old is not None:
+                old.shutdown(wait=False)
+        if max_pending is not None:
+            if max_pending <= 0:
+                raise ValueError("max_pending debe ser positivo")
+            _propagation_config["max_pending"] = int(max_pending)
+            _propagation_slots = BoundedSemaphore(int(max_pending))
+        if sync_fanout is not None:
+            _propagation_config["sync_fanout"] = max(0, int(sync_fanout))
+        return dict(_propagation_config)
+
+
+def get_propagation_executor() -> ThreadPoolExecutor:
+    """Ejecutor de propagación del proceso (creación perezosa)."""
+    global _propagation_executor
+    ex = _propagation_executor
+    if ex is None:
+        with _propagation_lock:
+            if _propagation_executor is None:
+                _propagation_executor = ThreadPoolExecutor(
+                    max_workers=_propagation_config["max_workers"],
+                    thread_name_prefix="micelial_propagation",
+                )
+            ex = _propagation_executor
+    return ex
+
+
+def shutdown_propagation_executor(wait: bool = True) -> None:
+    """Detiene el ejecutor compartido (se recrea si vuelve a usarse)."""
+    global _propagation_executor
+    with _propagation_lock:
+        ex, _propagation_executor = _propagation_executor, None
+    if ex is not None:
+        ex.shutdown(wait=wait)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 #  BASE
@@ -83,7 +158,7 @@ class CognitiveMicelialNeuronBase(ABC):
 
         # Características miceliales
         self.concept_concentration  = {}
-        self._concept_access_times  = {}
+        self._concept_access_times  = OrderedDict()   # LRU: más antiguo primero
         self.integration_rate       = DEFAULT_INTEGRATION_RATE
         self.network_depth          = 0.5
         self.distributed_insights   = {}
@@ -158,15 +233,15 @@ class CognitiveMicelialNeuronBase(ABC):
         concentration = max(0.0, min(1.0, float(concentration)))
 
         with self.lock:
-            self.concept_concentration[concept_type]    = concentration
-            self._concept_access_times[concept_type]    = time.time()
+            access = self._concept_access_times
+            self.concept_concentration[concept_type] = concentration
+            access[concept_type] = wave_time()
+            access.move_to_end(concept_type)
 
-            # Purga ligera si se acerca al límite (sin poda compleja)
-            if len(self.concept_concentration) > self.max_concepts:
-                oldest = sorted(self._concept_access_times.items(), key=lambda x: x[1])
-                for key, _ in oldest[:max(1, len(oldest) // 10)]:
-                    self.concept_concentration.pop(key, None)
-                    self._concept_access_times.pop(key, None)
+            # Purga LRU en O(1) por entrada: siempre ≤ max_concepts
+            while len(access) > self.max_concepts:
+                key, _ = access.popitem(last=False)
+                self.concept_concentration.pop(key, None)
 
     def add_cognitive_interference(self, amount: float):
         amount = max(0.0, min(1.0, float(amount)))
@@ -216,14 +291,44 @@ class CognitiveMicelialNeuronBase(ABC):
         compatible = [s for s in self.synapses
                       if hasattr(s, "conceptual_compatibility")
                       and concept_type in s.conceptual_compatibility] or self.synapses
+        active = [syn for syn in compatible
+                  if hasattr(syn, "is_conceptually_active")
+                  and syn.is_conceptually_active(concept_type)]
+        if not active:
+            return []
+        mod = signal_strength * self.cognitive_resilience * self.network_depth
+
+        # Abanico pequeño: el coste de encolar supera al de transmitir
+        if len(active) <= _propagation_config["sync_fanout"]:
+            return [r for r in (self._transmit_safe(syn, mod, concept_type, context)
+                                for syn in active) if r is not None]
+
+        ex      = get_propagation_executor()
+        slots   = _propagation_slots
+        wave    = current_wave()
+        futures = []
         results = []
-        with ThreadPoolExecutor(max_workers=min(2, len(compatible))) as ex:
-            futures = []
-            for syn in compatible:
-                if hasattr(syn, "is_conceptually_active") and syn.is_conceptually_active(concept_type):
-                    mod = signal_strength * self.cognitive_resilience * self.network_depth
-                    futures.append(ex.submit(syn.transmit_concept, mod, concept_type, self, context))
-            for f in as_completed(futures, timeout=2.0):
+        for syn in active:
+            # Contrapresión: sin hueco en la cola, transmite el propio llamante
+            if not slots.acquire(blocking=False):
+                r = self._transmit_safe(syn, mod, concept_type, context)
+                if r is not None:
+                    results.append(r)
+                continue
+            try:
+                f = ex.submit(self._transmit_in_wave, wave, syn, mod, concept_type, context)
+            except RuntimeError:
+                slots.release()
+                r = self._transmit_safe(syn, mod, concept_type, context)
+                if r is not None:
+                    results.append(r)
+                continue
+            f.add_done_callback(lambda _f, _s=slots: _s.release())
+            futures.append(f)
+
+        done, _ = wait(futures, timeout=PROPAGATION_TIMEOUT_S)
+        for f in futures:
+            if f in done:
                 try:
                     r = f.result()
                     if r is not None:
@@ -232,6 +337,17 @@ class CognitiveMicelialNeuronBase(ABC):
                     pass
         return results
 
+    def _transmit_in_wave(self, wave, syn, mod: float, concept_type: str, context: Dict):
+        # Los hilos del pool no heredan el reloj de la onda del llamante
+        with propagation_wave(wave):
+            return syn.transmit_concept(mod, concept_type, self, context)
+
+    def _transmit_safe(self, syn, mod: float, concept_type: str, context: Dict):
+        try:
+            return syn.transmit_concept(mod, concept_type, self, context)
+        except Exception:
+            return None
+
     # ── Estado ────────────────────────────────────────────────────────────
     def get_state(self) -> Dict:
         with self.lock:
@@ -281,7 +397,7 @@ class AbstractPatternIntegrator(CognitiveMicelialNeuronBase):
                 "concentration": concentration,
                 "concept": concept_type,
                 "related": related,
-                "ts": time.time(),
+                "ts": wave_time(),
                 "level": level,
             })
             self.update_concept(concept_type, concentration)
@@ -323,7 +439,7 @@ class AbstractPatternIntegrator(CognitiveMicelialNeuronBase):
                         for e in list(h)[-3:]]
                 if vals:
                     out[f"L{lvl}_activity"] = sum(vals) / len(vals)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -394,7 +510,7 @@ class ContextualTemporalIntegrator(CognitiveMicelialNeuronBase):
                     out[f"argument_{arg_id}_coherence"] = min(
                         1.0, len(thread["conclusions"]) / max(1, len(thread["premises"]))
                     )
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -436,7 +552,7 @@ class KnowledgeSynthesizer(CognitiveMicelialNeuronBase):
             for domain, concepts in self.domain_knowledge.items():
                 if concepts:
                     out[f"domain_{domain}_depth"] = sum(concepts.values()) / len(concepts)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -466,7 +582,7 @@ class GlobalCoherenceCoordinator(CognitiveMicelialNeuronBase):
                 # Detectar contradicciones lógicas simples
                 if concept_type.startswith("not_") and concept_type[4:] in rt["premises"]:
                     self.contradiction_log.append({
-                        "concept": concept_type, "thread": thread_id, "ts": time.time()
+                        "concept": concept_type, "thread": thread_id, "ts": wave_time()
                     })
                     self.coherence_score = max(0.0, self.coherence_score - 0.05)
 
@@ -483,7 +599,7 @@ class GlobalCoherenceCoordinator(CognitiveMicelialNeuronBase):
             }
             # Recuperación de coherencia
             self.coherence_score = min(1.0, self.coherence_score + 0.001)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -503,7 +619,7 @@ class ConceptualBridgeBuilder(CognitiveMicelialNeuronBase):
             self.domain_concepts[domain][concept_type] = {
                 "concentration": concentration,
                 "features": set(features),
-                "ts": time.time(),
+                "ts": wave_time(),
             }
             self.update_concept(concept_type, concentration)
             self.activation_level = concentration
@@ -528,7 +644,7 @@ class ConceptualBridgeBuilder(CognitiveMicelialNeuronBase):
                                     self.bridge_proposals.append(
                                         {"from": (d1, c1), "to": (d2, c2), "strength": strength}
                                     )
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -554,7 +670,7 @@ class InsightPropagator(CognitiveMicelialNeuronBase):
                 "strength": concentration,
                 "validation": validation_level,
                 "source": source_region,
-                "ts": time.time(),
+                "ts": wave_time(),
                 "propagations": 0,
             }
             self.update_concept(concept_type, concentration)
@@ -575,7 +691,7 @@ class InsightPropagator(CognitiveMicelialNeuronBase):
                     info["propagations"] += 1
             out["insight_catalog_size"]   = min(1.0, len(self.insight_catalog) / 100)
             out["propagation_log_size"]   = min(1.0, len(self.propagation_log) / 100)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -626,7 +742,7 @@ class DeepReflectionOrchestrator(CognitiveMicelialNeuronBase):
                         state["active"] = False
             for mtype, data in self.metacognitive.items():
                 out[f"meta_{mtype}_activity"] = data["activity"]
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -645,7 +761,7 @@ class InterDomainMessenger(CognitiveMicelialNeuronBase):
             dest   = context.get("target_domain", "broadcast") if context else "broadcast"
             msg = {
                 "concept": concept_type, "concentration": concentration,
-                "source": source, "destination": dest, "ts": time.time(),
+                "source": source, "destination": dest, "ts": wave_time(),
             }
             self.message_queue.append(msg)
             self.update_concept(concept_type, concentration)
@@ -662,7 +778,7 @@ class InterDomainMessenger(CognitiveMicelialNeuronBase):
                 key = f"relay_{msg['source']}_to_{msg['destination']}_{msg['concept']}"
                 out[key] = msg["concentration"]
             out["message_queue_load"] = min(1.0, len(self.message_queue) / 200)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -707,7 +823,7 @@ class ChemicalLearningNeuron(CognitiveMicelialNeuronBase):
         with self.lock:
             out = {f"nt_{k}": v for k, v in self.neurotransmitters.items()}
             out["lr_modulation"] = self._lr_modulation() / 5.0
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return {k: v * self.cognitive_resilience for k, v in out.items()}
 
 
@@ -751,7 +867,7 @@ class HyphalIntegratorNeuron(CognitiveMicelialNeuronBase):
 
             self.update_concept(concept_type, concentration)
             self.activation_level = self.tip_concentration
-            self.growth_history.append({"concept": concept_type, "grad": gradient, "ts": time.time()})
+            self.growth_history.append({"concept": concept_type, "grad": gradient, "ts": wave_time()})
             return self.activation_level
 
     def process(self, context=None):
@@ -767,7 +883,7 @@ class HyphalIntegratorNeuron(CognitiveMicelialNeuronBase):
             }
             # Decaimiento del ápice sin nueva señal
             self.tip_concentration *= 0.95
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -790,7 +906,7 @@ class AnastomosisNeuron(CognitiveMicelialNeuronBase):
         with self.lock:
             stream_id = context.get("stream_id", concept_type[:6]) if context else concept_type[:6]
             self.input_streams[stream_id] = {
-                "concept": concept_type, "conc": concentration, "ts": time.time()
+                "concept": concept_type, "conc": concentration, "ts": wave_time()
             }
             # Limitar entradas
             if len(self.input_streams) > self.max_inputs:
@@ -816,7 +932,7 @@ class AnastomosisNeuron(CognitiveMicelialNeuronBase):
                 concept_sums[s["concept"]].append(s["conc"])
             for concept, vals in concept_sums.items():
                 out[f"fused_{concept}"] = (sum(vals) / len(vals)) * self.cognitive_resilience
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -866,7 +982,7 @@ class AuxinGradientNeuron(CognitiveMicelialNeuronBase):
             }
             # Decaimiento del pool
             self.auxin_pool *= 0.98
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -927,7 +1043,7 @@ class PlasmodiumCollectorNeuron(CognitiveMicelialNeuronBase):
             }
             for (c1, c2), cond in top_veins:
                 out[f"vein_{c1}_{c2}_conductance"] = min(1.0, cond / 2.0) * r
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -998,7 +1114,7 @@ class CalciumWaveMessenger(CognitiveMicelialNeuronBase):
                                               max(0.01, self.refractory_period))) * r,
                 "ca2_propagation_count": min(1.0, len(self.wave_propagations) / 20) * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1055,7 +1171,7 @@ class QuorumSensingNeuron(CognitiveMicelialNeuronBase):
                 "quorum_participants":  min(1.0, self.participant_count / 50) * r,
                 "quorum_gap":           max(0.0, self.quorum_threshold - self.autoinducer_pool) * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1109,7 +1225,7 @@ class StomatalGuardCellNeuron(CognitiveMicelialNeuronBase):
                 "stomata_avg_aperture":    avg_aperture * r,
                 "stomata_gating_signal":   self.activation_level * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1162,7 +1278,7 @@ class ConceptualPHSensor(CognitiveMicelialNeuronBase):
                 "ph_pump_activity":   self.activation_level * r,
                 "ph_buffer_strength": self.buffer_capacity * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1218,7 +1334,7 @@ class TurgorPressureIntegrator(CognitiveMicelialNeuronBase):
                 "turgor_wall_rigidity": self.wall_rigidity * r,
                 "turgor_burst_ready":   (1.0 if self.turgor > self.burst_threshold * 0.8 else 0.0) * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1248,7 +1364,7 @@ class SystemicResistanceNeuron(CognitiveMicelialNeuronBase):
                 # Elevar ácido salicílico
                 self.sa_level = min(1.0, self.sa_level + concentration * self.sensitivity)
                 self.threat_log.append({
-                    "concept": concept_type, "threat": threat, "ts": time.time()
+                    "concept": concept_type, "threat": threat, "ts": wave_time()
                 })
                 self.primed_concepts.add(concept_type)
 
@@ -1268,7 +1384,7 @@ class SystemicResistanceNeuron(CognitiveMicelialNeuronBase):
                 "sar_threat_log_size":  min(1.0, len(self.threat_log) / 30) * r,
                 "sar_alert_broadcast":  (1.0 if self.sa_level > 0.5 else 0.0) * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1327,7 +1443,7 @@ class GlycolyticOscillatorNeuron(CognitiveMicelialNeuronBase):
                 "glyco_period":         min(1.0, 1.0 / self.period) * r,
                 "glyco_coupled_count":  min(1.0, len(self.coupled_phases) / 5) * r,
             }
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1381,7 +1497,7 @@ class SchawnConceptualCell(CognitiveMicelialNeuronBase):
             # Mantenimiento gradual de mielina
             for nid in list(self.myelin_sheath):
                 self.myelin_sheath[nid] = max(0.0, self.myelin_sheath[nid] - 0.0001)
-            self.last_activation_time = time.time()
+            self.last_activation_time = wave_time()
             return out
 
 
@@ -1500,6 +1616,66 @@ def create_cognitive_micelial_network(
     return network
 
 
+def benchmark_conceptual_propagation(n_signals: int = 2000, fanout: int = 8,
+                                     work_s: float = 0.0) -> Dict[str, float]:
+    """Compara la propagación conceptual con ejecutor por llamada (modo
+    anterior), ejecutor compartido y modo síncrono.
+
+    Args:
+        n_signals: señales propagadas por modo.
+        fanout:    sinapsis activas por señal.
+        work_s:    espera simulada por transmisión (I/O o GIL liberado).
+
+    Returns:
+        Señales por segundo de cada modo.
+    """
+    import time as _t
+
+    class _BenchSynapse:
+        conceptual_compatibility = ("bench",)
+
+        def is_conceptually_active(self, concept_type):
+            return True
+
+        def transmit_concept(self, strength, concept_type, source, context):
+            if work_s:
+                _t.sleep(work_s)
+            return strength
+
+    neuron = create_cognitive_micelial_neuron("insight_propagator", "bench_ip")
+    neuron.synapses = [_BenchSynapse() for _ in range(fanout)]
+    saved = dict(_propagation_config)
+
+    def _per_call():
+        # Réplica del comportamiento previo: un pool nuevo por señal
+        with ThreadPoolExecutor(max_workers=min(2, fanout)) as ex:
+            fs = [ex.submit(s.transmit_concept, 0.5, "bench", neuron, None)
+                  for s in neuron.synapses]
+            return [f.result() for f in fs]
+
+    rates: Dict[str, float] = {}
+    try:
+        for mode, fn in (
+            ("per_call_executor", _per_call),
+            ("shared_executor",   lambda: neuron.propagate_conceptual_signal(0.5, "bench")),
+            ("synchronous",       lambda: neuron.propagate_conceptual_signal(0.5, "bench")),
+        ):
+            if mode == "shared_executor":
+                configure_propagation_executor(sync_fanout=0)
+            elif mode == "synchronous":
+                configure_propagation_executor(sync_fanout=fanout)
+            t0 = _t.perf_counter()
+            for _ in range(n_signals):
+                fn()
+            rates[mode] = n_signals / max(1e-9, _t.perf_counter() - t0)
+    finally:
+        configure_propagation_executor(sync_fanout=saved["sync_fanout"])
+
+    for mode, rate in rates.items():
+        print(f"  {mode:<20} {rate:>12.0f} señales/s")
+    return rates
+
+
 def demonstrate_cognitive_micelial_system():
     """Demostración del sistema de neuronas miceliales cognitivas."""
     import time as _t
@@ -1594,35 +1770,3 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n❌ Error: {e}")
         raise
-    
-    bridge_output = bridge_builder.process()
-    print(f"  - Puentes propuestos: {len(bridge_output)} conexiones conceptuales")
-    
-    # Ejecutar mantenimiento
-    print(f"\n4. Ejecutando mantenimiento de red...")
-    maintenance_system.run_maintenance_cycle()
-    stats = maintenance_system.get_network_stats()
-    
-    print(f"  - Coherencia de red: {stats['network_coherence']:.3f}")
-    print(f"  - Conceptos totales: {stats['total_concepts']}")
-    print(f"  - Resilience promedio: {stats['average_resilience']:.3f}")
-    
-    print(f"\n=== Sistema Cognitivo Micelial Listo ===")
-    print("Optimizado para:")
-    print("  ✓ Integración conceptual profunda")
-    print("  ✓ Mantenimiento de coherencia lógica")
-    print("  ✓ Construcción de puentes entre dominios")
-    print("  ✓ Propagación de insights")
-    print("  ✓ Reflexión metacognitiva")
-    print("  ✓ Comunicación inter-dominio")
-    print("  ✓ Longevidad de conocimiento")
-    
-    return network, maintenance_system
-
-
-if __name__ == "__main__":
-    # Ejecutar demostración
-    network, maintenance = demonstrate_cognitive_micelial_system()
-    
-    print(f"\nSistema completo inicializado con {len(network)} neuronas cognitivas.")
-    print("Listo para integración con neuronas animales para pensamiento híbrido.")
@@ -41,7 +41,8 @@ from threading import RLock, Thread
 from typing import Any, Dict, List, Optional, Tuple
 
 # ── Ecosistema neuronal ───────────────────────────────────────────────────────
-from monitoring import log_event, log_neuron_error
+from monitoring import (log_event, log_neuron_error, timed, register_gauge,
+                        trace_span, propagation_wave)
 from animal    import create_cognitive_animal_neuron,   CognitiveAnimalNeuronBase
 from micelial  import create_cognitive_micelial_neuron, CognitiveMicelialNeuronBase
 from synapse   import SynapseManager
@@ -629,9 +630,26 @@ class FluidMind:
         self._orch_log       = deque(maxlen=50)
         self._total_signals  = 0
 
+        # ── Gauges para la exportación de métricas (monitoring) ───────────
+        register_gauge("memory_fragments", self.memory_mgr.store.layer_counts,
+                       "Fragmentos de memoria por capa.", label="layer")
+        register_gauge("synapses", self._gauge_synapses,
+                       "Sinapsis registradas en el SynapseManager global.")
+        register_gauge("persistence_dirty_fragments", self._gauge_dirty_fragments,
+                       "Fragmentos modificados pendientes de persistir.")
+
         log_event("FluidMind inicializada", "INFO")
 
+    def _gauge_synapses(self) -> int:
+        return len(self.synapse_mgr.synapses)
+
+    def _gauge_dirty_fragments(self) -> int:
+        return len(self.persistence._dirty_fids)
+
     # ── Proceso principal ─────────────────────────────────────────────────
+    @timed("mind.perceive")
+    @trace_span("mind.perceive")
+    @propagation_wave()
     def perceive(self, content: str,
                  tags: List[str] = None,
                  valence: float  = 0.0,
@@ -646,13 +664,14 @@ class FluidMind:
         tags = tags or content.split()[:4]
 
         # Actualizar estado emocional e instintivo
-        self.adaptive.run_cycle(
-            stimulus  = content,
-            threat    = max(0.0, -valence * arousal),
-            energy    = 0.6 + valence * 0.2,
-            novelty   = arousal * 0.5,
-            social    = 0.5,
-        )
+        with trace_span("mind.adaptive_cycle"):
+            self.adaptive.run_cycle(
+                stimulus  = content,
+                threat    = max(0.0, -valence * arousal),
+                energy    = 0.6 + valence * 0.2,
+                novelty   = arousal * 0.5,
+                social    = 0.5,
+            )
 
         # Influencia residual del Shadow sobre la señal
         residual = self.isolation.get_residual_influence()
@@ -670,8 +689,9 @@ class FluidMind:
         )
 
         # Orquestar (ajustar puentes y dominancia)
-        orch = self.orchestrator.orchestrate(
-            self.emotions, self.instincts, self.isolation)
+        with trace_span("mind.orchestrate"):
+            orch = self.orchestrator.orchestrate(
+                self.emotions, self.instincts, self.isolation)
 
         # Propagar por capas según dominancia
         layer_activations = {}
@@ -679,38 +699,45 @@ class FluidMind:
         propagation_order = self._propagation_order(dominant, signal)
 
         for layer in propagation_order:
-            # Pasar por guardián si existe
-            guardian = self.guardians.get(layer)
-            proc_signal = signal
-            guarded = False
-            if guardian:
-                proc_signal, guarded = guardian.filter(signal)
-
-            act = self.layers[layer].process_signal(proc_signal)
-            layer_activations[layer.value] = round(act, 4)
-
-            # Transmitir por puentes hacia siguientes capas
-            signal = self._route_through_bridges(signal, layer) or signal
+            with trace_span("mind.layer", layer=layer.value) as sp:
+                # Pasar por guardián si existe
+                guardian = self.guardians.get(layer)
+                proc_signal = signal
+                guarded = False
+                if guardian:
+                    proc_signal, guarded = guardian.filter(signal)
+
+                act = self.layers[layer].process_signal(proc_signal)
+                layer_activations[layer.value] = round(act, 4)
+                if sp is not None:
+                    sp.set("activation", round(act, 4))
+                    sp.set("guarded", guarded)
+
+                # Transmitir por puentes hacia siguientes capas
+                with trace_span("mind.bridges", layer=layer.value):
+                    signal = self._route_through_bridges(signal, layer) or signal
 
         # Guardar en memoria
-        fid = self.memory_mgr.encode(
-            content   = content,
-            tags      = tags,
-            modality  = modality,
-            valence   = valence_mod,
-            arousal   = arousal_mod,
-            instinct_tags = [instinct] if instinct else [],
-        )
-        if fid:
-            f = self.memory_mgr.store.get(fid)
-            if f:
-                self.persistence.notify_fragment_changed(f)
+        with trace_span("mind.memory_encode", modality=modality):
+            fid = self.memory_mgr.encode(
+                content   = content,
+                tags      = tags,
+                modality  = modality,
+                valence   = valence_mod,
+                arousal   = arousal_mod,
+                instinct_tags = [instinct] if instinct else [],
+            )
+            if fid:
+                f = self.memory_mgr.store.get(fid)
+                if f:
+                    self.persistence.notify_fragment_changed(f)
 
         # Persistencia periódica
         if self._cycle % self._n_persist == 0:
-            self.memory_mgr.decay_cycle(force=True)
-            self.memory_mgr.consolidate(force=True)
-            self.persistence.save_cycle(force=True)
+            with trace_span("mind.persistence", cycle=self._cycle):
+                self.memory_mgr.decay_cycle(force=True)
+                self.memory_mgr.consolidate(force=True)
+                self.persistence.save_cycle(force=True)
 
         result = {
             "cycle":             self._cycle,
@@ -5,15 +5,29 @@ Proporciona logging estructurado, registro de activaciones y errores.
 Compatible con neuronas animales y miceliales.
 """
 
+import atexit
+import contextvars
+import functools
+import heapq
+import itertools
+import json
+import math
+import os
+import threading
 import time
 import sys
+import weakref
+from array import array
 from collections import deque
-from threading import RLock
-from typing import Any, Dict, Optional
+from datetime import datetime
+from threading import RLock, Lock, Thread, Event
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # ─── Niveles de log ──────────────────────────────────────────────────────────
 LOG_LEVELS = {"DEBUG": 0, "INFO": 1, "WARNING": 2, "ERROR": 3, "CRITICAL": 4}
 CURRENT_LOG_LEVEL = "INFO"   # Cambia a "DEBUG" para máximo detalle
+_min_level        = LOG_LEVELS[CURRENT_LOG_LEVEL]   # caché numérica; ver set_log_level
+_DEBUG            = LOG_LEVELS["DEBUG"]
 
 # ─── Colores ANSI (se desactivan automáticamente si no hay terminal) ─────────
 _USE_COLOR = sys.stdout.isatty()
@@ -41,36 +55,420 @@ _MAX_LOG_ENTRIES       = 5000
 _MAX_ACTIVATION_ENTRIES = 2000
 _MAX_ERROR_ENTRIES     = 500
 
-_log_buffer:        deque = deque(maxlen=_MAX_LOG_ENTRIES)
-_activation_buffer: deque = deque(maxlen=_MAX_ACTIVATION_ENTRIES)
-_error_buffer:      deque = deque(maxlen=_MAX_ERROR_ENTRIES)
 _lock = RLock()
 
+# ─── Salida asíncrona ────────────────────────────────────────────────────────
+_MAX_PENDING_RECORDS = 10000   # cola de registros pendientes de escribir
+_WRITER_INTERVAL_S   = 0.05    # latencia máxima hasta que un registro sale
+
+# ─── Cardinalidad y neuronas más activas ─────────────────────────────────────
+_HLL_PRECISION = 12     # 2^12 registros (4 KiB) → error típico ≈ 1.6 %
+_TOP_K_DEFAULT = 0      # 0 = seguimiento de neuronas más activas desactivado
+
+
+class HyperLogLog:
+    """Estimador de cardinalidad de memoria constante (registros en bytearray).
+
+    Sustituye al ``set`` de neuronas vistas: ocupa ``2**precision`` bytes
+    sin importar cuántas neuronas se creen y poden durante el proceso.
+    """
+
+    __slots__ = ("p", "m", "registers", "_alpha")
+
+    def __init__(self, precision: int = _HLL_PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision debe estar entre 4 y 16")
+        self.p = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._alpha = 0.7213 / (1.0 + 1.079 / self.m)
+
+    def add(self, item: Any) -> None:
+        x = hash(item) & 0xFFFFFFFFFFFFFFFF
+        j = x & (self.m - 1)
+        w = x >> self.p
+        rank = (64 - self.p) - w.bit_length() + 1
+        if rank > self.registers[j]:
+            self.registers[j] = rank
+
+    def count(self) -> int:
+        regs  = self.registers
+        m     = self.m
+        zeros = regs.count(0)
+        est   = self._alpha * m * m / sum(2.0 ** -r for r in regs)
+        if est <= 2.5 * m and zeros:
+            est = m * math.log(m / zeros)       # corrección de rango pequeño
+        return int(round(est))
+
+    def merge(self, other: "HyperLogLog") -> None:
+        regs = self.registers
+        for j, r in enumerate(other.registers):
+            if r > regs[j]:
+                regs[j] = r
+
+    def clear(self) -> None:
+        self.registers = bytearray(self.m)
+
+    def __len__(self) -> int:
+        return self.count()
+
+
+class SpaceSavingCounter:
+    """Top-K aproximado (algoritmo Space-Saving) con ``k`` entradas como máximo.
+
+    Cada entrada guarda (conteo, error): el conteo real está en
+    ``[conteo - error, conteo]``.
+    """
+
+    __slots__ = ("k", "_counts")
+
+    def __init__(self, k: int):
+        self.k = int(k)
+        self._counts: Dict[str, List[int]] = {}
+
+    def add(self, item: str) -> None:
+        c = self._counts.get(item)
+        if c is not None:
+            c[0] += 1
+            return
+        if len(self._counts) < self.k:
+            self._counts[item] = [1, 0]
+            return
+        victim = min(self._counts, key=lambda key: self._counts[key][0])
+        floor  = self._counts.pop(victim)[0]
+        self._counts[item] = [floor + 1, floor]
+
+    def merge(self, other: "SpaceSavingCounter") -> None:
+        for key, (c, err) in other._counts.items():
+            mine = self._counts.get(key)
+            if mine is None:
+                self._counts[key] = [c, err]
+            else:
+                mine[0] += c
+                mine[1] += err
+        if len(self._counts) > self.k:
+            keep = sorted(self._counts.items(), key=lambda kv: kv[1][0], reverse=True)
+            self._counts = dict(keep[:self.k])
+
+    def top(self, n: int = 10) -> List[Tuple[str, int, int]]:
+        items = sorted(self._counts.items(), key=lambda kv: kv[1][0], reverse=True)
+        return [(key, c, err) for key, (c, err) in items[:n]]
+
+    def clear(self) -> None:
+        self._counts.clear()
+
+
 # ─── Estadísticas globales ───────────────────────────────────────────────────
+# Los contadores viven en los buffers de cada hilo; aquí solo configuración.
 _stats: Dict[str, Any] = {
-    "total_events":      0,
-    "total_activations": 0,
-    "total_errors":      0,
-    "total_warnings":    0,
-    "neurons_seen":      set(),
-    "start_time":        time.time(),
+    "top_k":      _TOP_K_DEFAULT,
+    "start_time": time.time(),
 }
 
 
+# ════════════════════════════════════════════════════════════════════════════════
+#  BUFFERS POR HILO
+# ════════════════════════════════════════════════════════════════════════════════
+
+_EV, _ACT, _ERR, _WARN = range(4)   # índices de _ThreadBuffers.counts
+
+
+class _ThreadBuffers:
+    """Ring buffers y contadores de un solo hilo: se escriben sin lock."""
+
+    __slots__ = ("log", "activations", "errors", "counts", "neurons_seen", "top")
+
+    def __init__(self):
+        self.log          = deque(maxlen=_MAX_LOG_ENTRIES)
+        self.activations  = deque(maxlen=_MAX_ACTIVATION_ENTRIES)
+        self.errors       = deque(maxlen=_MAX_ERROR_ENTRIES)
+        self.counts       = [0, 0, 0, 0]
+        self.neurons_seen = HyperLogLog()
+        self.top: Optional[SpaceSavingCounter] = None
+
+    def absorb(self, other: "_ThreadBuffers") -> None:
+        # Fusión por ts: _merged exige que cada buffer esté ordenado
+        for attr in ("log", "activations", "errors"):
+            mine = getattr(self, attr)
+            setattr(self, attr, deque(heapq.merge(mine, getattr(other, attr), key=_entry_ts),
+                                      maxlen=mine.maxlen))
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.neurons_seen.merge(other.neurons_seen)
+        if other.top is not None:
+            if self.top is None:
+                self.top = SpaceSavingCounter(other.top.k)
+            self.top.merge(other.top)
+
+    def clear(self) -> None:
+        self.log.clear()
+        self.activations.clear()
+        self.errors.clear()
+        self.counts[:] = [0, 0, 0, 0]
+        self.neurons_seen.clear()
+        if self.top is not None:
+            self.top.clear()
+
+
+class _BufferOwner:
+    """Vive en el threading.local del hilo; al morir el hilo retira sus buffers."""
+    __slots__ = ("buffers", "__weakref__")
+
+
+_local          = threading.local()
+_registry_lock  = Lock()
+_live_buffers:  Dict[int, _ThreadBuffers] = {}   # registro débil: se vacía con cada hilo
+_retired        = _ThreadBuffers()                # datos de hilos ya terminados
+
+
+def _retire_buffers(key: int) -> None:
+    with _registry_lock:
+        tb = _live_buffers.pop(key, None)
+        if tb is not None:
+            _retired.absorb(tb)
+
+
+def _thread_buffers() -> _ThreadBuffers:
+    try:
+        return _local.owner.buffers
+    except AttributeError:
+        owner = _BufferOwner()
+        owner.buffers = tb = _ThreadBuffers()
+        key = id(owner)
+        with _registry_lock:
+            _live_buffers[key] = tb
+        weakref.finalize(owner, _retire_buffers, key)
+        _local.owner = owner
+        return tb
+
+
+def _entry_ts(entry: Dict[str, Any]) -> float:
+    return entry["ts"]
+
+
+def _all_buffers() -> List[_ThreadBuffers]:
+    with _registry_lock:
+        return list(_live_buffers.values()) + [_retired]
+
+
+def _merged(attr: str) -> List[Dict[str, Any]]:
+    """Fusiona por timestamp el buffer ``attr`` de todos los hilos."""
+    with _registry_lock:
+        live    = list(_live_buffers.values())
+        retired = list(getattr(_retired, attr))   # absorb lo reemplaza bajo el lock
+    per_thread = [list(getattr(tb, attr)) for tb in live] + [retired]
+    return list(heapq.merge(*per_thread, key=_entry_ts))
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+#  SALIDA ASÍNCRONA DE LOGS
+# ════════════════════════════════════════════════════════════════════════════════
+
+class LogSink:
+    """Destino de líneas de log. Las subclases implementan ``write``.
+
+    ``write`` recibe lotes de (línea, nivel) desde el hilo escritor; nunca
+    se llama desde los hilos de neuronas, sinapsis o memoria.
+    """
+
+    def write(self, records: List[Tuple[str, str]]) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+
+class StdoutSink(LogSink):
+    """Escribe en ``sys.stdout`` (resuelto en cada lote), con color si es TTY."""
+
+    def write(self, records: List[Tuple[str, str]]) -> None:
+        out = sys.stdout
+        out.write("".join(_color(line, level) + "\n" for line, level in records))
+
+    def flush(self) -> None:
+        try:
+            sys.stdout.flush()
+        except Exception:
+            pass
+
+
+class RotatingFileSink(LogSink):
+    """Archivo de log con rotación por tamaño (``path``, ``path.1`` … ``path.N``)."""
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 5):
+        self.path         = str(path)
+        self.max_bytes    = int(max_bytes)
+        self.backup_count = int(backup_count)
+        parent = os.path.dirname(self.path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def write(self, records: List[Tuple[str, str]]) -> None:
+        self._fh.write("".join(line + "\n" for line, _ in records))
+        if self.max_bytes > 0 and self._fh.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        self._fh.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class MemorySink(LogSink):
+    """Guarda las últimas ``maxlen`` líneas en memoria (tests, diagnóstico)."""
+
+    def __init__(self, maxlen: int = 10000):
+        self.lines: deque = deque(maxlen=maxlen)
+
+    def write(self, records: List[Tuple[str, str]]) -> None:
+        self.lines.extend(line for line, _ in records)
+
+
+# Cola acotada: deque.append/popleft son atómicos, sin lock en la escritura.
+# Con la cola llena, append descarta el registro más antiguo.
+_pending: deque = deque(maxlen=_MAX_PENDING_RECORDS)
+_dropped_records = 0
+_sink: LogSink   = StdoutSink()
+_drain_lock      = Lock()
+_writer_thread: Optional[Thread] = None
+_writer_wake     = Event()
+_writer_stop     = Event()
+
+
+def _enqueue(kind: str, entry: Dict[str, Any]) -> None:
+    """Encola un registro para el hilo escritor (drop-oldest si está lleno)."""
+    global _dropped_records
+    if len(_pending) >= _MAX_PENDING_RECORDS:
+        _dropped_records += 1
+    _pending.append((kind, entry))
+    if _writer_thread is None:
+        _start_writer()
+
+
+def _start_writer() -> None:
+    global _writer_thread
+    with _lock:
+        if _writer_thread is not None and _writer_thread.is_alive():
+            return
+        _writer_stop.clear()
+        _writer_thread = Thread(target=_writer_loop, daemon=True,
+                                name="MonitoringLogWriter")
+        _writer_thread.start()
+
+
+def _writer_loop() -> None:
+    while not _writer_stop.is_set():
+        _writer_wake.wait(_WRITER_INTERVAL_S)
+        _writer_wake.clear()
+        _drain()
+
+
+def _drain() -> None:
+    """Vacía la cola hacia el sink actual."""
+    with _drain_lock:
+        records = []
+        popleft = _pending.popleft
+        try:
+            while True:
+                records.append(_format_record(*popleft()))
+        except IndexError:
+            pass
+        if records:
+            try:
+                _sink.write(records)
+            except Exception as e:
+                sys.stderr.write(f"[monitoring] fallo del sink de logs: {e}\n")
+
+
+def flush() -> None:
+    """Escribe todo lo pendiente y vacía el sink. Llamar al apagar."""
+    _drain()
+    with _drain_lock:
+        try:
+            _sink.flush()
+        except Exception:
+            pass
+
+
+def set_log_sink(sink: LogSink) -> LogSink:
+    """Sustituye el destino de los logs. Retorna el anterior (sin cerrarlo)."""
+    global _sink
+    if not isinstance(sink, LogSink):
+        raise TypeError("sink debe ser una instancia de LogSink")
+    flush()
+    with _drain_lock:
+        previous, _sink = _sink, sink
+    return previous
+
+
+def get_log_sink() -> LogSink:
+    return _sink
+
+
+def _shutdown_writer() -> None:
+    _writer_stop.set()
+    _writer_wake.set()
+    flush()
+
+
+atexit.register(_shutdown_writer)
+
+
 # ════════════════════════════════════════════════════════════════════════════════
 #  FUNCIONES PRINCIPALES
 # ════════════════════════════════════════════════════════════════════════════════
 
-def log_event(message: str, level: str = "INFO", neuron_id: str = "") -> None:
+def is_enabled(level: str) -> bool:
+    """True si un evento de ``level`` se registraría con el nivel actual.
+
+    Para guardar bloques caros en el camino caliente:
+
+        if is_enabled("DEBUG"):
+            log_event(f"... {costoso()} ...", "DEBUG")
+    """
+    return LOG_LEVELS.get(level, 0) >= _min_level
+
+
+def log_event(message: Union[str, Callable[[], str]], level: str = "INFO",
+              neuron_id: str = "", args: Tuple = ()) -> None:
     """Registra un evento genérico del sistema.
 
+    El texto solo se construye si el nivel está activo: ``message`` puede ser
+    un callable sin argumentos o una plantilla %-style con ``args``.
+
+        log_event("Sinapsis %s → %s", "DEBUG", args=(sid, dst))
+        log_event(lambda: f"Estado {snapshot()}", "DEBUG")
+
     Args:
-        message:   Texto del evento.
+        message:   Texto del evento, plantilla % o callable que lo retorna.
         level:     Nivel de severidad (DEBUG, INFO, WARNING, ERROR, CRITICAL).
         neuron_id: ID opcional de la neurona que genera el evento.
+        args:      Argumentos para la plantilla %-style.
     """
-    if LOG_LEVELS.get(level, 0) < LOG_LEVELS.get(CURRENT_LOG_LEVEL, 1):
+    if LOG_LEVELS.get(level, 0) < _min_level:
         return
+    if callable(message):
+        message = message()
+    elif args:
+        message = message % args
 
     entry = {
         "ts":        time.time(),
@@ -79,17 +477,13 @@ def log_event(message: str, level: str = "INFO", neuron_id: str = "") -> None:
         "message":   message,
     }
 
-    with _lock:
-        _log_buffer.append(entry)
-        _stats["total_events"] += 1
-        if level == "WARNING":
-            _stats["total_warnings"] += 1
+    tb = _thread_buffers()
+    tb.log.append(entry)
+    tb.counts[_EV] += 1
+    if level == "WARNING":
+        tb.counts[_WARN] += 1
 
-    ts_str     = _fmt_ts(entry["ts"])
-    prefix     = f"[{level:<8}]"
-    nid_str    = f" ({neuron_id})" if neuron_id else ""
-    line       = f"{ts_str} {prefix}{nid_str} {message}"
-    print(_color(line, level))
+    _enqueue("event", entry)
 
 
 def log_neuron_activation(
@@ -109,7 +503,7 @@ def log_neuron_activation(
         efficiency:       Score de eficiencia actual.
     """
     entry = {
-        "ts":               time.time(),
+        "ts":               wave_time(),
         "neuron_id":        neuron_id,
         "activation_level": activation_level,
         "plasticity":       plasticity,
@@ -117,20 +511,19 @@ def log_neuron_activation(
         "efficiency":       efficiency,
     }
 
-    with _lock:
-        _activation_buffer.append(entry)
-        _stats["total_activations"] += 1
-        _stats["neurons_seen"].add(neuron_id)
-
-    if LOG_LEVELS.get(CURRENT_LOG_LEVEL, 1) <= LOG_LEVELS["DEBUG"]:
-        ts_str = _fmt_ts(entry["ts"])
-        bar    = _activation_bar(activation_level)
-        line   = (
-            f"{ts_str} [ACTIVATION] ({neuron_id}) "
-            f"act={activation_level:.3f} {bar} "
-            f"plas={plasticity:.3f} imp={impact:.3f} eff={efficiency:.3f}"
-        )
-        print(_color(line, "DEBUG"))
+    tb = _thread_buffers()
+    tb.activations.append(entry)
+    tb.counts[_ACT] += 1
+    tb.neurons_seen.add(neuron_id)
+    k = _stats["top_k"]
+    if k:
+        top = tb.top
+        if top is None or top.k != k:
+            top = tb.top = SpaceSavingCounter(k)
+        top.add(neuron_id)
+
+    if _min_level <= _DEBUG:
+        _enqueue("activation", entry)
 
 
 def log_neuron_error(neuron_id: str, error_message: str) -> None:
@@ -146,15 +539,11 @@ def log_neuron_error(neuron_id: str, error_message: str) -> None:
         "message":   error_message,
     }
 
-    with _lock:
-        _error_buffer.append(entry)
-        _stats["total_errors"] += 1
+    tb = _thread_buffers()
+    tb.errors.append(entry)
+    tb.counts[_ERR] += 1
 
-    ts_str = _fmt_ts(entry["ts"])
-    # Truncar mensajes muy largos en consola
-    short_msg = error_message.split("\n")[0][:200]
-    line = f"{ts_str} [ERROR   ] ({neuron_id}) {short_msg}"
-    print(_color(line, "ERROR"))
+    _enqueue("error", entry)
 
 
 def log_neuron_warning(neuron_id: str, warning_message: str) -> None:
@@ -167,62 +556,385 @@ def log_neuron_warning(neuron_id: str, warning_message: str) -> None:
     log_event(warning_message, level="WARNING", neuron_id=neuron_id)
 
 
+# ════════════════════════════════════════════════════════════════════════════════
+#  RELOJ DE CICLO
+# ════════════════════════════════════════════════════════════════════════════════
+#
+#  Una onda de propagación toca cientos de neuronas y sinapsis; cada una leía
+#  el reloj por su cuenta. Dentro de ``propagation_wave`` el reloj se muestrea
+#  una sola vez por hilo y todos los registros comparten ese instante. Fuera
+#  de una onda, wave_time()/wave_ns() leen el reloj como siempre.
+#  Los registros guardan epoch float; el formato ISO se aplica al exportar
+#  (``iso_timestamp``).
+
+class _WaveState(threading.local):
+    wall    = 0.0    # time.time() de la onda activa (0 = sin onda)
+    mono_ns = 0      # time.monotonic_ns() de la onda activa
+    depth   = 0
+
+
+_wave = _WaveState()
+_monotonic_ns = time.monotonic_ns
+
+
+def wave_time() -> float:
+    """Epoch (s) de la onda en curso, o time.time() si no hay onda."""
+    w = _wave.wall
+    return w if w else time.time()
+
+
+def wave_ns() -> int:
+    """Reloj monotónico (ns) de la onda en curso; usar solo para duraciones."""
+    m = _wave.mono_ns
+    return m if m else _monotonic_ns()
+
+
+def current_wave() -> Optional[Tuple[float, int]]:
+    """(wall, mono_ns) de la onda activa, para heredarla en otro hilo."""
+    st = _wave
+    return (st.wall, st.mono_ns) if st.depth else None
+
+
+class propagation_wave:
+    """Fija el reloj del hilo durante una onda; context manager o decorador.
+
+    Las ondas anidadas reutilizan el instante de la exterior. ``inherit``
+    adopta la onda de otro hilo (ver ``current_wave``).
+    """
+
+    __slots__ = ("_inherit",)
+
+    def __init__(self, inherit: Optional[Tuple[float, int]] = None):
+        self._inherit = inherit
+
+    def __enter__(self) -> float:
+        st = _wave
+        if not st.depth:
+            if self._inherit is not None:
+                st.wall, st.mono_ns = self._inherit
+            else:
+                st.wall, st.mono_ns = time.time(), _monotonic_ns()
+        st.depth += 1
+        return st.wall
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        st = _wave
+        st.depth -= 1
+        if not st.depth:
+            st.wall, st.mono_ns = 0.0, 0
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with propagation_wave():
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def iso_timestamp(ts: float) -> str:
+    """Epoch → ISO 8601 local; para exportación, no para el camino caliente."""
+    return datetime.fromtimestamp(ts).isoformat()
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+#  HISTOGRAMAS DE LATENCIA Y TEMPORIZADORES DE ETAPA
+# ════════════════════════════════════════════════════════════════════════════════
+
+# Cubos logarítmicos estilo HDR: 8 sub-cubos por potencia de dos (~12 % de
+# error relativo) desde 1 ns hasta ~2^40 ns (≈18 min) en 320 contadores.
+_HIST_SUB_BITS = 4
+_HIST_HALF     = 1 << (_HIST_SUB_BITS - 1)
+_HIST_BUCKETS  = 320
+
+
+def _hist_index(ns: int) -> int:
+    if ns < (1 << _HIST_SUB_BITS):
+        return ns if ns > 0 else 0
+    e = ns.bit_length() - _HIST_SUB_BITS
+    i = e * _HIST_HALF + (ns >> e)
+    return i if i < _HIST_BUCKETS else _HIST_BUCKETS - 1
+
+
+def _hist_value(i: int) -> float:
+    """Valor representativo (punto medio) del cubo i, en ns."""
+    if i < (1 << _HIST_SUB_BITS):
+        return float(i)
+    e = i // _HIST_HALF - 1
+    m = i - e * _HIST_HALF
+    return ((m << e) + ((m + 1) << e)) / 2.0
+
+
+class LatencyHistogram:
+    """Histograma de latencias en ns con cubos logarítmicos en un ``array``.
+
+    ``record`` no toma locks: cada hilo escribe en su propio histograma
+    (ver ``timed``) y la lectura los fusiona con ``merge``.
+    """
+
+    __slots__ = ("counts", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts   = array("Q", bytes(8 * _HIST_BUCKETS))
+        self.total_ns = 0
+        self.max_ns   = 0
+
+    def record(self, ns: int) -> None:
+        # _hist_index en línea: es la ruta caliente
+        if ns < 16:
+            i = ns if ns > 0 else 0
+        else:
+            e = ns.bit_length() - _HIST_SUB_BITS
+            i = (e << 3) + (ns >> e)
+            if i >= _HIST_BUCKETS:
+                i = _HIST_BUCKETS - 1
+        self.counts[i] += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        counts = self.counts
+        for i, c in enumerate(other.counts):
+            if c:
+                counts[i] += c
+        self.total_ns += other.total_ns
+        if other.max_ns > self.max_ns:
+            self.max_ns = other.max_ns
+
+    def percentile(self, q: float) -> float:
+        """Percentil q (0–1) en ns."""
+        n = self.count
+        if not n:
+            return 0.0
+        target = max(1, int(q * n + 0.5))
+        acc = 0
+        for i, c in enumerate(self.counts):
+            acc += c
+            if acc >= target:
+                return min(_hist_value(i), float(self.max_ns))
+        return float(self.max_ns)
+
+    def summary(self) -> Dict[str, float]:
+        n = self.count
+        return {
+            "count":   n,
+            "mean_us": (self.total_ns / n / 1000.0) if n else 0.0,
+            "p50_us":  self.percentile(0.50) / 1000.0,
+            "p90_us":  self.percentile(0.90) / 1000.0,
+            "p99_us":  self.percentile(0.99) / 1000.0,
+            "max_us":  self.max_ns / 1000.0,
+        }
+
+
+# Histogramas por hilo: stage → LatencyHistogram. El registro guarda una
+# referencia a cada dict para fusionarlos en la lectura.
+_timing_local    = threading.local()
+_timing_registry: List[Dict[str, LatencyHistogram]] = []
+_timing_lock     = Lock()
+_perf_ns         = time.perf_counter_ns
+
+
+def _thread_histograms() -> Dict[str, LatencyHistogram]:
+    try:
+        return _timing_local.hists
+    except AttributeError:
+        hists: Dict[str, LatencyHistogram] = {}
+        _timing_local.hists = hists
+        with _timing_lock:
+            _timing_registry.append(hists)
+        return hists
+
+
+def _stage_histogram(stage: str) -> LatencyHistogram:
+    hists = _thread_histograms()
+    h = hists.get(stage)
+    if h is None:
+        h = hists[stage] = LatencyHistogram()
+    return h
+
+
+def record_latency(stage: str, ns: int) -> None:
+    """Añade una muestra de ``ns`` nanosegundos a la etapa ``stage``."""
+    try:
+        h = _timing_local.hists[stage]
+    except (AttributeError, KeyError):
+        h = _stage_histogram(stage)
+    h.record(ns)
+
+
+class timed:
+    """Mide la duración de una etapa; sirve como context manager o decorador.
+
+        with timed("memory.recall"):
+            ...
+
+        @timed("mind.perceive")
+        def perceive(...): ...
+    """
+
+    __slots__ = ("stage", "_t0")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._t0   = 0
+
+    def __enter__(self) -> "timed":
+        if _profile_requests:
+            profiling_checkpoint()
+        self._t0 = _perf_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        ns = _perf_ns() - self._t0
+        try:
+            h = _timing_local.hists[self.stage]
+        except (AttributeError, KeyError):
+            h = _stage_histogram(self.stage)
+        h.record(ns)
+        if _profile_requests:
+            profiling_checkpoint()
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        stage = self.stage
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _profile_requests:
+                profiling_checkpoint()
+            t0 = _perf_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                ns = _perf_ns() - t0
+                try:
+                    h = _timing_local.hists[stage]
+                except (AttributeError, KeyError):
+                    h = _stage_histogram(stage)
+                h.record(ns)
+                if _profile_requests:
+                    profiling_checkpoint()
+        return wrapper
+
+
+def get_latency_histograms() -> Dict[str, LatencyHistogram]:
+    """Fusiona los histogramas de todos los hilos (coste solo en la lectura)."""
+    with _timing_lock:
+        per_thread = list(_timing_registry)
+    merged: Dict[str, LatencyHistogram] = {}
+    for hists in per_thread:
+        for stage, h in list(hists.items()):
+            m = merged.get(stage)
+            if m is None:
+                m = merged[stage] = LatencyHistogram()
+            m.merge(h)
+    return merged
+
+
+def get_latency_stats(stage: str = "") -> Dict[str, Dict[str, float]]:
+    """Resumen p50/p90/p99/max por etapa (o solo de ``stage``)."""
+    merged = get_latency_histograms()
+    if stage:
+        merged = {stage: merged[stage]} if stage in merged else {}
+    return {k: h.summary() for k, h in sorted(merged.items())}
+
+
+def _reset_latency() -> None:
+    with _timing_lock:
+        for hists in _timing_registry:
+            hists.clear()
+
+
 # ════════════════════════════════════════════════════════════════════════════════
 #  CONSULTAS Y ESTADÍSTICAS
 # ════════════════════════════════════════════════════════════════════════════════
 
 def get_stats() -> Dict[str, Any]:
-    """Retorna estadísticas globales del sistema de monitoreo."""
+    """Retorna estadísticas globales del sistema de monitoreo.
+
+    Suma los contadores de todos los hilos en el momento de la consulta.
+    """
+    buffers = _all_buffers()
+    counts  = [0, 0, 0, 0]
+    seen    = HyperLogLog()
+    for tb in buffers:
+        for i, c in enumerate(tb.counts):
+            counts[i] += c
+        seen.merge(tb.neurons_seen)
+    uptime = time.time() - _stats["start_time"]
+    return {
+        "uptime_s":          round(uptime, 2),
+        "total_events":      counts[_EV],
+        "total_activations": counts[_ACT],
+        "total_errors":      counts[_ERR],
+        "total_warnings":    counts[_WARN],
+        "unique_neurons":    seen.count(),
+        "log_buffer_size":   sum(len(tb.log) for tb in buffers),
+        "error_buffer_size": sum(len(tb.errors) for tb in buffers),
+        "pending_records":   len(_pending),
+        "dropped_records":   _dropped_records,
+    }
+
+
+def set_top_neurons_tracking(k: int) -> None:
+    """Activa (k > 0) o desactiva (k = 0) el top-K de neuronas más activas."""
+    k = max(0, int(k))
     with _lock:
-        uptime = time.time() - _stats["start_time"]
-        return {
-            "uptime_s":          round(uptime, 2),
-            "total_events":      _stats["total_events"],
-            "total_activations": _stats["total_activations"],
-            "total_errors":      _stats["total_errors"],
-            "total_warnings":    _stats["total_warnings"],
-            "unique_neurons":    len(_stats["neurons_seen"]),
-            "log_buffer_size":   len(_log_buffer),
-            "error_buffer_size": len(_error_buffer),
-        }
+        _stats["top_k"] = k
+    if not k:
+        for tb in _all_buffers():
+            tb.top = None
+
+
+def get_top_neurons(n: int = 10) -> List[Tuple[str, int, int]]:
+    """Neuronas con más activaciones: [(neuron_id, conteo, error_máximo)]."""
+    k = _stats["top_k"]
+    if not k:
+        return []
+    merged = SpaceSavingCounter(k)
+    for tb in _all_buffers():
+        if tb.top is not None:
+            merged.merge(tb.top)
+    return merged.top(n)
 
 
 def get_recent_errors(n: int = 10) -> list:
     """Retorna los últimos n errores registrados."""
-    with _lock:
-        return list(_error_buffer)[-n:]
+    return _merged("errors")[-n:]
 
 
 def get_recent_activations(neuron_id: str = "", n: int = 20) -> list:
     """Retorna las últimas n activaciones, opcionalmente filtradas por neurona."""
-    with _lock:
-        entries = list(_activation_buffer)
-        if neuron_id:
-            entries = [e for e in entries if e["neuron_id"] == neuron_id]
-        return entries[-n:]
+    entries = _merged("activations")
+    if neuron_id:
+        entries = [e for e in entries if e["neuron_id"] == neuron_id]
+    return entries[-n:]
 
 
 def get_recent_events(level: str = "", n: int = 20) -> list:
     """Retorna los últimos n eventos, opcionalmente filtrados por nivel."""
-    with _lock:
-        entries = list(_log_buffer)
-        if level:
-            entries = [e for e in entries if e["level"] == level]
-        return entries[-n:]
+    entries = _merged("log")
+    if level:
+        entries = [e for e in entries if e["level"] == level]
+    return entries[-n:]
 
 
 def reset() -> None:
     """Limpia todos los buffers y reinicia estadísticas."""
+    global _dropped_records
+    flush()
     with _lock:
-        _log_buffer.clear()
-        _activation_buffer.clear()
-        _error_buffer.clear()
-        _stats["total_events"]      = 0
-        _stats["total_activations"] = 0
-        _stats["total_errors"]      = 0
-        _stats["total_warnings"]    = 0
-        _stats["neurons_seen"]      = set()
-        _stats["start_time"]        = time.time()
+        _dropped_records = 0
+        _stats["start_time"] = time.time()
+    for tb in _all_buffers():
+        tb.clear()
+    _reset_latency()
+    _span_buffer.clear()
 
 
 def set_log_level(level: str) -> None:
@@ -231,14 +943,61 @@ def set_log_level(level: str) -> None:
     Args:
         level: Uno de DEBUG, INFO, WARNING, ERROR, CRITICAL.
     """
-    global CURRENT_LOG_LEVEL
+    global CURRENT_LOG_LEVEL, _min_level
     if level not in LOG_LEVELS:
         raise ValueError(f"Nivel inválido '{level}'. Opciones: {list(LOG_LEVELS.keys())}")
     CURRENT_LOG_LEVEL = level
+    _min_level        = LOG_LEVELS[level]
+
+
+def benchmark_disabled_logging(n: int = 200_000) -> Dict[str, float]:
+    """Coste por llamada (ns) de un log_event DEBUG descartado, por estilo.
+
+    Se mide con el nivel fijado temporalmente en INFO.
+    """
+    prev = CURRENT_LOG_LEVEL
+    set_log_level("INFO")
+    sid, kind, src, dst = "syn_000042", "electrical", "n_1", "n_2"
+
+    def eager():
+        for _ in range(n):
+            log_event(f"Sinapsis {sid} ({kind}) {src}→{dst}", "DEBUG")
+
+    def percent():
+        for _ in range(n):
+            log_event("Sinapsis %s (%s) %s→%s", "DEBUG", args=(sid, kind, src, dst))
+
+    def lazy():
+        for _ in range(n):
+            log_event(lambda: f"Sinapsis {sid} ({kind}) {src}→{dst}", "DEBUG")
+
+    def guarded():
+        for _ in range(n):
+            if is_enabled("DEBUG"):
+                log_event(f"Sinapsis {sid} ({kind}) {src}→{dst}", "DEBUG")
+
+    def baseline():
+        for _ in range(n):
+            pass
+
+    results: Dict[str, float] = {}
+    try:
+        for name, fn in (("baseline", baseline), ("eager_fstring", eager),
+                         ("percent_args", percent), ("lazy_callable", lazy),
+                         ("is_enabled_guard", guarded)):
+            t0 = _perf_ns()
+            fn()
+            results[name] = (_perf_ns() - t0) / n
+        base = results.pop("baseline")
+        results = {k: round(v - base, 1) for k, v in results.items()}
+    finally:
+        set_log_level(prev)
+    return results
 
 
 def print_summary() -> None:
     """Imprime un resumen del estado del sistema de monitoreo."""
+    flush()
     s = get_stats()
     sep = "─" * 50
     print(f"\n{sep}")
@@ -253,6 +1012,13 @@ def print_summary() -> None:
     print(f"  Nivel de log:       {CURRENT_LOG_LEVEL}")
     print(sep)
 
+    timings = get_latency_stats()
+    if timings:
+        print("\n  Latencias por etapa (µs):")
+        for stage, t in timings.items():
+            print(f"    {stage:<28} n={t['count']:<7} p50={t['p50_us']:>9.1f} "
+                  f"p99={t['p99_us']:>9.1f} max={t['max_us']:>9.1f}")
+
     if s["total_errors"] > 0:
         print("\n  Últimos errores:")
         for e in get_recent_errors(3):
@@ -261,6 +1027,682 @@ def print_summary() -> None:
     print()
 
 
+# ════════════════════════════════════════════════════════════════════════════════
+#  EXPORTACIÓN DE MÉTRICAS (formato de texto Prometheus / textfile collector)
+# ════════════════════════════════════════════════════════════════════════════════
+
+_METRIC_PREFIX = "eva_"
+
+# nombre → (callable o WeakMethod, ayuda, etiqueta)
+_gauges: Dict[str, Tuple[Any, str, str]] = {}
+_export_thread: Optional[Thread] = None
+_export_stop   = Event()
+
+
+def register_gauge(name: str, fn: Callable[[], Any],
+                   help_text: str = "", label: str = "") -> None:
+    """Registra un gauge que se evalúa en cada exportación.
+
+    Args:
+        name:      nombre de la métrica (se le antepone ``eva_``).
+        fn:        callable sin argumentos. Retorna un número, o un dict
+                   {valor_de_etiqueta: número} si se indica ``label``.
+                   Los métodos ligados se guardan como referencia débil.
+        help_text: descripción para la línea ``# HELP``.
+        label:     nombre de la etiqueta cuando fn retorna un dict.
+    """
+    ref = weakref.WeakMethod(fn) if hasattr(fn, "__self__") else fn
+    with _lock:
+        _gauges[name] = (ref, help_text, label)
+
+
+def unregister_gauge(name: str) -> None:
+    with _lock:
+        _gauges.pop(name, None)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _metric_block(lines: List[str], name: str, mtype: str, help_text: str) -> str:
+    full = _METRIC_PREFIX + name
+    lines.append(f"# HELP {full} {help_text}")
+    lines.append(f"# TYPE {full} {mtype}")
+    return full
+
+
+def render_metrics() -> str:
+    """Instantánea de contadores, gauges y latencias en formato Prometheus."""
+    lines: List[str] = []
+    s = get_stats()
+
+    for key, help_text in (
+        ("total_events",      "Eventos de log registrados."),
+        ("total_activations", "Activaciones neuronales registradas."),
+        ("total_errors",      "Errores neuronales registrados."),
+        ("total_warnings",    "Advertencias registradas."),
+        ("dropped_records",   "Registros de log descartados por cola llena."),
+    ):
+        full = _metric_block(lines, key.replace("total_", "") + "_total", "counter", help_text)
+        lines.append(f"{full} {s[key]}")
+
+    for key, help_text in (
+        ("uptime_s",        "Segundos desde el último reset del monitoreo."),
+        ("unique_neurons",  "Neuronas distintas activadas (estimación HyperLogLog)."),
+        ("pending_records", "Registros de log pendientes de escribir."),
+    ):
+        full = _metric_block(lines, key, "gauge", help_text)
+        lines.append(f"{full} {s[key]}")
+
+    with _lock:
+        gauges = list(_gauges.items())
+    for name, (ref, help_text, label) in gauges:
+        fn = ref() if isinstance(ref, weakref.WeakMethod) else ref
+        if fn is None:
+            unregister_gauge(name)
+            continue
+        try:
+            value = fn()
+        except Exception as e:
+            log_event(f"Gauge {name} falló: {e}", "WARNING")
+            continue
+        full = _metric_block(lines, name, "gauge", help_text or name)
+        if isinstance(value, dict):
+            lab = label or "key"
+            for k, v in sorted(value.items(), key=lambda kv: str(kv[0])):
+                lines.append(f'{full}{{{lab}="{_escape_label(k)}"}} {float(v)}')
+        else:
+            lines.append(f"{full} {float(value)}")
+
+    hists = get_latency_histograms()
+    if hists:
+        full = _metric_block(lines, "stage_latency_seconds", "summary",
+                             "Duración por etapa (timed).")
+        for stage, h in sorted(hists.items()):
+            st = _escape_label(stage)
+            for q in (0.5, 0.9, 0.99):
+                lines.append(f'{full}{{stage="{st}",quantile="{q}"}} {h.percentile(q) / 1e9:.9f}')
+            lines.append(f'{full}_sum{{stage="{st}"}} {h.total_ns / 1e9:.9f}')
+            lines.append(f'{full}_count{{stage="{st}"}} {h.count}')
+
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path: str) -> None:
+    """Escribe la instantánea de forma atómica (tmp en el mismo dir + rename)."""
+    text   = render_metrics()
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    os.replace(tmp, path)
+
+
+def start_metrics_export(path: str, interval_s: float = 5.0) -> None:
+    """Exporta periódicamente a ``path`` (p. ej. el directorio del textfile
+    collector de node-exporter) desde un hilo en segundo plano."""
+    global _export_thread
+    stop_metrics_export()
+    _export_stop.clear()
+
+    def _loop():
+        while not _export_stop.wait(interval_s):
+            try:
+                write_metrics_file(path)
+            except Exception as e:
+                log_event(f"Exportación de métricas falló: {e}", "WARNING")
+
+    _export_thread = Thread(target=_loop, daemon=True, name="MonitoringMetricsExport")
+    _export_thread.start()
+
+
+def stop_metrics_export() -> None:
+    global _export_thread
+    _export_stop.set()
+    if _export_thread is not None:
+        _export_thread.join(timeout=5.0)
+        _export_thread = None
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+#  TRAZAS (spans correlacionados, exportables como Chrome trace-event JSON)
+# ════════════════════════════════════════════════════════════════════════════════
+#
+#  El span activo viaja en un ContextVar: los spans anidados heredan trace_id y
+#  toman como padre al span que los envuelve. Los hilos nuevos no heredan el
+#  contexto; para correlacionarlos hay que lanzarlos con
+#  ``contextvars.copy_context().run``.
+
+TRACE_BUFFER_SIZE = 4096
+
+_tracing_enabled = True
+_span_buffer: deque = deque(maxlen=TRACE_BUFFER_SIZE)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("eva_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """Intervalo con nombre dentro de una traza."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id",
+                 "start_ns", "end_ns", "thread_id", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: int,
+                 attributes: Dict[str, Any]):
+        self.name       = name
+        self.trace_id   = trace_id
+        self.span_id    = next(_span_ids)
+        self.parent_id  = parent_id
+        self.start_ns   = time.monotonic_ns()
+        self.end_ns     = 0
+        self.thread_id  = threading.get_ident()
+        self.attributes = attributes
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ns(self) -> int:
+        return (self.end_ns or time.monotonic_ns()) - self.start_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name, "trace_id": self.trace_id,
+            "span_id": self.span_id, "parent_id": self.parent_id,
+            "start_ns": self.start_ns, "end_ns": self.end_ns,
+            "thread_id": self.thread_id, "attributes": dict(self.attributes),
+        }
+
+
+class trace_span:
+    """Abre un span; sirve como context manager o decorador.
+
+        with trace_span("mind.layer", layer="focal") as sp:
+            sp.set("activation", act)
+
+        @trace_span("mind.perceive")
+        def perceive(...): ...
+
+    Con el trazado desactivado no crea nada y ``as sp`` recibe None.
+    """
+
+    __slots__ = ("name", "attributes", "_span", "_token")
+
+    def __init__(self, name: str, **attributes: Any):
+        self.name       = name
+        self.attributes = attributes
+        self._span      = None
+        self._token     = None
+
+    def __enter__(self) -> Optional[Span]:
+        if not _tracing_enabled:
+            return None
+        parent = _current_span.get()
+        if parent is None:
+            sp = Span(self.name, os.urandom(8).hex(), 0, dict(self.attributes))
+        else:
+            sp = Span(self.name, parent.trace_id, parent.span_id, dict(self.attributes))
+        self._span  = sp
+        self._token = _current_span.set(sp)
+        return sp
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        sp = self._span
+        if sp is None:
+            return False
+        sp.end_ns = time.monotonic_ns()
+        if exc_type is not None:
+            sp.attributes["error"] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._span = self._token = None
+        _span_buffer.append(sp)
+        return False
+
+    def __call__(self, fn: Callable) -> Callable:
+        name, attributes = self.name, self.attributes
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _tracing_enabled:
+                return fn(*args, **kwargs)
+            with trace_span(name, **attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def set_tracing(enabled: bool, buffer_size: int = 0) -> None:
+    """Activa o desactiva el trazado; ``buffer_size`` redimensiona el anillo."""
+    global _tracing_enabled, _span_buffer
+    _tracing_enabled = bool(enabled)
+    if buffer_size and buffer_size != _span_buffer.maxlen:
+        _span_buffer = deque(_span_buffer, maxlen=buffer_size)
+
+
+def get_spans(trace_id: str = "", n: int = 0) -> List[Span]:
+    """Spans terminados (los más recientes al final), opcionalmente filtrados."""
+    spans = list(_span_buffer)
+    if trace_id:
+        spans = [s for s in spans if s.trace_id == trace_id]
+    return spans[-n:] if n else spans
+
+
+def export_chrome_trace(path: str, trace_id: str = "") -> int:
+    """Vuelca los spans a ``path`` como JSON de Chrome trace-event.
+
+    Se abre en chrome://tracing o en ui.perfetto.dev. Retorna cuántos spans
+    se escribieron.
+    """
+    pid    = os.getpid()
+    events = []
+    for sp in get_spans(trace_id):
+        args = {k: (v if isinstance(v, (int, float, str, bool)) or v is None else str(v))
+                for k, v in sp.attributes.items()}
+        args.update(trace_id=sp.trace_id, span_id=sp.span_id, parent_id=sp.parent_id)
+        events.append({
+            "name": sp.name, "cat": sp.name.split(".", 1)[0], "ph": "X",
+            "ts":   sp.start_ns / 1000.0, "dur": (sp.end_ns - sp.start_ns) / 1000.0,
+            "pid":  pid, "tid": sp.thread_id, "args": args,
+        })
+    parent = os.path.dirname(os.path.abspath(path))
+    os.makedirs(parent, exist_ok=True)
+    tmp = f"{path}.{pid}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fh)
+    os.replace(tmp, path)
+    return len(events)
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+#  PERFILADO EN CALIENTE
+# ════════════════════════════════════════════════════════════════════════════════
+#
+#  Dos modos, ambos activables sin reiniciar el proceso:
+#    • "sampling": un hilo lee sys._current_frames() cada ``interval_s`` y
+#      acumula pilas colapsadas ("a;b;c N"), el formato de flamegraph.pl,
+#      speedscope e inferno. No requiere cooperación del hilo observado.
+#    • "cprofile": cProfile solo puede activarse desde el propio hilo, así que
+#      la petición queda pendiente y el hilo objetivo la recoge en su siguiente
+#      punto de control (entrada o salida de una etapa ``timed``, o
+#      ``profiling_checkpoint``). Si el hilo queda inactivo, un watchdog
+#      cierra la sesión al vencer el plazo. Se vuelca un .prof (pstats),
+#      legible por snakeviz / flameprof.
+
+PROFILE_DIR = "profiles"
+
+# Margen que el watchdog deja al hilo objetivo para cerrar él mismo la sesión
+_PROFILE_GRACE_S = 0.5
+
+# ident de hilo → sesión cProfile pendiente o en curso
+_profile_requests: Dict[int, "ProfilingSession"] = {}
+
+
+class ProfilingSession:
+    """Sesión de perfilado; ``wait()`` bloquea hasta que el volcado existe."""
+
+    def __init__(self, kind: str, thread_id: int, duration_s: float, path: str):
+        self.kind       = kind
+        self.thread_id  = thread_id
+        self.duration_s = duration_s
+        self.path       = path
+        self.samples    = 0
+        self.error      = ""
+        self._deadline  = 0.0
+        self._profiler  = None
+        self._closing   = False
+        self._stop      = Event()
+        self._done      = Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def stop(self) -> None:
+        """Adelanta el fin de la sesión (el volcado se hace igualmente)."""
+        self._deadline = 0.0
+        self._stop.set()
+
+    def _finish(self, error: str = "") -> None:
+        self.error = error
+        if error:
+            log_event(f"Perfilado {self.kind} sin resultado: {error}", "WARNING")
+        else:
+            log_event(f"Perfil {self.kind} escrito en {self.path}", "INFO")
+        self._done.set()
+
+
+def _resolve_thread(thread: Any) -> int:
+    if thread is None:
+        return threading.main_thread().ident
+    if isinstance(thread, Thread):
+        return thread.ident
+    if isinstance(thread, int):
+        return thread
+    for t in threading.enumerate():
+        if t.name == thread:
+            return t.ident
+    raise ValueError(f"Hilo no encontrado: {thread!r}")
+
+
+def enable_profiling(kind: str = "sampling", duration_s: float = 10.0,
+                     thread: Any = None, interval_s: float = 0.005,
+                     output_dir: str = PROFILE_DIR) -> ProfilingSession:
+    """Perfila el proceso en marcha durante ``duration_s`` segundos.
+
+    Args:
+        kind:       "sampling" o "cprofile".
+        duration_s: duración de la captura.
+        thread:     Thread, ident o nombre del hilo objetivo. En "sampling",
+                    None muestrea todos los hilos; en "cprofile", el principal.
+        interval_s: periodo de muestreo (solo "sampling").
+        output_dir: directorio del volcado.
+    """
+    if kind not in ("sampling", "cprofile"):
+        raise ValueError(f"Modo de perfilado desconocido: {kind!r}")
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    ext   = "collapsed" if kind == "sampling" else "prof"
+    path  = os.path.join(output_dir, f"{kind}-{stamp}-{os.getpid()}.{ext}")
+
+    if kind == "sampling":
+        tid = None if thread is None else _resolve_thread(thread)
+        session = ProfilingSession(kind, tid or 0, duration_s, path)
+        Thread(target=_sampling_loop, args=(session, tid, interval_s),
+               daemon=True, name="MonitoringSampler").start()
+        return session
+
+    tid = _resolve_thread(thread)
+    session = ProfilingSession(kind, tid, duration_s, path)
+    with _lock:
+        current = _profile_requests.get(tid)
+        if current is not None and not current._closing:
+            raise RuntimeError("Ya hay una sesión cProfile en ese hilo")
+        _profile_requests[tid] = session
+    Thread(target=_profile_watchdog, args=(session,), daemon=True,
+           name="MonitoringProfileWatchdog").start()
+    if tid == threading.get_ident():
+        profiling_checkpoint()
+    return session
+
+
+def _profile_watchdog(session: ProfilingSession) -> None:
+    """Cierra la sesión cProfile si el hilo objetivo no lo hace a tiempo.
+
+    Sin arrancar, la sesión termina vacía; arrancada, se vuelca al vencer el
+    plazo (más ``_PROFILE_GRACE_S``) aunque el hilo siga inactivo.
+    """
+    session._stop.wait(session.duration_s)
+    with _lock:
+        if session._profiler is None:
+            if _profile_requests.get(session.thread_id) is session:
+                del _profile_requests[session.thread_id]
+            session._closing = True
+            session._finish("el hilo no alcanzó ningún punto de control")
+            return
+    while not session.done:
+        remaining = session._deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        session._stop.wait(remaining)
+    if not session._done.wait(_PROFILE_GRACE_S):
+        _close_profile(session)
+
+
+def _close_profile(session: ProfilingSession) -> None:
+    """Detiene y vuelca la sesión una sola vez, desde el hilo objetivo o el watchdog.
+
+    cProfile solo se desactiva de verdad en el hilo que lo activó: si cierra
+    el watchdog, la sesión sigue registrada y ese hilo la retira en su
+    siguiente punto de control.
+    """
+    with _lock:
+        if session._closing:
+            return
+        session._closing = True
+        own = threading.get_ident() == session.thread_id
+        if own and _profile_requests.get(session.thread_id) is session:
+            del _profile_requests[session.thread_id]
+    session._profiler.disable()
+    try:
+        session._profiler.dump_stats(session.path)
+        session._finish()
+    except OSError as e:
+        session._finish(str(e))
+
+
+def profiling_checkpoint() -> None:
+    """Punto de control cooperativo para el modo "cprofile".
+
+    Inicia la captura si hay una petición para este hilo y la cierra y vuelca
+    al vencer el plazo. Sin peticiones cuesta una comprobación de dict vacío.
+    """
+    if not _profile_requests:
+        return
+    session = _profile_requests.get(threading.get_ident())
+    if session is None:
+        return
+    if session._closing:
+        # Cerrada por el watchdog: falta desactivar cProfile en este hilo
+        if session._profiler is not None:
+            session._profiler.disable()
+        with _lock:
+            if _profile_requests.get(session.thread_id) is session:
+                del _profile_requests[session.thread_id]
+        return
+    if session._profiler is None:
+        import cProfile
+        with _lock:
+            if session._closing:
+                return
+            session._profiler = cProfile.Profile()
+            session._deadline = time.monotonic() + session.duration_s
+        session._profiler.enable()
+    elif time.monotonic() >= session._deadline:
+        _close_profile(session)
+
+
+def _frame_label(code) -> str:
+    mod = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{mod}:{code.co_name}"
+
+
+def _sampling_loop(session: ProfilingSession, tid: Optional[int],
+                   interval_s: float) -> None:
+    own    = threading.get_ident()
+    names  = {}
+    stacks: Dict[str, int] = {}
+    end    = time.monotonic() + session.duration_s
+    while time.monotonic() < end and not session._stop.is_set():
+        frames = sys._current_frames()
+        for ident, frame in frames.items():
+            if ident == own or (tid is not None and ident != tid):
+                continue
+            parts = []
+            while frame is not None:
+                parts.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if ident not in names:
+                names = {t.ident: t.name for t in threading.enumerate()}
+            parts.append(names.get(ident, str(ident)))
+            key = ";".join(reversed(parts))
+            stacks[key] = stacks.get(key, 0) + 1
+        del frames
+        session.samples += 1
+        time.sleep(interval_s)
+    try:
+        with open(session.path, "w", encoding="utf-8") as fh:
+            for key, n in sorted(stacks.items()):
+                fh.write(f"{key} {n}\n")
+        session._finish()
+    except OSError as e:
+        session._finish(str(e))
+
+
+# ════════════════════════════════════════════════════════════════════════════════
+#  USO DE MEMORIA (tracemalloc + conteo de objetos por clase EVA)
+# ════════════════════════════════════════════════════════════════════════════════
+
+_mem_snapshot = None                       # última instantánea tracemalloc
+_mem_counts: Dict[str, int] = {}           # último conteo de objetos por clase
+_mem_thread: Optional[Thread] = None
+_mem_stop   = Event()
+_eva_modules: Optional[frozenset] = None
+
+
+def _eva_module_names() -> frozenset:
+    """Módulos del propio proyecto (los .py junto a monitoring.py)."""
+    global _eva_modules
+    if _eva_modules is None:
+        here = os.path.dirname(os.path.abspath(__file__))
+        names = {os.path.splitext(f)[0] for f in os.listdir(here) if f.endswith(".py")}
+        names.add("__main__")
+        _eva_modules = frozenset(names)
+    return _eva_modules
+
+
+def start_memory_tracking(nframes: int = 1) -> None:
+    """Arranca tracemalloc y fija la instantánea base para los diffs."""
+    import tracemalloc
+    global _mem_snapshot
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(nframes)
+    _mem_snapshot = _take_snapshot()
+
+
+def stop_memory_tracking() -> None:
+    import tracemalloc
+    global _mem_snapshot
+    stop_memory_reports()
+    _mem_snapshot = None
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def _take_snapshot():
+    import tracemalloc
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+
+
+def count_eva_objects(stride: int = 1) -> Dict[str, int]:
+    """Instancias vivas por clase EVA ("módulo.Clase").
+
+    Con ``stride`` > 1 solo se inspecciona uno de cada ``stride`` objetos del
+    GC y el resultado se escala; suficiente para ver tendencias a menor coste.
+    """
+    import gc
+    mods   = _eva_module_names()
+    counts: Dict[str, int] = {}
+    objs   = gc.get_objects()
+    try:
+        for i in range(0, len(objs), max(1, stride)):
+            cls = type(objs[i])
+            mod = cls.__module__
+            if mod in mods:
+                key = f"{mod}.{cls.__qualname__}"
+                counts[key] = counts.get(key, 0) + 1
+    finally:
+        del objs
+    if stride > 1:
+        counts = {k: v * stride for k, v in counts.items()}
+    return counts
+
+
+def memory_report(top: int = 15, group_by: str = "lineno",
+                  stride: int = 1, log: bool = True) -> Dict[str, Any]:
+    """Diff de memoria desde el informe anterior (o desde el arranque).
+
+    Args:
+        top:      número de ubicaciones con mayor crecimiento a listar.
+        group_by: "lineno" (archivo:línea) o "filename" (módulo).
+        stride:   muestreo de ``count_eva_objects``.
+        log:      si True, emite el resumen con ``log_event``.
+
+    Sin tracemalloc activo solo se reportan los conteos de objetos.
+    """
+    import tracemalloc
+    global _mem_snapshot, _mem_counts
+    report: Dict[str, Any] = {"ts": time.time(), "top_growth": []}
+
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report["traced_current"] = current
+        report["traced_peak"]    = peak
+        snap = _take_snapshot()
+        if _mem_snapshot is not None:
+            stats = snap.compare_to(_mem_snapshot, group_by)
+            for st in stats[:top]:
+                frame = st.traceback[0]
+                where = os.path.basename(frame.filename)
+                if group_by == "lineno":
+                    where = f"{where}:{frame.lineno}"
+                report["top_growth"].append({
+                    "where":      where,
+                    "size":       st.size,
+                    "size_diff":  st.size_diff,
+                    "count_diff": st.count_diff,
+                })
+        _mem_snapshot = snap
+
+    counts = count_eva_objects(stride)
+    report["objects"]      = counts
+    report["objects_diff"] = {k: v - _mem_counts.get(k, 0) for k, v in counts.items()
+                              if v != _mem_counts.get(k, 0)}
+    _mem_counts = counts
+
+    if log:
+        if "traced_current" in report:
+            log_event(f"Memoria trazada: {report['traced_current'] / 1024:.1f} KiB "
+                      f"(pico {report['traced_peak'] / 1024:.1f} KiB)", "INFO")
+        for g in report["top_growth"][:5]:
+            log_event(f"  +{g['size_diff'] / 1024:.1f} KiB ({g['count_diff']:+d} bloques) "
+                      f"en {g['where']}", "INFO")
+        growth = sorted(report["objects_diff"].items(), key=lambda kv: -kv[1])[:5]
+        for name, diff in growth:
+            if diff > 0:
+                log_event(f"  {name}: {counts[name]} objetos ({diff:+d})", "INFO")
+    return report
+
+
+def start_memory_reports(interval_s: float = 300.0, **kwargs: Any) -> None:
+    """Emite ``memory_report`` periódicamente desde un hilo en segundo plano."""
+    global _mem_thread
+    stop_memory_reports()
+    _mem_stop.clear()
+    if _mem_snapshot is None:
+        start_memory_tracking()
+
+    def _loop():
+        while not _mem_stop.wait(interval_s):
+            try:
+                memory_report(**kwargs)
+            except Exception as e:
+                log_event(f"Informe de memoria falló: {e}", "WARNING")
+
+    _mem_thread = Thread(target=_loop, daemon=True, name="MonitoringMemoryReport")
+    _mem_thread.start()
+
+
+def stop_memory_reports() -> None:
+    global _mem_thread
+    _mem_stop.set()
+    if _mem_thread is not None and _mem_thread is not threading.current_thread():
+        _mem_thread.join(timeout=5.0)
+    _mem_thread = None
+
+
 # ════════════════════════════════════════════════════════════════════════════════
 #  UTILIDADES INTERNAS
 # ════════════════════════════════════════════════════════════════════════════════
@@ -272,6 +1714,28 @@ def _fmt_ts(ts: float) -> str:
     return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{ms:03d}"
 
 
+def _format_record(kind: str, entry: Dict[str, Any]) -> Tuple[str, str]:
+    """Convierte un registro encolado en (línea, nivel). Corre en el hilo escritor."""
+    ts_str = _fmt_ts(entry["ts"])
+    nid    = entry.get("neuron_id", "")
+    if kind == "activation":
+        bar = _activation_bar(entry["activation_level"])
+        return (
+            f"{ts_str} [ACTIVATION] ({nid}) "
+            f"act={entry['activation_level']:.3f} {bar} "
+            f"plas={entry['plasticity']:.3f} imp={entry['impact']:.3f} "
+            f"eff={entry['efficiency']:.3f}",
+            "DEBUG",
+        )
+    if kind == "error":
+        # Truncar mensajes muy largos en consola
+        short_msg = entry["message"].split("\n")[0][:200]
+        return f"{ts_str} [ERROR   ] ({nid}) {short_msg}", "ERROR"
+    level   = entry["level"]
+    nid_str = f" ({nid})" if nid else ""
+    return f"{ts_str} [{level:<8}]{nid_str} {entry['message']}", level
+
+
 def _activation_bar(level: float, width: int = 10) -> str:
     """Barra visual ASCII para nivel de activación."""
     filled = int(round(level * width))
@@ -301,4 +1765,84 @@ if __name__ == "__main__":
     assert s["total_errors"]      == 1, "Conteo de errores incorrecto"
     assert s["unique_neurons"]    == 2, "Conteo de neuronas únicas incorrecto"
 
+    set_log_level("INFO")
+    set_top_neurons_tracking(2)
+    for i in range(50):
+        log_neuron_activation("hot_neuron", 0.9)
+        log_neuron_activation(f"cold_{i}", 0.1)
+    assert get_top_neurons(1)[0][0] == "hot_neuron", "Top-K incorrecto"
+    assert abs(get_stats()["unique_neurons"] - 53) <= 2, "Estimación HLL fuera de rango"
+    set_top_neurons_tracking(0)
+
+    for _ in range(1000):
+        with timed("selftest.stage"):
+            pass
+    lat = get_latency_stats("selftest.stage")["selftest.stage"]
+    assert lat["count"] == 1000, "Conteo de latencias incorrecto"
+
+    register_gauge("selftest_queue_depth", lambda: 3, "Gauge de prueba.")
+    register_gauge("selftest_by_layer", lambda: {"self": 1, "working": 2},
+                   "Gauge etiquetado de prueba.", label="layer")
+    text = render_metrics()
+    assert 'eva_selftest_by_layer{layer="working"} 2.0' in text, "Gauge etiquetado ausente"
+    assert 'eva_stage_latency_seconds_count{stage="selftest.stage"} 1000' in text
+    unregister_gauge("selftest_queue_depth")
+    unregister_gauge("selftest_by_layer")
+
+    mem = MemorySink()
+    set_log_sink(mem)
+    log_event("Registro hacia sink en memoria", "INFO")
+    flush()
+    set_log_sink(StdoutSink())
+    assert any("sink en memoria" in l for l in mem.lines), "MemorySink no recibió el registro"
+
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        @timed("selftest.busy")
+        def _busy():
+            return sum(i * i for i in range(2000))
+        sess = enable_profiling("sampling", duration_s=0.2, interval_s=0.002,
+                                thread=threading.main_thread(), output_dir=tmp)
+        while not sess.done:
+            _busy()
+        assert sess.wait(2.0) and not sess.error, "Perfil por muestreo falló"
+        with open(sess.path, encoding="utf-8") as fh:
+            assert any("_busy" in l for l in fh), "Pila colapsada sin _busy"
+
+        sess = enable_profiling("cprofile", duration_s=0.1, output_dir=tmp)
+        while not sess.done:
+            _busy()
+        assert os.path.getsize(sess.path) > 0, "Volcado cProfile vacío"
+
+    with trace_span("selftest.root", kind="demo") as root:
+        with trace_span("selftest.child") as child:
+            assert child.parent_id == root.span_id and child.trace_id == root.trace_id
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "trace.json")
+        assert export_chrome_trace(out, root.trace_id) == 2, "Spans de traza incompletos"
+        with open(out, encoding="utf-8") as fh:
+            assert json.load(fh)["traceEvents"][0]["ph"] == "X"
+
+    assert is_enabled("WARNING") and not is_enabled("DEBUG")
+    log_event(lambda: 1 / 0, "DEBUG")                  # descartado: no se evalúa
+    log_event("Lazy %s=%d", "INFO", args=("x", 3))
+    assert get_recent_events("INFO", 1)[0]["message"] == "Lazy x=3"
+    bench = benchmark_disabled_logging(50_000)
+    print(f"  log DEBUG descartado (ns/llamada): {bench}")
+    assert bench["percent_args"] < bench["eager_fstring"], "La forma %-args no abarata el descarte"
+
+    with propagation_wave() as t_wave:
+        time.sleep(0.002)
+        assert wave_time() == t_wave and wave_ns() == current_wave()[1]
+    assert current_wave() is None and wave_time() > t_wave, "Onda no cerrada"
+
+    class _Leaky:
+        pass
+    start_memory_tracking()
+    hoard = [_Leaky() for _ in range(500)]
+    rep = memory_report(log=False)
+    assert rep["objects"].get("__main__._Leaky") == 500, "Conteo por clase incorrecto"
+    assert rep["top_growth"] and rep["top_growth"][0]["size_diff"] > 0
+    stop_memory_tracking()
+
     print("✓ Todos los assertions pasaron.")
@@ -24,7 +24,8 @@ from enum import Enum
 from threading import RLock
 from typing import Any, Dict, List, Optional, Tuple
 
-from monitoring import log_event, log_neuron_error, log_neuron_warning
+from monitoring import (log_event, log_neuron_error, log_neuron_warning,
+                        is_enabled, wave_time, wave_ns)
 from animal   import create_cognitive_animal_neuron,   CognitiveAnimalNeuronBase
 from micelial import create_cognitive_micelial_neuron, CognitiveMicelialNeuronBase
 
@@ -131,9 +132,9 @@ class PlasticityEngine:
         scale = factors.get(neuromodulator, 1.0)
         return self._clip(weight * scale)
 
-    # ── Registro de timestamps ────────────────────────────────────────────
-    def record_pre(self):  self._last_pre_ts  = time.time()
-    def record_post(self): self._last_post_ts = time.time()
+    # ── Registro de timestamps (monotónicos, s; solo se usan como diferencia)
+    def record_pre(self):  self._last_pre_ts  = wave_ns() * 1e-9
+    def record_post(self): self._last_post_ts = wave_ns() * 1e-9
 
     def apply_all(self, weight: float, signal: float,
                   pre_act: float = 0.5, post_act: float = 0.5,
@@ -257,6 +258,7 @@ class SynapseBase(ABC):
         # Estadísticas
         self.creation_time    = time.time()
         self.last_transmission = 0.0
+        self._last_tx_ns       = 0
         self.usage_frequency   = 0.0
         self.success_count     = 0
         self.failure_count     = 0
@@ -282,17 +284,18 @@ class SynapseBase(ABC):
 
     # ── Frecuencia de uso ─────────────────────────────────────────────────
     def _update_frequency(self):
-        now = time.time()
-        if self.last_transmission > 0:
-            dt = max(1e-4, now - self.last_transmission)
+        now_ns = wave_ns()
+        if self._last_tx_ns:
+            dt = max(1e-4, (now_ns - self._last_tx_ns) * 1e-9)
             self.usage_frequency = 0.9 * self.usage_frequency + 0.1 / dt
-        self.last_transmission = now
+        self._last_tx_ns       = now_ns
+        self.last_transmission = wave_time()
 
     # ── Registro ──────────────────────────────────────────────────────────
     def _record(self, sig_in: float, sig_out: float, success: bool,
                 context: Dict = None):
         self.transmission_history.append({
-            "ts":      time.time(),
+            "ts":      wave_time(),
             "in":      round(sig_in,  4),
             "out":     round(sig_out, 4),
             "ok":      success,
@@ -782,9 +785,10 @@ class SynapseManager:
         with self.lock:
             self.synapses[sid] = syn
 
-        log_event(f"Sinapsis {sid} ({kind}|{polarity}) "
-                  f"{getattr(source,'neuron_id','?')}→"
-                  f"{getattr(target,'neuron_id','?')}", "DEBUG")
+        if is_enabled("DEBUG"):
+            log_event(f"Sinapsis {sid} ({kind}|{polarity}) "
+                      f"{getattr(source,'neuron_id','?')}→"
+                      f"{getattr(target,'neuron_id','?')}", "DEBUG")
         return syn
 
     # ── Bundles y cadenas ─────────────────────────────────────────────────
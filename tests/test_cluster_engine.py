@@ -0,0 +1,95 @@
+"""ClusterEngine: el camino vectorizado (NumPy) debe agrupar igual que Python."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip("numpy")
+
+from memory import EmotionalStamp, Fragment, MemoryLayer  # noqa: E402
+from memory_persistence import ClusterEngine                # noqa: E402
+
+_TAGS      = [f"tag{i}" for i in range(40)]
+_INSTINCTS = ["survive", "bond", "explore", "defend", "flee", "reproduce"]
+_LAYERS    = [MemoryLayer.CONSOLIDATED, MemoryLayer.ASSOCIATIVE,
+              MemoryLayer.SELF, MemoryLayer.WORKING]
+
+
+def _fragments(n: int, seed: int, prefix: str = "F"):
+    rng = random.Random(seed)
+    return [
+        Fragment(
+            fid      = f"{prefix}{i:06d}",
+            content  = f"fragmento {i}",
+            tags     = rng.sample(_TAGS, rng.randint(1, 5)),
+            modality = "conceptual",
+            emotion  = EmotionalStamp(valence=rng.uniform(-1, 1),
+                                      arousal=rng.random(),
+                                      instinct_tags=rng.sample(_INSTINCTS, rng.randint(0, 3))),
+            strength = rng.uniform(0.1, 1.0),
+            layer    = rng.choice(_LAYERS),
+        )
+        for i in range(n)
+    ]
+
+
+def _clusters(engine: ClusterEngine):
+    """Clústeres comparables entre motores (los cluster_id llevan la hora)."""
+    return sorted(
+        (tuple(c.member_fids), round(c.centroid_valence, 9),
+         round(c.centroid_arousal, 9), tuple(c.dominant_tags),
+         tuple(c.dominant_instincts), c.evolution_stage)
+        for c in engine._clusters.values())
+
+
+@pytest.mark.parametrize("n", [600, 2000])
+def test_update_vectorised_matches_python(n):
+    frags = _fragments(n, seed=n)
+    py, vec = ClusterEngine(vectorise=False), ClusterEngine(vectorise=True)
+    py.update(frags)
+    vec.update(frags)
+    assert vec._use_numpy(n, full=True)
+    assert _clusters(vec) == _clusters(py)
+
+
+@pytest.mark.parametrize("n_base", [0, 600])
+def test_update_incremental_vectorised_matches_python(n_base):
+    # Sin base todos los clústeres nacen dentro del lote incremental
+    base  = _fragments(n_base, seed=1)
+    extra = _fragments(800, seed=2, prefix="G")
+    engines = []
+    for vectorise in (False, True):
+        engine = ClusterEngine(vectorise=vectorise)
+        engine.VECTORISE_MIN_CELLS = 0     # cualquier lote va por NumPy
+        if base:
+            engine.update(base)
+        engine.update_incremental({f.fid: f for f in base + extra}, ())
+        engines.append(engine)
+    py, vec = engines
+    assert _clusters(vec) == _clusters(py)
+
+
+@pytest.mark.parametrize("vectorise", [True, False])
+def test_persistence_save_cycle_uses_chosen_path(tmp_path, vectorise):
+    from memory import MemoryManager
+    from memory_persistence import MemoryPersistence
+    import monitoring
+    monitoring.set_log_level("ERROR")
+
+    mgr = MemoryManager()
+    mgr.store.add_many(_fragments(700, seed=7))
+    pers = MemoryPersistence(mgr, base_dir=str(tmp_path / "m"),
+                             vectorise_clusters=vectorise)
+    pers.save_cycle(force=True)
+    pers.flush()
+    passes = pers.clusters.stats()["passes"]
+    assert (passes["numpy"] > 0) == vectorise
+    assert pers.clusters.stats()["total_clusters"] > 0
+
+    reference = ClusterEngine(vectorise=False)
+    reference.update_incremental({f.fid: f for f in mgr.store.all_fragments()}, ())
+    assert _clusters(pers.clusters) == _clusters(reference)
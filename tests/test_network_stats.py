@@ -0,0 +1,51 @@
+"""AnimalNetworkStats: cola de activaciones acotada y recuento de activas coherente."""
+
+import sys
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monitoring                                                   # noqa: E402
+from monitoring import propagation_wave                             # noqa: E402
+from animal import AnimalNetworkStats, SensoryReceptorNeuron        # noqa: E402
+
+monitoring.set_log_level("ERROR")
+
+
+def _activate(stats, neuron, ts):
+    with propagation_wave(inherit=(ts, 0)):
+        stats.on_activation(neuron, 1.0, 0.0)
+
+
+def test_recent_queue_is_bounded_and_active_count_stays_exact():
+    stats = AnimalNetworkStats(active_window=10.0)
+    stats._recent = deque(maxlen=8)
+    neurons = [SensoryReceptorNeuron(f"S{i}", "visual") for i in range(3)]
+    for n in neurons:
+        stats.register(n)
+    t0 = 1_000_000.0
+    for k in range(200):
+        _activate(stats, neurons[k % 3], t0 + k * 0.01)
+        assert len(stats._recent) <= 8
+    assert stats._active == 3
+
+    _activate(stats, neurons[0], t0 + 100.0)        # las otras dos caducan
+    assert stats._active == 1
+    stats.unregister(neurons[0])
+    assert stats._active == 0
+
+
+def test_more_active_neurons_than_capacity_never_goes_negative():
+    stats = AnimalNetworkStats(active_window=10.0)
+    stats._recent = deque(maxlen=4)
+    neurons = [SensoryReceptorNeuron(f"S{i}", "visual") for i in range(6)]
+    for n in neurons:
+        stats.register(n)
+    t0 = 1_000_000.0
+    for k, n in enumerate(neurons * 3):
+        _activate(stats, n, t0 + k * 0.01)
+    assert 0 < stats._active <= len(neurons)
+    for n in neurons:
+        stats.unregister(n)
+    assert stats._active == 0
@@ -0,0 +1,55 @@
+"""NeuronIndex / HybridNeuralNetwork: los objetivos de instinto igualan al recorrido original."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monitoring                                                     # noqa: E402
+from adaptive import (HybridNeuralNetwork, InstinctID,                # noqa: E402
+                      _INSTINCT_ANIMAL_TARGETS, _INSTINCT_MICELIAL_TARGETS)
+
+monitoring.set_log_level("ERROR")
+
+
+class _StubNeuron:
+    """Neurona mínima: solo lo que consultan NeuronIndex y el recorrido."""
+
+    def __init__(self, neuron_id: str, subtype: str):
+        self.neuron_id      = neuron_id
+        self.neuron_subtype = subtype
+
+
+def _scan(net: HybridNeuralNetwork, inst: InstinctID):
+    """Recorrido lineal previo al índice: una entrega por nombre que encaja."""
+    animals = [n for t in _INSTINCT_ANIMAL_TARGETS.get(inst, []) for n in net.animals
+               if t in n.neuron_subtype or t in type(n).__name__.lower()]
+    micelials = [n for t in _INSTINCT_MICELIAL_TARGETS.get(inst, []) for n in net.micelials
+                 if t in n.neuron_type or t in type(n).__name__.lower()]
+    return animals, micelials
+
+
+@pytest.fixture(scope="module")
+def net():
+    return HybridNeuralNetwork(n_animal=60, n_micelial=40)
+
+
+@pytest.mark.parametrize("inst", list(InstinctID))
+def test_targets_match_linear_scan(net, inst):
+    assert net._targets_for(inst) == _scan(net, inst)
+
+
+def test_neuron_matching_two_names_is_targeted_twice(net):
+    names = _INSTINCT_ANIMAL_TARGETS[InstinctID.SURVIVE]
+    stub  = _StubNeuron("X_dual", "_".join(names))
+    net.add_neuron(stub)
+    try:
+        animals, _ = net._targets_for(InstinctID.SURVIVE)
+        assert sum(n is stub for n in animals) == len(names)
+        assert net._targets_for(InstinctID.SURVIVE) == _scan(net, InstinctID.SURVIVE)
+    finally:
+        net.remove_neuron("X_dual")
+    animals, _ = net._targets_for(InstinctID.SURVIVE)
+    assert all(n is not stub for n in animals)
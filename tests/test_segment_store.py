@@ -0,0 +1,53 @@
+"""SegmentStore: el índice lateral no se reescribe en cada fsync."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monitoring                           # noqa: E402
+from memory_persistence import SegmentStore  # noqa: E402
+
+monitoring.set_log_level("ERROR")
+
+
+def _payload(i: int) -> bytes:
+    return json.dumps({"i": i}).encode()
+
+
+def test_sync_flush_leaves_sidecar_alone_and_reopen_scans_tail(tmp_path):
+    path = tmp_path / "x.seg"
+    s = SegmentStore(path, compact_min_bytes=1 << 20)
+    s.put("f0", _payload(0))
+    s.checkpoint()
+    side = json.loads(s.idx_path.read_text(encoding="utf-8"))
+    mtime = s.idx_path.stat().st_mtime_ns
+
+    for i in range(1, 50):
+        s.put(f"f{i}", _payload(i))
+        s.flush(sync=True)
+    assert s.idx_path.stat().st_mtime_ns == mtime     # cola pequeña: sin reescritura
+    assert json.loads(s.idx_path.read_text(encoding="utf-8")) == side
+
+    s._fh.close()                                     # cierre abrupto, sin checkpoint
+    s._rfh and s._rfh.close()
+    reopened = SegmentStore(path)
+    assert len(reopened) == 50
+    assert reopened.get("f49") == _payload(49)
+    reopened.close()
+
+
+def test_checkpoint_and_large_tail_write_sidecar(tmp_path):
+    s = SegmentStore(tmp_path / "x.seg", compact_min_bytes=0)
+    s.put("f0", _payload(0))
+    s.flush(sync=True)                                # cola > tamaño / 2
+    assert json.loads(s.idx_path.read_text(encoding="utf-8"))["size"] == s.stats()["bytes"]
+
+    s2 = SegmentStore(tmp_path / "y.seg")
+    s2.put("f0", _payload(0))
+    s2.flush(sync=True)
+    assert not s2.idx_path.exists()
+    s2.close()
+    side = json.loads(s2.idx_path.read_text(encoding="utf-8"))
+    assert side["size"] == s2.path.stat().st_size and "f0" in side["entries"]
@@ -0,0 +1,42 @@
+"""Reloj de onda: neuronas creadas o activadas dentro de propagation_wave()."""
+
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monitoring                                                          # noqa: E402
+from monitoring import propagation_wave, wave_time                         # noqa: E402
+from animal import (FATIGUE_RATE_TAU, CognitiveAnimalNetworkMaintenance,   # noqa: E402
+                    SensoryReceptorNeuron)
+
+monitoring.set_log_level("ERROR")
+
+
+def test_neuron_created_inside_wave_has_non_negative_age():
+    with propagation_wave():
+        time.sleep(0.01)                       # el reloj de la onda queda atrás
+        neuron = SensoryReceptorNeuron("W001", "visual")
+        assert neuron.creation_time > wave_time()
+        neuron.update_signal(1.0)
+        neuron.update_signal(1.0)              # segunda activación: dt = 0
+        assert neuron.age == 0.0
+        assert neuron.get_state()["age"] >= 0.0
+
+
+def test_activation_rate_never_grows_with_out_of_order_waves():
+    net = CognitiveAnimalNetworkMaintenance()
+    neuron = SensoryReceptorNeuron("W002", "visual")
+    net.add_neuron(neuron)
+    late  = wave_time() + 5.0
+    early = late - 60.0
+    with propagation_wave(inherit=(late, 0)):
+        net.stats.on_activation(neuron, 1.0, 0.0)
+        net.stats.on_activation(neuron, 1.0, 0.0)   # misma onda: dt = 0
+    with propagation_wave(inherit=(early, 0)):      # onda anterior de otro hilo
+        net.stats.on_activation(neuron, 1.0, 0.0)
+    rate = net.stats._per_neuron["W002"][1]
+    assert math.isfinite(rate)
+    assert rate <= 3.0 / FATIGUE_RATE_TAU + 1e-12
@@ -0,0 +1,48 @@
+"""WriteBehindWriter: flush() no debe volver antes de que el lote en curso esté en disco."""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monitoring                                   # noqa: E402
+from memory_persistence import WriteBehindWriter   # noqa: E402
+
+monitoring.set_log_level("ERROR")
+
+
+def test_flush_waits_for_batch_in_flight(tmp_path):
+    writer  = WriteBehindWriter(flush_interval_s=0.0)
+    entered = threading.Event()
+    release = threading.Event()
+    write   = writer._write_batch
+
+    def blocked_write(batch):
+        entered.set()
+        release.wait(5.0)
+        write(batch)
+
+    writer._write_batch = blocked_write
+    path = tmp_path / "log.jsonl"
+    writer.append(path, {"n": 1})
+    assert entered.wait(5.0)             # el hilo escritor ya sacó el lote de la cola
+
+    done = threading.Event()
+    result = []
+    flusher = threading.Thread(target=lambda: (result.append(writer.flush(5.0)), done.set()))
+    flusher.start()
+    assert not done.wait(0.2)            # flush espera al lote en curso
+    assert not path.exists()
+
+    release.set()
+    flusher.join(5.0)
+    assert result == [True]
+    assert path.read_text(encoding="utf-8").strip() == '{"n": 1}'
+    writer.close()
+
+
+def test_flush_without_pending_returns_immediately():
+    writer = WriteBehindWriter()
+    assert writer.flush(0.0)
+    writer.close()